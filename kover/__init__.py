@@ -25,10 +25,12 @@ __author__ = "megawattka"
 __license__ = "MIT"
 __copyright__ = "Copyright (C) 2024-present megawattka"
 
+from .buffers import CounterBuffer, DocumentLoader, InsertCoalescer
 from .bulk_write_builder import BulkWriteBuilder
+from .change_stream import ChangeStream
 from .client import Kover
 from .collection import Collection
-from .cursor import Cursor
+from .cursor import AggregateCursor, Cursor, MergedCursor
 from .database import Database
 from .enums import (
     CollationStrength,
@@ -37,14 +39,23 @@ from .enums import (
     ValidationLevel,
 )
 from .exceptions import (
+    BulkWriteError,
     CorruptedDocument,
     CredentialsException,
     OperationFailure,
     SchemaGenerationException,
 )
-from .helpers import chain, filter_non_null, maybe_to_dict
+from .helpers import (
+    chain,
+    filter_non_null,
+    maybe_to_dict,
+    maybe_to_dicts,
+    maybe_wrap_raw,
+)
+from .lazy import LazyDocument
 from .models import (
     BuildInfo,
+    BulkWriteResult,
     Collation,
     Delete,
     HelloResult,
@@ -64,23 +75,32 @@ from .transaction import Transaction
 from .typings import xJsonT
 
 __all__ = (
+    "AggregateCursor",
     "AuthCredentials",
     "BuildInfo",
     "BulkWriteBuilder",
+    "BulkWriteError",
+    "BulkWriteResult",
+    "ChangeStream",
     "Collation",
     "CollationStrength",
     "Collection",
     "CorruptedDocument",
+    "CounterBuffer",
     "CredentialsException",
     "Cursor",
     "Database",
     "Delete",
     "Document",
+    "DocumentLoader",
     "HelloResult",
     "Index",
     "IndexDirection",
     "IndexType",
+    "InsertCoalescer",
     "Kover",
+    "LazyDocument",
+    "MergedCursor",
     "MongoTransport",
     "OperationFailure",
     "ReadConcern",
@@ -98,5 +118,7 @@ __all__ = (
     "chain",
     "filter_non_null",
     "maybe_to_dict",
+    "maybe_to_dicts",
+    "maybe_wrap_raw",
     "xJsonT",
 )
@@ -0,0 +1,517 @@
+"""Client side buffers merging many small operations into few commands."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Final, Generic, TypeVar, cast
+
+from bson import ObjectId, encode
+from bson.raw_bson import RawBSONDocument
+from typing_extensions import Self
+
+from .exceptions import OperationFailure
+from .helpers import batched, classrepr, maybe_to_dict
+from .lazy import raw_document_id
+from .models import Update
+from .network import WireHelper
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .collection import Collection
+    from .lazy import LazyDocument
+    from .schema import Document
+    from .session import Session, Transaction
+    from .typings import RawDocumentT, xJsonT
+
+    _Pending = tuple[
+        xJsonT | RawBSONDocument, ObjectId, asyncio.Future[ObjectId],
+    ]
+
+T = TypeVar("T")
+
+COALESCE_WINDOW: Final[float] = 0.002
+COALESCE_MAX_DOCUMENTS: Final[int] = 1000
+LOADER_MAX_KEYS: Final[int] = 1000
+COUNTER_INTERVAL: Final[float] = 1.0
+COUNTER_MAX_OPERATIONS: Final[int] = 10_000
+# updates sent per `update` command on flush
+_COUNTER_FLUSH_BATCH: Final[int] = 1000
+
+
+@classrepr("collection", "window", "max_documents")
+class InsertCoalescer:
+    """Merges concurrent single document inserts into one `insert`.
+
+    Documents passed to `insert_one` within `window` seconds, or until
+    `max_documents` are queued, are sent as a single unordered
+    `insert` command. Every caller still awaits its own result:
+    the id of its document or the write error raised for it.
+    Pending documents are sent when the client is closed.
+
+    ```
+    >>> coalescer = client.db.events.coalesce_inserts(window=0.005)
+    >>> await coalescer.insert_one({"kind": "click"})
+    ```
+
+    Attributes:
+        collection : The collection documents are inserted into.
+        window : Seconds to collect documents before sending them.
+        max_documents : Amount of queued documents sent right away.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        *,
+        window: float = COALESCE_WINDOW,
+        max_documents: int = COALESCE_MAX_DOCUMENTS,
+        bypass_document_validation: bool = False,
+        comment: str | None = None,
+    ) -> None:
+        self.collection = collection
+        self.window = window
+        self.max_documents = max_documents
+        self._bypass_document_validation = bypass_document_validation
+        self._comment = comment
+        self._pending: list[_Pending] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._sends: set[asyncio.Task[None]] = set()
+        self._helper = WireHelper()
+        self._closed: bool = False
+        collection.database.client.register_write_buffer(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    async def insert_one(
+        self,
+        document: xJsonT | Document | RawDocumentT,
+    ) -> ObjectId:
+        """Queue a document and wait until its insert is acknowledged.
+
+        Parameters:
+            document : The document itself.
+
+        Returns:
+            The `_id` of the inserted document.
+
+        Raises:
+            ValueError : If the coalescer is closed.
+        """
+        if self._closed:
+            raise ValueError("Cannot insert through a closed coalescer.")
+        if isinstance(document, RawBSONDocument | bytes):
+            insertable, document_id = raw_document_id(document)
+        else:
+            insertable = maybe_to_dict(document)
+            document_id = insertable.setdefault("_id", ObjectId())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((insertable, document_id, future))
+        if len(self._pending) >= self.max_documents:
+            self._dispatch()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._wait_window())
+        return await future
+
+    async def _wait_window(self) -> None:
+        await asyncio.sleep(self.window)  # let more documents pile up
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.create_task(self._send(pending))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(
+        self,
+        pending: list[_Pending],
+    ) -> None:
+        errors: dict[int, xJsonT] = {}
+        try:
+            await self.collection.insert_many(
+                [document for document, _, _ in pending],
+                ordered=False,
+                bypass_document_validation=self._bypass_document_validation,
+                comment=self._comment,
+            )
+        except OperationFailure as exc_value:
+            write_errors = (exc_value.details or {}).get("writeErrors")
+            if not write_errors:
+                self._fail(pending, exc_value)
+                return
+            errors = {error["index"]: error for error in write_errors}
+        except Exception as exc_value:  # noqa: BLE001
+            self._fail(pending, exc_value)
+            return
+
+        for index, (_, document_id, future) in enumerate(pending):
+            if future.done():  # the caller was cancelled
+                continue
+            if index in errors:
+                future.set_exception(self._helper.get_exception(
+                    {"writeErrors": [errors[index]]}))
+            else:
+                future.set_result(document_id)
+
+    @staticmethod
+    def _fail(
+        pending: list[_Pending],
+        exc_value: Exception,
+    ) -> None:
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(exc_value)
+
+    async def flush(self) -> None:
+        """Send queued documents right now and wait for all sends."""
+        self._dispatch()
+        if self._sends:
+            await asyncio.gather(*self._sends)
+
+    async def close(self) -> None:
+        """Send queued documents and stop accepting new ones."""
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._timer
+        await self.flush()
+
+
+def _lookup(document: xJsonT, key: str) -> Any:  # noqa: ANN401
+    value: Any = document
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = cast("xJsonT", value).get(part)
+    return value
+
+
+def _index_by(documents: list[xJsonT], key: str) -> dict[Any, xJsonT]:
+    # an array matches `$in` by any of its elements, like on the server
+    found: dict[Any, xJsonT] = {}
+    for document in documents:
+        value = _lookup(document, key)
+        candidates = (
+            cast("list[Any]", value) if isinstance(value, list) else [value]
+        )
+        for candidate in candidates:
+            with suppress(TypeError):  # unhashable, cannot be loaded anyway
+                found.setdefault(candidate, document)
+    return found
+
+
+@classrepr("collection", "key", "max_keys")
+class DocumentLoader(Generic[T]):
+    """Merges concurrent lookups of single documents by a key.
+
+    Values passed to `load` in the same event loop iteration are
+    deduplicated and fetched by one `{key: {"$in": [...]}}` query,
+    every caller then receives the document matching its value
+    or None. A value already being fetched is not queried again.
+    `key` should name a unique field, like `_id`, holding
+    hashable values stored as they are passed. Documents holding
+    an array there are matched by its elements.
+
+    ```
+    >>> users = client.db.users.loader(cls=User)
+    >>> await asyncio.gather(*(users.load(p.author_id) for p in posts))
+    ```
+
+    Attributes:
+        collection : The collection documents are loaded from.
+        key : The field matched against the loaded values.
+        max_keys : Maximum amount of values sent in one query.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        *,
+        key: str = "_id",
+        cls: type[Document | LazyDocument] | None = None,
+        max_keys: int = LOADER_MAX_KEYS,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> None:
+        if max_keys < 1:
+            raise ValueError("max_keys must be positive.")
+        self.collection = collection
+        self.key = key
+        self.max_keys = max_keys
+        self._cls = cls
+        self._transaction = transaction
+        self._session = session
+        self._queued: list[Any] = []
+        self._futures: dict[Any, asyncio.Future[T | None]] = {}
+        self._fetches: set[asyncio.Task[None]] = set()
+
+    async def load(self, value: Any) -> T | None:  # noqa: ANN401
+        """Load the document whose key equals the value.
+
+        Parameters:
+            value : The value of the key to look up.
+
+        Returns:
+            The matching document or None if no document matches.
+        """
+        future = self._futures.get(value)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[value] = future
+            if not self._queued:  # after the other callers of this tick
+                asyncio.get_running_loop().call_soon(self._dispatch)
+            self._queued.append(value)
+        # one caller being cancelled must not cancel the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, values: list[Any]) -> list[T | None]:
+        """Load the documents of many values at once.
+
+        Parameters:
+            values : The values of the key to look up.
+
+        Returns:
+            The matching documents or None, in the order of values.
+        """
+        return await asyncio.gather(*map(self.load, values))
+
+    def _dispatch(self) -> None:
+        queued, self._queued = self._queued, []
+        for offset in range(0, len(queued), self.max_keys):
+            chunk = queued[offset:offset + self.max_keys]
+            task = asyncio.create_task(self._fetch(chunk))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, values: list[Any]) -> None:
+        futures = [self._futures[value] for value in values]
+        try:
+            documents = await self.collection.find(
+                {self.key: {"$in": values}},
+                cls=None,
+                transaction=self._transaction,
+                session=self._session,
+            ).to_list()
+            found = _index_by(documents, self.key)
+            for value, future in zip(values, futures, strict=True):
+                if not future.done():
+                    self._resolve(future, found.get(value))
+        except Exception as exc_value:  # noqa: BLE001
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc_value)
+        finally:
+            for value in values:
+                self._futures.pop(value, None)
+
+    def _resolve(
+        self,
+        future: asyncio.Future[T | None],
+        document: xJsonT | None,
+    ) -> None:
+        try:  # a document failing validation fails only its callers
+            result = (
+                self._cls.from_document(document)
+                if document is not None and self._cls is not None
+                else document
+            )
+        except Exception as exc_value:  # noqa: BLE001
+            future.set_exception(exc_value)
+        else:
+            future.set_result(cast("T | None", result))
+
+
+@classrepr("collection", "interval", "max_operations")
+class CounterBuffer:
+    """Sums `$inc` deltas in memory and writes them in few updates.
+
+    Deltas passed to `inc` are added up per filter and field.
+    Every `interval` seconds, or once `max_operations` increments
+    were buffered, the sums are written as one unordered batch
+    of `$inc` updates, one per filter, upserting missing documents.
+    Filters are compared by their encoded BSON, so the order
+    of their keys matters. Deltas of failed updates are kept
+    for the next flush and pending ones are written when
+    the client is closed, so every increment is written
+    at least once.
+
+    ```
+    >>> counters = client.db.metrics.counter_buffer(interval=0.5)
+    >>> counters.inc({"_id": "page:home"}, {"views": 1})
+    ```
+
+    Attributes:
+        collection : The collection the counters are stored in.
+        interval : Seconds between writes of the buffered deltas.
+        max_operations : Amount of buffered increments written right away.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        *,
+        interval: float = COUNTER_INTERVAL,
+        max_operations: int = COUNTER_MAX_OPERATIONS,
+        upsert: bool = True,
+        comment: str | None = None,
+    ) -> None:
+        self.collection = collection
+        self.interval = interval
+        self.max_operations = max_operations
+        self._upsert = upsert
+        self._comment = comment
+        self._pending: dict[bytes, tuple[xJsonT, dict[str, Any]]] = {}
+        self._operations: int = 0
+        self._timer: asyncio.Task[None] | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._lock = asyncio.Lock()
+        self._closed: bool = False
+        collection.database.client.register_write_buffer(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    def inc(self, filter_: xJsonT, deltas: Mapping[str, float]) -> None:
+        """Add deltas to the counters of the documents matching the filter.
+
+        Parameters:
+            filter_ : The filter selecting the document to update.
+            deltas : Amounts added to the fields, like in `$inc`.
+
+        Raises:
+            ValueError : If the buffer is closed.
+        """
+        if self._closed:
+            raise ValueError("Cannot increment through a closed buffer.")
+        self._merge(filter_, deltas)
+        self._operations += 1
+        if self._operations >= self.max_operations:
+            self._dispatch()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._wait_interval())
+
+    def _merge(self, filter_: xJsonT, deltas: Mapping[str, Any]) -> None:
+        key = encode(filter_)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = (filter_, {})
+        sums = entry[1]
+        for field, delta in deltas.items():
+            sums[field] = sums.get(field, 0) + delta
+
+    async def _wait_interval(self) -> None:
+        await asyncio.sleep(self.interval)
+        self._dispatch()
+
+    def _take(self) -> list[tuple[xJsonT, dict[str, Any]]]:
+        pending, self._pending = self._pending, {}
+        self._operations = 0
+        return list(pending.values())
+
+    def _dispatch(self) -> None:
+        pending = self._take()
+        if pending:
+            task = asyncio.create_task(self._flush_quietly(pending))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush_quietly(
+        self,
+        pending: list[tuple[xJsonT, dict[str, Any]]],
+    ) -> None:
+        with suppress(Exception):  # deltas are kept for the next flush
+            await self._write(pending)
+
+    async def _write_chunk(
+        self,
+        chunk: list[tuple[xJsonT, dict[str, Any]]],
+    ) -> Exception | None:
+        try:
+            await self.collection.update(*(
+                Update(filter_, {"$inc": sums}, upsert=self._upsert)
+                for filter_, sums in chunk
+            ), ordered=False, comment=self._comment)
+        except OperationFailure as exc_value:
+            write_errors: list[xJsonT] = (
+                (exc_value.details or {}).get("writeErrors") or []
+            )
+            self._restore(
+                [chunk[error["index"]] for error in write_errors]
+                if write_errors else chunk,
+            )
+            return exc_value
+        except Exception as exc_value:  # noqa: BLE001
+            self._restore(chunk)
+            return exc_value
+        return None
+
+    async def _write(
+        self,
+        pending: list[tuple[xJsonT, dict[str, Any]]],
+    ) -> None:
+        async with self._lock:
+            failure: Exception | None = None
+            for chunk in batched(pending, _COUNTER_FLUSH_BATCH):
+                failure = await self._write_chunk(chunk) or failure
+            if failure is not None:
+                if not self._closed and (
+                    self._timer is None or self._timer.done()
+                ):
+                    self._timer = asyncio.create_task(self._wait_interval())
+                raise failure
+
+    def _restore(self, entries: list[tuple[xJsonT, dict[str, Any]]]) -> None:
+        # merged under the deltas buffered meanwhile, written next time
+        for filter_, sums in entries:
+            self._merge(filter_, sums)
+
+    @property
+    def pending(self) -> list[tuple[xJsonT, dict[str, Any]]]:
+        """The buffered filters with the sums of their deltas.
+
+        After `close` raised, these are the deltas that were not written.
+        """
+        return [
+            (filter_, dict(sums)) for filter_, sums in self._pending.values()
+        ]
+
+    async def flush(self) -> None:
+        """Write the buffered deltas right now.
+
+        The error of a failed update is raised,
+        its deltas are kept for the next flush.
+        """
+        pending = self._take()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        await self._write(pending)
+
+    async def close(self) -> None:
+        """Write the buffered deltas and stop accepting new ones.
+
+        The error of a failed update is raised,
+        the deltas which were not written are left in `pending`.
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._timer
+        await self.flush()
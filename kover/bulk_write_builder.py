@@ -2,13 +2,295 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+import itertools
+from operator import itemgetter
+import struct
+from typing import TYPE_CHECKING, Final
 
-from .helpers import filter_non_null
+from bson import encode
+from bson.raw_bson import RawBSONDocument
+
+from .helpers import filter_non_null, maybe_to_dict
+from .lazy import raw_document_id
+from .models import BulkWriteResult
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from .models import Delete, Update
-    from .typings import xJsonT
+    from .schema import Document
+    from .typings import RawDocumentT, xJsonT
+
+    # kind, namespace, position in ops and the operation itself
+    _KeyedOperation = tuple[str, str, int, xJsonT]
+
+# an operation may exceed maxBsonObjectSize by the fields around its document
+# https://github.com/mongodb/specifications/blob/master/source/crud/bulk-write.md#batch-splitting
+OPERATION_OVERHEAD: Final[int] = 16 * 1024
+# bulkWrite was added in MongoDB 8.0, older servers get per-namespace writes
+# https://github.com/mongodb/specifications/blob/master/source/wireversion-featurelist/wireversion-featurelist.md
+BULK_WRITE_WIRE_VERSION: Final[int] = 25
+_INT32_T: Final[int] = 0x10
+_INT32: Final = struct.Struct("<i")
+# command name and its document sequence per bulkWrite operation kind
+_LEGACY_COMMANDS: Final[dict[str, tuple[str, str]]] = {
+    "insert": ("insert", "documents"),
+    "update": ("update", "updates"),
+    "delete": ("delete", "deletes"),
+}
+_LEGACY_OPTIONS: Final[dict[str, frozenset[str]]] = {
+    "insert": frozenset({
+        "ordered", "bypassDocumentValidation", "comment", "writeConcern",
+    }),
+    "update": frozenset({
+        "ordered", "bypassDocumentValidation", "comment", "writeConcern",
+        "let",
+    }),
+    "delete": frozenset({"ordered", "comment", "writeConcern", "let"}),
+}
+
+
+def _encode_operation(op: xJsonT | RawBSONDocument) -> bytes:
+    # the first field of every operation is its kind with the nsInfo index
+    data = bytes(op.raw) if isinstance(op, RawBSONDocument) else encode(op)
+    if data[4] != _INT32_T:  # e.g. an Int64 index, written as int32 instead
+        kind = next(iter(op))
+        rest = {key: value for key, value in op.items() if key != kind}
+        data = encode({kind: int(op[kind]), **rest})
+    return data
+
+
+def _with_namespace(data: bytes, index: int) -> bytes:
+    value_at = data.index(b"\x00", 5) + 1
+    return data[:value_at] + _INT32.pack(index) + data[value_at + 4:]
+
+
+def split_bulk_write(
+    command: xJsonT,
+    *,
+    max_size: int,
+    max_operation_size: int,
+    max_count: int,
+) -> list[xJsonT]:
+    """Split a bulkWrite command into commands within server limits.
+
+    Operations keep their order, every command gets the `nsInfo`
+    entries of the namespaces its operations use and their indexes
+    are rewritten to point into it. Operations are encoded once
+    into `RawBSONDocument`s, ready to be sent as document sequences.
+
+    Parameters:
+        command : The command built by `BulkWriteBuilder.build`.
+        max_size : Maximum size of `ops` and `nsInfo` of one command.
+        max_operation_size : Maximum size of a single operation.
+        max_count : Maximum amount of operations in one command.
+
+    Returns:
+        The split commands, the command itself if it has no operations.
+
+    Raises:
+        ValueError : If an operation is larger than `max_operation_size`.
+    """
+    ns_info: list[xJsonT] = command["nsInfo"]
+    ns_sizes = [len(encode(info)) for info in ns_info]
+    options = {
+        key: value for key, value in command.items()
+        if key not in {"ops", "nsInfo"}
+    }
+    splits: list[xJsonT] = []
+    ops: list[RawBSONDocument] = []
+    used: dict[int, int] = {}
+    size = 0
+    for position, op in enumerate(command["ops"]):
+        namespace = int(op[next(iter(op))])
+        data = _encode_operation(op)
+        op_size = len(data)
+        if op_size > max_operation_size:
+            msg = f"Operation {position} is larger than {max_operation_size}."
+            raise ValueError(msg)
+        added = op_size + (0 if namespace in used else ns_sizes[namespace])
+        if ops and (size + added > max_size or len(ops) == max_count):
+            splits.append({**options, "ops": ops, "nsInfo": [
+                ns_info[index] for index in used
+            ]})
+            ops, used, size = [], {}, 0
+            added = op_size + ns_sizes[namespace]
+        local = used.setdefault(namespace, len(used))
+        ops.append(RawBSONDocument(_with_namespace(data, local)))
+        size += added
+    if ops or not splits:
+        splits.append({**options, "ops": ops, "nsInfo": [
+            ns_info[index] for index in used
+        ]})
+    return splits
+
+
+@dataclass(frozen=True)
+class LegacyBatch:
+    """A per-namespace write command replacing a part of a bulkWrite.
+
+    Used for servers older than 8.0, which lack the bulkWrite command.
+    """
+
+    database: str
+    command: xJsonT
+    identifier: str
+    statements: list[RawBSONDocument] = field(
+        default_factory=list[RawBSONDocument])
+    positions: list[int] = field(default_factory=list[int])
+
+
+def _legacy_statement(kind: str, op: xJsonT) -> xJsonT:
+    # https://www.mongodb.com/docs/manual/reference/command/update/#syntax
+    # https://www.mongodb.com/docs/manual/reference/command/delete/#syntax
+    if kind == "insert":
+        return op["document"]
+    if kind == "update":
+        return filter_non_null({
+            "q": op["filter"],
+            "u": op["updateMods"],
+            "c": op.get("constants"),
+            "upsert": op.get("upsert"),
+            "multi": op.get("multi"),
+            "arrayFilters": op.get("arrayFilters"),
+            "collation": op.get("collation"),
+            "hint": op.get("hint"),
+        })
+    return filter_non_null({
+        "q": op["filter"],
+        "limit": 0 if op.get("multi") else 1,
+        "collation": op.get("collation"),
+        "hint": op.get("hint"),
+    })
+
+
+def _group_operations(command: xJsonT) -> list[list[_KeyedOperation]]:
+    namespaces = [info["ns"] for info in command["nsInfo"]]
+    keyed: list[_KeyedOperation] = []
+    for position, op in enumerate(command["ops"]):
+        kind = next(iter(op))
+        keyed.append((kind, namespaces[int(op[kind])], position, op))
+    groups: list[list[_KeyedOperation]]
+    if command.get("ordered", True):
+        groups = [
+            list(run)
+            for _, run in itertools.groupby(keyed, key=itemgetter(0, 1))
+        ]
+    else:
+        grouped: dict[tuple[str, str], list[_KeyedOperation]] = {}
+        for op in keyed:
+            grouped.setdefault((op[0], op[1]), []).append(op)
+        groups = list(grouped.values())
+    return groups
+
+
+def split_legacy_bulk_write(
+    command: xJsonT,
+    *,
+    max_size: int,
+    max_count: int,
+) -> list[LegacyBatch]:
+    """Regroup a bulkWrite into per-namespace insert, update and deletes.
+
+    Ordered operations are grouped into runs of the same namespace and
+    kind, so the batches executed one after another keep the order.
+    Unordered operations are grouped by namespace and kind only.
+    Batches are split by `max_size` and `max_count` like `bulkWrite`.
+
+    Parameters:
+        command : The command built by `BulkWriteBuilder.build`.
+        max_size : Maximum size of the statements of one batch.
+        max_count : Maximum amount of statements in one batch.
+
+    Returns:
+        The batches, in the order they should be executed.
+    """
+    batches: list[LegacyBatch] = []
+    for group in _group_operations(command):
+        kind, namespace = group[0][:2]
+        database, collection = namespace.split(".", 1)
+        name, identifier = _LEGACY_COMMANDS[kind]
+        legacy = {name: collection, **{
+            key: value for key, value in command.items()
+            if key in _LEGACY_OPTIONS[kind]
+        }}
+        batch = LegacyBatch(database, legacy, identifier)
+        size = 0
+        for _, _, position, op in group:
+            statement = _legacy_statement(kind, op)
+            data = (
+                statement if isinstance(statement, RawBSONDocument)
+                else RawBSONDocument(encode(statement))
+            )
+            if batch.statements and (
+                size + len(data.raw) > max_size
+                or len(batch.statements) == max_count
+            ):
+                batches.append(batch)
+                batch = LegacyBatch(database, batch.command, identifier)
+                size = 0
+            batch.statements.append(data)
+            batch.positions.append(position)
+            size += len(data.raw)
+        batches.append(batch)
+    return batches
+
+
+def merge_legacy_replies(
+    batches: list[LegacyBatch],
+    replies: list[xJsonT],
+) -> BulkWriteResult:
+    """Merge replies of legacy batches into a bulkWrite like result.
+
+    Legacy commands report only counts, so `results` holds the
+    failed operations and the upserts, with `idx` pointing
+    into the operations of the builder.
+
+    Parameters:
+        batches : The batches that were sent.
+        replies : Replies of the batches, shorter if execution stopped.
+
+    Returns:
+        The merged result.
+    """
+    counts = dict.fromkeys(("nInserted", "nMatched", "nModified",
+                            "nUpserted", "nDeleted"), 0)
+    results: list[xJsonT] = []
+    write_concern_errors: list[xJsonT] = []
+    for batch, reply in zip(batches, replies, strict=False):
+        upserted = reply.get("upserted", [])
+        n = reply.get("n", 0)
+        if batch.identifier == "documents":
+            counts["nInserted"] += n
+        elif batch.identifier == "updates":
+            counts["nMatched"] += n - len(upserted)
+            counts["nModified"] += reply.get("nModified", 0)
+            counts["nUpserted"] += len(upserted)
+        else:
+            counts["nDeleted"] += n
+        results.extend({
+            "ok": 1.0,
+            "idx": batch.positions[entry["index"]],
+            "n": 1,
+            "upserted": {"_id": entry["_id"]},
+        } for entry in upserted)
+        results.extend({
+            **error,
+            "ok": 0.0,
+            "idx": batch.positions[error["index"]],
+        } for error in reply.get("writeErrors", []))
+        if "writeConcernError" in reply:
+            write_concern_errors.append(reply["writeConcernError"])
+    for result in results:
+        result.pop("index", None)
+    results.sort(key=itemgetter("idx"))
+    return BulkWriteResult.model_validate({
+        **counts,
+        "nErrors": sum(result["ok"] != 1 for result in results),
+        "results": results,
+        "writeConcernErrors": write_concern_errors,
+    })
 
 
 # https://www.mongodb.com/docs/manual/reference/command/bulkWrite
@@ -54,15 +336,23 @@ class BulkWriteBuilder:
 
     def add_insert(
         self,
-        documents: list[xJsonT],
+        documents: Sequence[xJsonT | Document | RawDocumentT],
         /,
         *,
         ns: str,
     ) -> None:
-        """Adds an Insert operations into the builder."""
+        """Adds an Insert operations into the builder.
+
+        Raw documents are passed into the command without being
+        decoded, an `_id` is prepended to those missing it.
+        """
         idx = self._get_ns_idx(ns)
         for document in documents:
-            self._operations.append({"insert": idx, "document": document})
+            if isinstance(document, RawBSONDocument | bytes):
+                insertable, _ = raw_document_id(document)
+            else:
+                insertable = maybe_to_dict(document)
+            self._operations.append({"insert": idx, "document": insertable})
 
     def add_update(
         self,
@@ -0,0 +1,276 @@
+"""Kover Change Stream Module."""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import suppress
+from typing import TYPE_CHECKING, Final
+
+from bson import Int64
+from typing_extensions import Self
+
+from .exceptions import NETWORK_ERRORS, OperationFailure
+from .helpers import classrepr, filter_non_null
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from bson import Timestamp
+
+    from .database import Database
+    from .session import Session
+    from .typings import (
+        FULL_DOCUMENT_BEFORE_CHANGE_T,
+        FULL_DOCUMENT_T,
+        xJsonT,
+    )
+
+# servers before 4.4 do not attach the ResumableChangeStreamError label
+# https://github.com/mongodb/specifications/blob/master/source/change-streams/change-streams.md#resumable-error
+_RESUMABLE_CODES: Final[frozenset[int]] = frozenset({
+    6,  # HostUnreachable
+    7,  # HostNotFound
+    43,  # CursorNotFound
+    63,  # StaleShardVersion
+    89,  # NetworkTimeout
+    91,  # ShutdownInProgress
+    133,  # FailedToSatisfyReadPreference
+    150,  # StaleEpoch
+    189,  # PrimarySteppedDown
+    234,  # RetryChangeStream
+    262,  # ExceededTimeLimit
+    9001,  # SocketException
+    10107,  # NotWritablePrimary
+    11600,  # InterruptedAtShutdown
+    11602,  # InterruptedDueToReplStateChange
+    13435,  # NotPrimaryNoSecondaryOk
+    13436,  # NotPrimaryOrSecondary
+})
+
+
+def _is_resumable(exc_value: Exception) -> bool:
+    if isinstance(exc_value, NETWORK_ERRORS):
+        return True
+    if not isinstance(exc_value, OperationFailure):
+        return False
+    if exc_value.has_error_label("ResumableChangeStreamError"):
+        return True
+    code = exc_value.code
+    if code == -1:  # codes without a known name keep the whole reply
+        code = exc_value.message.get("code", -1)
+    return code in _RESUMABLE_CODES
+
+
+@classrepr("database", "collection", "resume_token")
+class ChangeStream:
+    """Stream of change events of a collection, database or cluster.
+
+    The stream is opened lazily on first iteration. The latest resume
+    token is tracked, including `postBatchResumeToken` of empty batches,
+    so after a network or resumable server error the stream is resumed
+    once where it stopped without losing or repeating events.
+
+    ```
+    >>> inserts = [{"$match": {"operationType": "insert"}}]
+    >>> async with collection.watch(inserts) as stream:
+    ...     async for event in stream:
+    ...         print(event["fullDocument"])
+    ```
+
+    Attributes:
+        database : The database the stream is opened on.
+        collection : The watched collection, None for database
+            and cluster streams.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        collection: str | None = None,
+        pipeline: list[xJsonT] | None = None,
+        *,
+        full_document: FULL_DOCUMENT_T | None = None,
+        full_document_before_change: (
+            FULL_DOCUMENT_BEFORE_CHANGE_T | None
+        ) = None,
+        resume_after: xJsonT | None = None,
+        start_after: xJsonT | None = None,
+        start_at_operation_time: Timestamp | None = None,
+        batch_size: int | None = None,
+        max_await_time_ms: int | None = None,
+        all_changes_for_cluster: bool = False,
+    ) -> None:
+        self.database = database
+        self.collection = collection
+        self._pipeline = pipeline or []
+        self._options = filter_non_null({
+            "fullDocument": full_document,
+            "fullDocumentBeforeChange": full_document_before_change,
+            "allChangesForCluster": all_changes_for_cluster or None,
+        })
+        self._start_after = start_after
+        self._start_at_operation_time = start_at_operation_time
+        self._batch_size = batch_size
+        self._max_await_time_ms = max_await_time_ms
+        self._resume_token: xJsonT | None = start_after or resume_after
+        self._post_batch_token: xJsonT | None = None
+        self._returned_event: bool = False
+        self._id: Int64 | None = None
+        self._namespace: str | None = None
+        self._session: Session | None = None
+        self._closed: bool = False
+        self._docs: deque[xJsonT] = deque()
+
+    @property
+    def resume_token(self) -> xJsonT | None:
+        """Token to resume after the last event returned by the stream."""
+        return self._resume_token
+
+    @property
+    def alive(self) -> bool:
+        """Check if the stream may still return events."""
+        return not self._closed and (self._id is None or int(self._id) != 0)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    def _change_stream_stage(self) -> xJsonT:
+        options = dict(self._options)
+        if self._resume_token is not None:
+            # startAfter must be kept until an event was returned,
+            # it is the only way to pass an invalidate event.
+            key = "resumeAfter"
+            if self._start_after is not None and not self._returned_event:
+                key = "startAfter"
+            options[key] = self._resume_token
+        elif self._start_at_operation_time is not None:
+            options["startAtOperationTime"] = self._start_at_operation_time
+        return {"$changeStream": options}
+
+    def _process_cursor(self, cursor: xJsonT, key: str) -> list[xJsonT]:
+        self._id = cursor["id"]
+        self._namespace = cursor["ns"].split(".", 1)[1]
+        self._post_batch_token = cursor.get("postBatchResumeToken")
+        return cursor[key]
+
+    async def _open(self) -> list[xJsonT]:
+        if self._session is None:
+            client = self.database.client
+            self._session = await client.start_session(
+                causal_consistency=False)
+        command = filter_non_null({
+            "aggregate": self.collection or 1,
+            "pipeline": [self._change_stream_stage(), *self._pipeline],
+            "cursor": filter_non_null({"batchSize": self._batch_size}),
+        })
+        reply = await self.database.command(command, session=self._session)
+        if (
+            self._resume_token is None
+            and self._start_at_operation_time is None
+        ):  # resuming before the first event starts at the open time
+            self._start_at_operation_time = reply.get("operationTime")
+        return self._process_cursor(reply["cursor"], "firstBatch")
+
+    async def _get_more(self) -> list[xJsonT]:
+        assert self._id is not None, "getMore before the first batch."
+        command = filter_non_null({
+            "getMore": Int64(self._id),
+            "collection": self._namespace,
+            "batchSize": self._batch_size,
+            "maxTimeMS": self._max_await_time_ms,
+        })
+        reply = await self.database.command(command, session=self._session)
+        return self._process_cursor(reply["cursor"], "nextBatch")
+
+    async def _kill_cursor(self) -> None:
+        cursor_id, self._id = self._id, None
+        if cursor_id is None or int(cursor_id) == 0:
+            return
+        with suppress(OperationFailure, *NETWORK_ERRORS):
+            await self.database.command({
+                "killCursors": self._namespace,
+                "cursors": [cursor_id],
+            }, session=self._session)
+
+    async def _resume(self, exc_value: Exception) -> list[xJsonT]:
+        if isinstance(exc_value, NETWORK_ERRORS):
+            self._id = None  # the connection is gone with the cursor
+            if self._session is not None:
+                self._session.end()
+                self._session = None
+        else:
+            await self._kill_cursor()
+        return await self._open()
+
+    async def _fetch(self) -> list[xJsonT] | None:
+        if not self.alive:
+            return None
+        try:
+            if self._id is None:
+                return await self._open()
+            return await self._get_more()
+        except Exception as exc_value:
+            if self._closed or not _is_resumable(exc_value):
+                raise
+            return await self._resume(exc_value)
+
+    def _advance_token(self, event: xJsonT | None) -> None:
+        if event is not None:
+            self._resume_token = event["_id"]
+            self._returned_event = True
+        if not self._docs and self._post_batch_token is not None:
+            self._resume_token = self._post_batch_token
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> xJsonT:
+        while not self._docs:
+            batch = await self._fetch()
+            if batch is None:
+                await self.close()
+                raise StopAsyncIteration
+            self._docs.extend(batch)
+            if not batch:
+                self._advance_token(None)
+        event = self._docs.popleft()
+        self._advance_token(event)
+        return event
+
+    async def batches(self) -> AsyncIterator[list[xJsonT]]:
+        """Iterate over change events a server batch at a time.
+
+        The resume token advances past a batch when the next one
+        is requested, so a batch is never skipped on resume.
+
+        Yields:
+            Non-empty lists of change events.
+        """
+        try:
+            if self._docs:
+                buffered = list(self._docs)
+                self._docs.clear()
+                yield buffered
+                self._advance_token(buffered[-1])
+            while (batch := await self._fetch()) is not None:
+                if batch:
+                    yield batch
+                    self._advance_token(batch[-1])
+                else:
+                    self._advance_token(None)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Kill the server cursor and release the session."""
+        if self._closed:
+            return
+        self._closed = True
+        await self._kill_cursor()
+        self._docs.clear()
+        if self._session is not None:
+            self._session.end()
+            self._session = None
@@ -3,30 +3,92 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import suppress
 import json
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Final, Literal
+import weakref
 
+from bson import Int64, encode
 from typing_extensions import Self
 
+from .bulk_write_builder import (
+    BULK_WRITE_WIRE_VERSION,
+    OPERATION_OVERHEAD,
+    merge_legacy_replies,
+    split_bulk_write,
+    split_legacy_bulk_write,
+)
+from .change_stream import ChangeStream
+from .collection import DEFAULT_INSERT_CONCURRENCY
+from .cursor import CursorReaper
 from .database import Database
+from .exceptions import (
+    NETWORK_ERRORS,
+    OperationFailure,
+    mark_request_failure,
+)
 from .helpers import (
+    batched,
     classrepr,
     filter_non_null,
     maybe_to_dict,
 )
-from .models import BuildInfo, ReadConcern, WriteConcern
+from .models import BuildInfo, BulkWriteResult, ReadConcern, WriteConcern
 from .network import MongoTransport
 from .schema import SchemaGenerator
-from .session import Session
+from .session import ServerSessionPool, Session, newer_cluster_time
 from .typings import DEFAULT_MONGODB_PORT
 from .uri_parser import parse_uri
 
 if TYPE_CHECKING:
-    from .models import ReplicaSetConfig
+    from bson import Timestamp
+    from bson.codec_options import CodecOptions
+
+    from .bulk_write_builder import LegacyBatch
+    from .models import HelloResult, ReplicaSetConfig
     from .network import AuthCredentials
     from .schema import Document
+    from .session import ServerSession
     from .transaction import Transaction
-    from .typings import COMPRESSION_T, DocumentT, xJsonT
+    from .typings import (
+        COMPRESSION_T,
+        FULL_DOCUMENT_BEFORE_CHANGE_T,
+        FULL_DOCUMENT_T,
+        DocumentSequencesT,
+        DocumentT,
+        WriteBuffer,
+        xJsonT,
+    )
+
+# commands that must never carry an implicit session
+# https://github.com/mongodb/specifications/blob/master/source/sessions/driver-sessions.md#when-opening-and-authenticating-a-connection
+_SESSIONLESS_COMMANDS: Final[frozenset[str]] = frozenset({
+    "hello",
+    "isMaster",
+    "ismaster",
+    "saslStart",
+    "saslContinue",
+    "startSession",
+    "endSessions",
+    "refreshSessions",
+    "killSessions",
+    "killAllSessions",
+    "killAllSessionsByPattern",
+    "logout",
+})
+# https://www.mongodb.com/docs/manual/reference/command/endSessions/
+# https://www.mongodb.com/docs/manual/reference/command/refreshSessions/
+_MAX_SESSIONS_PER_COMMAND: Final[int] = 10_000
+# header, section kinds, identifiers and fields added to every command
+_OP_MSG_RESERVE: Final[int] = 1000
+_BULK_WRITE_COUNTS: Final[tuple[str, ...]] = (
+    "nErrors",
+    "nInserted",
+    "nUpserted",
+    "nMatched",
+    "nModified",
+    "nDeleted",
+)
 
 
 def _create_connection_pool(
@@ -60,6 +122,8 @@ class Kover:
         credentials: AuthCredentials | None = None,
         compression: COMPRESSION_T | None = None,
         application: xJsonT | None = None,
+        session_refresh_interval: float | None = None,
+        cursor_batch_bytes: int | None = None,
     ) -> None:
         self._write_concern = WriteConcern(w=w)
         self._pool = pool
@@ -67,6 +131,41 @@ class Kover:
         self._compression = compression
         self._application = application
         self._schema_generator = SchemaGenerator()
+        self._sessions = ServerSessionPool()
+        self._cluster_time: xJsonT | None = None
+        self._session_refresh_interval = session_refresh_interval
+        self._session_keeper: asyncio.Task[None] | None = None
+        self._closing = asyncio.Event()
+        self._cursor_reaper = CursorReaper(self)
+        self._cursor_batch_bytes = cursor_batch_bytes
+        self._hello: HelloResult | None = None
+        self._write_buffers: weakref.WeakSet[WriteBuffer] = weakref.WeakSet()
+
+    @property
+    def cursor_reaper(self) -> CursorReaper:
+        """Kills closed and abandoned cursors of this client in batches."""
+        return self._cursor_reaper
+
+    @property
+    def cursor_batch_bytes(self) -> int | None:
+        """Target size of cursor batches if adaptive batching is enabled."""
+        return self._cursor_batch_bytes
+
+    @property
+    def hello(self) -> HelloResult | None:
+        """Hello reply of the last opened connection, carries server limits.
+
+        None until the first connection of the pool is opened.
+        """
+        return self._hello
+
+    def register_write_buffer(self, buffer: WriteBuffer) -> None:
+        """Make the client flush the buffer when it is closed.
+
+        Parameters:
+            buffer : The buffer to close before the connections are.
+        """
+        self._write_buffers.add(buffer)
 
     async def __aenter__(self) -> Self:
         return self
@@ -80,13 +179,67 @@ class Kover:
 
         This method closes the transport writer
         and waits until the connection is fully closed.
+        Pending writes of buffers are sent first, if one of them
+        fails its error is raised after the connections were closed.
         """
         if self._pool.empty():
             return
 
+        self._closing.set()
+        failures = [
+            result for result in await asyncio.gather(*(
+                buffer.close() for buffer in list(self._write_buffers)
+            ), return_exceptions=True)
+            if isinstance(result, Exception)
+        ]
+        await self._cursor_reaper.close()
+        if self._session_keeper is not None:
+            await self._session_keeper
+        await self._end_session_documents(self._sessions.drain())
         while not self._pool.empty():
             conn = await self._pool.get()
             await conn.close()
+        if failures:
+            raise failures[0]
+
+    async def _end_session_documents(self, documents: list[xJsonT]) -> None:
+        for chunk in batched(documents, _MAX_SESSIONS_PER_COMMAND):
+            # the server expires sessions by itself anyway
+            with suppress(OperationFailure, *NETWORK_ERRORS):
+                await self.request({"endSessions": chunk})
+
+    async def _refresh_server_sessions(
+        self,
+        server_sessions: list[ServerSession],
+    ) -> None:
+        for chunk in batched(server_sessions, _MAX_SESSIONS_PER_COMMAND):
+            documents = [x.document for x in chunk]
+            await self.request({"refreshSessions": documents})
+            for server_session in chunk:
+                server_session.touch()
+
+    def _ensure_session_keeper(self) -> None:
+        interval = self._session_refresh_interval
+        if (
+            interval is None
+            or self._session_keeper is not None
+            or self._closing.is_set()
+        ):
+            return
+        self._session_keeper = asyncio.create_task(
+            self._keep_sessions_alive(interval))
+
+    async def _keep_sessions_alive(self, interval: float) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._closing.wait(), timeout=interval)
+                return
+            # sessions expiring before the tick after next are refreshed
+            expiring = self._sessions.expiring(within=interval * 2)
+            with suppress(OperationFailure, *NETWORK_ERRORS):
+                await self._refresh_server_sessions(expiring)
+            discarded = self._sessions.pop_discarded()
+            await self._end_session_documents(discarded)
 
     def get_database(self, name: str) -> Database:
         """Get a Database instance for the specified database name.
@@ -134,12 +287,20 @@ class Kover:
         cls,
         uri: str,
         loop: asyncio.AbstractEventLoop | None = None,
+        *,
+        session_refresh_interval: float | None = None,
+        cursor_batch_bytes: int | None = None,
     ) -> Kover:
         """Create an instance of Kover client by passing a uri.
 
         Parameters:
             uri : The uri itself.
             loop : Optional asyncio loop
+            session_refresh_interval : Interval in seconds of the background
+                task that refreshes checked out sessions close to expiry
+                and ends discarded ones. Disabled if None.
+            cursor_batch_bytes : Enables adaptive cursor batch sizing,
+                growing getMore batches up to this amount of bytes.
 
         Returns:
             An instance of newly created Kover client.
@@ -173,6 +334,8 @@ class Kover:
             credentials=parsed.credentials,
             compression=compressors,
             application=application,
+            session_refresh_interval=session_refresh_interval,
+            cursor_batch_bytes=cursor_batch_bytes,
         )
 
     @classmethod
@@ -188,6 +351,8 @@ class Kover:
         application: xJsonT | None = None,
         write_concern: str | int = "majority",
         max_pool_size: int = 100,
+        session_refresh_interval: float | None = None,
+        cursor_batch_bytes: int | None = None,
     ) -> Kover:
         """Create and return a new Kover client instance.
 
@@ -203,6 +368,12 @@ class Kover:
             application : document that will be included in hello payload
                 under the "application" field.
             write_concern : the value of default write concern used.
+            max_pool_size : the maximum amount of connections.
+            session_refresh_interval : Interval in seconds of the background
+                task that refreshes checked out sessions close to expiry
+                and ends discarded ones. Disabled if None.
+            cursor_batch_bytes : Enables adaptive cursor batch sizing,
+                growing getMore batches up to this amount of bytes.
 
         Returns:
             An instance of the Kover client.
@@ -216,78 +387,436 @@ class Kover:
             credentials=credentials,
             compression=compression,
             application=application,
+            session_refresh_interval=session_refresh_interval,
+            cursor_batch_bytes=cursor_batch_bytes,
         )
 
+    def _acquire_implicit_session(
+        self,
+        doc: DocumentT,
+        *,
+        transaction: Transaction | None,
+        wait_response: bool,
+    ) -> ServerSession | None:
+        if (
+            transaction is not None
+            or not wait_response  # unacknowledged writes
+            or self._sessions.timeout_minutes is None
+            or "lsid" in doc
+            or next(iter(doc)) in _SESSIONLESS_COMMANDS
+        ):
+            return None
+        return self._sessions.acquire()
+
+    def release_server_session(self, server_session: ServerSession) -> None:
+        """Return a server session into the client's session pool.
+
+        Parameters:
+            server_session : The server session to release.
+        """
+        self._sessions.release(server_session)
+
     async def request(
         self,
         doc: DocumentT,
         *,
         db_name: str = "admin",
         transaction: Transaction | None = None,
+        session: Session | None = None,
         wait_response: bool = True,
+        codec_options: CodecOptions[Any] | None = None,
+        sequences: DocumentSequencesT | None = None,
     ) -> xJsonT:
         """Send a request to MongoDB Server.
 
+        Commands that are not bound to a session or transaction
+        are sent with an implicit session taken from the session pool.
+        Passing `codec_options` changes how the reply is decoded,
+        e.g. `RawBSONDocument` keeps nested documents as bytes.
+        `sequences` are sent as OP_MSG document sequences,
+        which may be larger than a single BSON document.
+
         Returns:
             Document, containing response from the server.
+
+        Raises:
+            OperationFailure : If the server replied with an error,
+                its cluster and operation times are still processed.
+            OSError : If the connection failed, the session is marked dirty.
+            EOFError : If the server closed the connection mid-reply.
         """
+        self._ensure_session_keeper()
         conn = await self._pool.get()
         if not conn.is_connected:
-            await conn.connect()
-            hello = await conn.hello(
-                self._compression, self._credentials, self._application)
-
-            if hello.requires_auth:
-                mechanism = hello.get_auth_mechanism()
-                await conn.authorize(mechanism, credentials=self._credentials)
+            try:
+                await self._open_connection(conn)
+            except (OSError, EOFError) as exc_value:
+                mark_request_failure(exc_value)
+                raise
+
+        owner = session or (transaction.session if transaction else None)
+        server_session = self._acquire_implicit_session(
+            doc,
+            transaction=transaction,
+            wait_response=wait_response,
+        ) if owner is None else owner.server_session
+        doc = {**doc}
+        if server_session is not None and transaction is None:
+            doc["lsid"] = server_session.document
+        self._apply_causal_consistency(doc, owner, transaction=transaction)
         try:
-            return await conn.request(
+            reply = await conn.request(
                 doc,
                 db_name=db_name,
                 transaction=transaction,
                 wait_response=wait_response,
+                codec_options=codec_options,
+                sequences=sequences,
             )
+        except OperationFailure as exc_value:
+            # error replies carry $clusterTime and operationTime too
+            if exc_value.details is not None:
+                self._process_cluster_time(exc_value.details, owner)
+            raise
+        except (OSError, EOFError) as exc_value:
+            mark_request_failure(exc_value)
+            if server_session is not None:
+                server_session.dirty = True
+            raise
         finally:
             await self._pool.put(conn)
+            if server_session is not None:
+                server_session.touch()
+                if owner is None:
+                    self._sessions.release(server_session)
+
+        self._process_cluster_time(reply, owner)
+        return reply
+
+    async def _open_connection(self, conn: MongoTransport) -> None:
+        await conn.connect()
+        hello = self._hello = await conn.hello(
+            self._compression, self._credentials, self._application)
+        timeout = hello.logical_session_timeout_minutes
+        self._sessions.timeout_minutes = timeout
+
+        if hello.requires_auth:
+            mechanism = hello.get_auth_mechanism()
+            await conn.authorize(mechanism, credentials=self._credentials)
+
+    def _apply_causal_consistency(
+        self,
+        doc: xJsonT,
+        session: Session | None,
+        *,
+        transaction: Transaction | None,
+    ) -> None:
+        cluster_time = self._cluster_time
+        if session is not None:
+            cluster_time = newer_cluster_time(
+                cluster_time, session.cluster_time)
+            if transaction is None or transaction.action_count == 0:
+                session.apply_read_concern(
+                    doc, first_in_transaction=transaction is not None)
+        if cluster_time is not None:  # gossip the greatest seen cluster time
+            doc["$clusterTime"] = cluster_time
+
+    def _process_cluster_time(
+        self,
+        reply: xJsonT,
+        session: Session | None,
+    ) -> None:
+        cluster_time: xJsonT | None = reply.get("$clusterTime")
+        if cluster_time is not None:
+            self._cluster_time = newer_cluster_time(
+                self._cluster_time, cluster_time)
+        if session is None:
+            return
+        if cluster_time is not None:
+            session.advance_cluster_time(cluster_time)
+        if "operationTime" in reply:
+            session.advance_operation_time(reply["operationTime"])
+
+    async def _server_hello(self) -> HelloResult:
+        if self._hello is None:  # hello is sent on the first connection
+            await self.request({"ping": 1})
+        assert self._hello is not None, "No hello after connecting."
+        return self._hello
+
+    async def _drain_bulk_write_cursor(
+        self,
+        cursor: xJsonT,
+        *,
+        transaction: Transaction | None,
+        session: Session | None,
+    ) -> list[xJsonT]:
+        results: list[xJsonT] = list(cursor["firstBatch"])
+        cursor_id = int(cursor["id"])
+        while cursor_id != 0:
+            reply = await self.request({
+                "getMore": Int64(cursor_id),
+                "collection": "$cmd.bulkWrite",
+            }, transaction=transaction, session=session)
+            results.extend(reply["cursor"]["nextBatch"])
+            cursor_id = int(reply["cursor"]["id"])
+        return results
+
+    async def _legacy_bulk_write(
+        self,
+        document: xJsonT,
+        hello: HelloResult,
+        *,
+        max_concurrency: int,
+        transaction: Transaction | None,
+        session: Session | None,
+    ) -> BulkWriteResult:
+        options = {
+            key: value for key, value in document.items()
+            if key not in {"ops", "nsInfo"}
+        }
+        batches = split_legacy_bulk_write(
+            document,
+            max_size=(
+                hello.max_message_size_bytes
+                - len(encode(options))
+                - _OP_MSG_RESERVE
+            ),
+            max_count=hello.max_write_batch_size,
+        )
 
+        async def send(batch: LegacyBatch) -> xJsonT:
+            try:
+                return await self.request(
+                    batch.command,
+                    db_name=batch.database,
+                    sequences={batch.identifier: batch.statements},
+                    transaction=transaction,
+                    session=session,
+                )
+            except OperationFailure as exc_value:
+                details = exc_value.details or {}
+                if not details.get("writeErrors"):
+                    raise
+                return details
+
+        ordered = document.get("ordered", True)
+        if (
+            ordered
+            or transaction is not None
+            or session is not None
+            or max_concurrency == 1
+        ):
+            replies: list[xJsonT] = []
+            for batch in batches:
+                replies.append(await send(batch))
+                if ordered and replies[-1].get("writeErrors"):
+                    break  # nothing is written past the first error
+            return merge_legacy_replies(batches, replies)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(batch: LegacyBatch) -> xJsonT:
+            async with semaphore:
+                return await send(batch)
+
+        replies = await asyncio.gather(*map(bounded, batches))
+        return merge_legacy_replies(batches, replies)
+
+    # https://www.mongodb.com/docs/manual/reference/command/bulkWrite
     async def bulk_write(
         self,
         document: xJsonT,
         transaction: Transaction | None = None,
-    ) -> xJsonT:
+        session: Session | None = None,
+        *,
+        max_concurrency: int = DEFAULT_INSERT_CONCURRENCY,
+    ) -> BulkWriteResult:
         """Execute a bulkWrite operation and return info about it.
 
+        Operations are split into as few commands as the server's
+        `maxMessageSizeBytes` and `maxWriteBatchSize` allow and sent
+        as document sequences. The result cursor of every command
+        is drained. Ordered writes stop at the first command
+        reporting errors.
+
+        Servers older than 8.0 have no bulkWrite, operations are
+        regrouped into `insert`, `update` and `delete` commands per
+        namespace then. Ordered operations keep their order, groups
+        of unordered ones are sent concurrently outside of sessions
+        and transactions.
+        Their `results` only hold errors and upserts.
+
+        Parameters:
+            document : The command built by `BulkWriteBuilder.build`.
+            transaction : The transaction context for the operation.
+            session : The session context for the operation.
+            max_concurrency : Maximum amount of unordered
+                per-namespace commands in flight on older servers.
+
         Returns:
-            Document, containing info about this operation.
+            The counts and results merged over all commands.
         """
-        return await self.request(document, transaction=transaction)
+        hello = await self._server_hello()
+        if hello.max_wire_version < BULK_WRITE_WIRE_VERSION:
+            return await self._legacy_bulk_write(
+                document,
+                hello,
+                max_concurrency=max_concurrency,
+                transaction=transaction,
+                session=session,
+            )
+        options = {
+            key: value for key, value in document.items()
+            if key not in {"ops", "nsInfo"}
+        }
+        splits = split_bulk_write(
+            document,
+            max_size=(
+                hello.max_message_size_bytes
+                - len(encode(options))
+                - _OP_MSG_RESERVE
+            ),
+            max_operation_size=hello.max_bson_object_size + OPERATION_OVERHEAD,
+            max_count=hello.max_write_batch_size,
+        )
+        owned = None
+        if transaction is None and session is None:
+            # getMore must use the same lsid as the bulkWrite
+            owned = session = await self.start_session(
+                causal_consistency=False)
+
+        counts: dict[str, int] = dict.fromkeys(_BULK_WRITE_COUNTS, 0)
+        results: list[xJsonT] = []
+        write_concern_errors: list[xJsonT] = []
+        offset = 0
+        try:
+            for split in splits:
+                reply = await self.request(options, sequences={
+                    "ops": split["ops"],
+                    "nsInfo": split["nsInfo"],
+                }, transaction=transaction, session=session)
+                for key in _BULK_WRITE_COUNTS:
+                    counts[key] += reply.get(key, 0)
+                if "writeConcernError" in reply:
+                    write_concern_errors.append(reply["writeConcernError"])
+                results.extend(
+                    {**result, "idx": offset + result["idx"]}
+                    for result in await self._drain_bulk_write_cursor(
+                        reply["cursor"],
+                        transaction=transaction,
+                        session=session,
+                    )
+                )
+                offset += len(split["ops"])
+                if options.get("ordered", True) and reply.get("nErrors"):
+                    break
+        finally:
+            if owned is not None:
+                owned.end()
+        return BulkWriteResult.model_validate({
+            **counts,
+            "results": results,
+            "writeConcernErrors": write_concern_errors,
+        })
 
     async def refresh_sessions(self, sessions: list[Session]) -> None:
         """Refresh the provided list of sessions.
 
+        Sessions are refreshed in batches, see `session_refresh_interval`
+        for doing this automatically in background.
+
         Parameters:
             sessions : A list of Session objects to be refreshed.
         """
-        documents: list[xJsonT] = [x.document for x in sessions]
-        await self.request({"refreshSessions": documents})
+        await self._refresh_server_sessions([
+            x.server_session for x in sessions
+        ])
 
     async def end_sessions(self, sessions: list[Session]) -> None:
         """End the provided list of sessions.
 
+        Ended sessions are not returned into the session pool, they are
+        ended in batches together with other discarded sessions.
+
         Parameters:
             sessions : A list of Session objects to be ended.
         """
-        documents: list[xJsonT] = [x.document for x in sessions]
-        await self.request({"endSessions": documents})
+        for session in sessions:
+            session.server_session.dirty = True
+            session.end()
+        await self._end_session_documents(self._sessions.pop_discarded())
+
+    # https://www.mongodb.com/docs/manual/reference/method/Mongo.watch/
+    def watch(
+        self,
+        pipeline: list[xJsonT] | None = None,
+        *,
+        full_document: FULL_DOCUMENT_T | None = None,
+        full_document_before_change: (
+            FULL_DOCUMENT_BEFORE_CHANGE_T | None
+        ) = None,
+        resume_after: xJsonT | None = None,
+        start_after: xJsonT | None = None,
+        start_at_operation_time: Timestamp | None = None,
+        batch_size: int | None = None,
+        max_await_time_ms: int | None = None,
+    ) -> ChangeStream:
+        """Watch changes of every database in the cluster.
 
-    async def start_session(self) -> Session:
+        Parameters:
+            pipeline : Aggregation stages applied after `$changeStream`.
+            full_document : Whether update events carry the
+                current version of the document.
+            full_document_before_change : Whether events carry
+                the document as it was before the change.
+            resume_after : Resume token to start after.
+            start_after : Resume token to start after, unlike
+                `resume_after` it may point to an invalidate event.
+            start_at_operation_time : Start at this cluster time.
+            batch_size : Maximum amount of events in a batch.
+            max_await_time_ms : How long the server waits
+                for new events before returning an empty batch.
+
+        Returns:
+            A change stream, opened on first iteration.
+        """
+        return ChangeStream(
+            self.get_database("admin"),
+            None,
+            pipeline,
+            full_document=full_document,
+            full_document_before_change=full_document_before_change,
+            resume_after=resume_after,
+            start_after=start_after,
+            start_at_operation_time=start_at_operation_time,
+            batch_size=batch_size,
+            max_await_time_ms=max_await_time_ms,
+            all_changes_for_cluster=True,
+        )
+
+    async def start_session(
+        self,
+        *,
+        causal_consistency: bool = True,
+    ) -> Session:
         """Start a new session.
 
+        The session is taken from the client's session pool, its lsid
+        is generated locally so no round trip to the server is made.
+        Call `Session.end` to return it back into the pool.
+
+        Parameters:
+            causal_consistency : Whether reads in this session should
+                observe the session's preceding operations.
+
         Returns:
             An instance of the Session class representing the started session.
         """
-        req = await self.request({"startSession": 1.0})
-        return Session(document=req["id"], client=self)
+        return Session(
+            self._sessions.acquire(),
+            client=self,
+            causal_consistency=causal_consistency,
+        )
 
     async def build_info(self) -> BuildInfo:
         """Retrieve build information from the MongoDB server.
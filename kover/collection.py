@@ -2,26 +2,117 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, TypeVar
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Final, TypeVar
 
-from bson import ObjectId
+from bson import ObjectId, encode
+from bson.raw_bson import RawBSONDocument
 from typing_extensions import overload
 
-from .cursor import Cursor
+from .buffers import (
+    COALESCE_MAX_DOCUMENTS,
+    COALESCE_WINDOW,
+    COUNTER_INTERVAL,
+    COUNTER_MAX_OPERATIONS,
+    LOADER_MAX_KEYS,
+    CounterBuffer,
+    DocumentLoader,
+    InsertCoalescer,
+)
+from .change_stream import ChangeStream
+from .cursor import AggregateCursor, Cursor
 from .enums import IndexDirection, IndexType, ValidationLevel
-from .helpers import classrepr, filter_non_null, maybe_to_dict
+from .exceptions import BulkWriteError, OperationFailure
+from .helpers import (
+    classrepr,
+    filter_non_null,
+    maybe_to_dict,
+    maybe_to_dicts,
+)
+from .lazy import raw_document_id
 from .models import Delete, Index
+from .models.other import MAX_BSON_OBJECT_SIZE, MAX_WRITE_BATCH_SIZE
 from .schema import Document
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from bson import Timestamp
+
     from .database import Database
+    from .lazy import LazyDocument
     from .models import Collation, ReadConcern, Update, WriteConcern
-    from .session import Transaction
-    from .typings import xJsonT
-
-T = TypeVar("T", bound=Document)
+    from .session import Session, Transaction
+    from .typings import (
+        FULL_DOCUMENT_BEFORE_CHANGE_T,
+        FULL_DOCUMENT_T,
+        RawDocumentT,
+        xJsonT,
+    )
+
+T = TypeVar("T", bound="Document | LazyDocument")
+
+DEFAULT_SCAN_OVERSAMPLE: Final[int] = 20
+
+DEFAULT_INSERT_CONCURRENCY: Final[int] = 4
+
+
+def _split_documents(
+    documents: list[RawBSONDocument],
+    max_size: int,
+    max_count: int,
+) -> list[list[RawBSONDocument]]:
+    # the server accepts commands up to maxBsonObjectSize + 16KiB,
+    # the extra room is left for the fields around the documents.
+    # https://github.com/mongodb/specifications/blob/master/source/crud/bulk-api.md#batch-splitting
+    splits: list[list[RawBSONDocument]] = [[]]
+    size = 0
+    for document in documents:
+        split = splits[-1]
+        # array element header: type byte, index key and its null byte
+        element_size = len(document.raw) + len(str(len(split))) + 2
+        if split and (
+            size + element_size > max_size or len(split) == max_count
+        ):
+            split = list[RawBSONDocument]()
+            splits.append(split)
+            size = 0
+            element_size = len(document.raw) + 3
+        split.append(document)
+        size += element_size
+    return splits
+
+
+def _merge_insert_replies(
+    ids: list[ObjectId],
+    splits: list[list[RawBSONDocument]],
+    replies: list[xJsonT],
+    *,
+    ordered: bool,
+) -> list[ObjectId]:
+    write_errors: list[xJsonT] = []
+    failed: set[int] = set()
+    offset = 0
+    for split, reply in zip(splits, replies, strict=False):
+        for error in reply.get("writeErrors", []):
+            index = offset + error["index"]
+            write_errors.append({**error, "index": index})
+            failed.add(index)
+        offset += len(split)
+    if not write_errors:
+        return ids
+
+    if ordered:  # nothing is written past the first error
+        inserted = ids[:min(failed)]
+    else:
+        inserted = [
+            value for index, value in enumerate(ids) if index not in failed
+        ]
+    raise BulkWriteError({
+        "writeErrors": write_errors,
+        "nInserted": sum(reply.get("n", 0) for reply in replies),
+    }, inserted)
 
 
 @classrepr("name", "database")
@@ -111,10 +202,119 @@ class Collection:
             "validationLevel": level.value.lower(),
         })
 
+    def coalesce_inserts(
+        self,
+        *,
+        window: float = COALESCE_WINDOW,
+        max_documents: int = COALESCE_MAX_DOCUMENTS,
+        bypass_document_validation: bool = False,
+        comment: str | None = None,
+    ) -> InsertCoalescer:
+        """Create a coalescer merging concurrent inserts into this collection.
+
+        Parameters:
+            window : Seconds to collect documents before sending them.
+            max_documents : Amount of queued documents sent right away.
+            bypass_document_validation : Allows the writes to circumvent
+                document validation (default is False).
+            comment : A comment to attach to the merged inserts.
+
+        Returns:
+            The coalescer, flushed when the client is closed.
+        """
+        return InsertCoalescer(
+            self,
+            window=window,
+            max_documents=max_documents,
+            bypass_document_validation=bypass_document_validation,
+            comment=comment,
+        )
+
+    def counter_buffer(
+        self,
+        *,
+        interval: float = COUNTER_INTERVAL,
+        max_operations: int = COUNTER_MAX_OPERATIONS,
+        upsert: bool = True,
+        comment: str | None = None,
+    ) -> CounterBuffer:
+        """Create a buffer summing `$inc` updates of this collection.
+
+        Parameters:
+            interval : Seconds between writes of the buffered deltas.
+            max_operations : Amount of buffered increments written right away.
+            upsert : Whether missing counter documents are created.
+            comment : A comment to attach to the updates.
+
+        Returns:
+            The buffer, flushed when the client is closed.
+        """
+        return CounterBuffer(
+            self,
+            interval=interval,
+            max_operations=max_operations,
+            upsert=upsert,
+            comment=comment,
+        )
+
+    @overload
+    def loader(
+        self,
+        key: str = "_id",
+        *,
+        cls: None = None,
+        max_keys: int = LOADER_MAX_KEYS,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> DocumentLoader[xJsonT]:
+        ...
+
+    @overload
+    def loader(
+        self,
+        key: str = "_id",
+        *,
+        cls: type[T],
+        max_keys: int = LOADER_MAX_KEYS,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> DocumentLoader[T]:
+        ...
+
+    def loader(
+        self,
+        key: str = "_id",
+        *,
+        cls: type[T] | None = None,
+        max_keys: int = LOADER_MAX_KEYS,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> DocumentLoader[T] | DocumentLoader[xJsonT]:
+        """Create a loader merging concurrent `find_one` calls by a key.
+
+        Parameters:
+            key : The unique field documents are looked up by.
+            cls : The class to deserialize the documents into.
+            max_keys : Maximum amount of values sent in one query.
+            transaction : The transaction context for the queries.
+            session : The session context for the queries.
+
+        Returns:
+            The loader, meant to live as long as a single request.
+        """
+        return DocumentLoader(
+            self,
+            key=key,
+            cls=cls,
+            max_keys=max_keys,
+            transaction=transaction,
+            session=session,
+        )
+
     # https://www.mongodb.com/docs/manual/reference/command/insert/
     async def insert_one(
         self,
-        document: xJsonT | Document,
+        document: xJsonT | Document | RawDocumentT,
         /,
         *,
         ordered: bool = True,
@@ -122,9 +322,14 @@ class Collection:
         bypass_document_validation: bool = False,
         comment: str | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> ObjectId:
         """Insert one document into the collection.
 
+        A `RawBSONDocument` or BSON encoded bytes are sent without
+        being decoded, only their `_id` is read and added if missing.
+        The passed document is not modified then.
+
         Parameters:
             document : The document itself.
             ordered : Whether the inserts should be
@@ -135,12 +340,17 @@ class Collection:
                 document validation (default is False).
             comment : A comment to attach to the operation.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
-            The boolean value that indicates document insertion.
+            The `_id` of the inserted document.
         """
-        insertable = maybe_to_dict(document)
-        insertable.setdefault("id", ObjectId())
+        if isinstance(document, RawBSONDocument | bytes):
+            # raw documents are sent as they are, `_id` is added if missing
+            insertable, document_id = raw_document_id(document)
+        else:
+            insertable = maybe_to_dict(document)
+            document_id = insertable.setdefault("_id", ObjectId())
 
         command: xJsonT = filter_non_null({
             "insert": self.name,
@@ -150,13 +360,60 @@ class Collection:
             "bypassDocumentValidation": bypass_document_validation,
             "comment": comment,
         })
-        await self.database.command(command, transaction=transaction)
-        return insertable["id"]
+        await self.database.command(
+            command,
+            transaction=transaction,
+            session=session,
+        )
+        return document_id
+
+    def _write_limits(self) -> tuple[int, int]:
+        hello = self.database.client.hello
+        if hello is None:  # no connection was opened yet
+            return MAX_BSON_OBJECT_SIZE, MAX_WRITE_BATCH_SIZE
+        return hello.max_bson_object_size, hello.max_write_batch_size
+
+    async def _insert_splits(
+        self,
+        splits: list[list[RawBSONDocument]],
+        options: xJsonT,
+        *,
+        concurrency: int,
+        transaction: Transaction | None,
+        session: Session | None,
+    ) -> list[xJsonT]:
+        async def send(split: list[RawBSONDocument]) -> xJsonT:
+            command = {"insert": self.name, "documents": split, **options}
+            try:
+                return await self.database.command(
+                    command, transaction=transaction, session=session)
+            except OperationFailure as exc_value:
+                # a single split keeps raising the error as it is
+                details = exc_value.details or {}
+                if len(splits) == 1 or not details.get("writeErrors"):
+                    raise
+                return details
+
+        if concurrency == 1 or len(splits) == 1:
+            replies: list[xJsonT] = []
+            for split in splits:
+                replies.append(await send(split))
+                if options["ordered"] and replies[-1].get("writeErrors"):
+                    break
+            return replies
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(split: list[RawBSONDocument]) -> xJsonT:
+            async with semaphore:
+                return await send(split)
+
+        return await asyncio.gather(*map(bounded, splits))
 
     # https://www.mongodb.com/docs/manual/reference/command/insert/
     async def insert_many(
         self,
-        documents: Sequence[xJsonT | Document],
+        documents: Sequence[xJsonT | Document | RawDocumentT],
         /,
         *,
         ordered: bool = True,
@@ -164,9 +421,19 @@ class Collection:
         bypass_document_validation: bool = False,
         comment: str | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        max_concurrency: int = DEFAULT_INSERT_CONCURRENCY,
     ) -> list[ObjectId]:
         """Insert many documents at once into the collection.
 
+        Documents are split into as few `insert` commands as the
+        server's `maxBsonObjectSize` and `maxWriteBatchSize` allow.
+        Unordered splits outside of sessions and transactions are sent
+        concurrently over pooled connections. When there is more than
+        one split, write errors of all splits are merged into a
+        `BulkWriteError`.
+        Raw documents are sent without being decoded.
+
         Parameters:
             documents : sequence of documents.
             ordered : Whether the inserts should be
@@ -177,24 +444,56 @@ class Collection:
                 document validation (default is False).
             comment : A comment to attach to the operation.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
+            max_concurrency : Maximum amount of unordered
+                splits in flight at once.
 
         Returns:
-            The amount of documents that were successfully inserted.
-        """
-        insertable = [*map(maybe_to_dict, documents)]
-        for value in insertable:
-            value.setdefault("id", ObjectId())
+            The `_id` values of the successfully inserted documents.
 
-        command: xJsonT = filter_non_null({
-            "insert": self.name,
+        Raises:
+            ValueError : If a document is larger than `maxBsonObjectSize`
+                or a raw document is not valid BSON.
+        """
+        ids: list[ObjectId] = []
+        encoded: list[RawBSONDocument] = []
+        converted = iter(maybe_to_dicts([
+            document for document in documents
+            if not isinstance(document, RawBSONDocument | bytes)
+        ]))
+        for document in documents:
+            if isinstance(document, RawBSONDocument | bytes):
+                raw, document_id = raw_document_id(document)
+            else:
+                value = next(converted)
+                document_id = value.setdefault("_id", ObjectId())
+                raw = RawBSONDocument(encode(value))
+            ids.append(document_id)
+            encoded.append(raw)
+
+        max_size, max_count = self._write_limits()
+        for index, document in enumerate(encoded):
+            if len(document.raw) > max_size:
+                msg = f"Document {index} is larger than {max_size} bytes."
+                raise ValueError(msg)
+        splits = _split_documents(encoded, max_size, max_count)
+
+        options = filter_non_null({
             "ordered": ordered,
-            "documents": insertable,
             "maxTimeMS": max_time_ms,
             "bypassDocumentValidation": bypass_document_validation,
             "comment": comment,
         })
-        await self.database.command(command, transaction=transaction)
-        return [value["id"] for value in insertable]
+        # statements of one lsid must not race each other
+        serial = ordered or transaction is not None or session is not None
+        replies = await self._insert_splits(
+            splits,
+            options,
+            concurrency=1 if serial else max_concurrency,
+            transaction=transaction,
+            session=session,
+        )
+        return _merge_insert_replies(ids, splits, replies, ordered=ordered)
 
     # https://www.mongodb.com/docs/manual/reference/command/update/
     async def update(
@@ -206,6 +505,7 @@ class Collection:
         comment: str | None = None,
         let: xJsonT | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> int:
         """Update documents in the collection.
 
@@ -221,6 +521,7 @@ class Collection:
             comment : A comment to attach to the operation.
             let : Variables that can be used in the update expressions.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
             The number of documents updated.
@@ -238,6 +539,7 @@ class Collection:
         request = await self.database.command(
             command,
             transaction=transaction,
+            session=session,
         )
         return request["nModified"]
 
@@ -251,6 +553,7 @@ class Collection:
         write_concern: WriteConcern | None = None,
         max_time_ms: int = 0,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> int:
         """Delete documents from the collection.
 
@@ -264,6 +567,7 @@ class Collection:
             max_time_ms : The maximum amount of time
                 to allow the operation to run.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
             The number of documents deleted.
@@ -277,7 +581,11 @@ class Collection:
             "writeConcern": maybe_to_dict(write_concern),
             "maxTimeMS": max_time_ms,
         })
-        request = await self.database.command(command, transaction=transaction)
+        request = await self.database.command(
+            command,
+            transaction=transaction,
+            session=session,
+        )
         return request["n"]
 
     # custom function not stated in docs
@@ -297,6 +605,7 @@ class Collection:
         filter_: xJsonT | None,
         cls: None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> xJsonT | None:
         ...
 
@@ -306,6 +615,7 @@ class Collection:
         filter_: xJsonT | None = None,
         cls: type[T] = Document,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> T | None:
         ...
 
@@ -315,6 +625,7 @@ class Collection:
         filter_: xJsonT | None = None,
         cls: type[T] | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> T | xJsonT | None:
         """Find a single document in the collection matching the filter.
 
@@ -322,6 +633,7 @@ class Collection:
             filter_ : The filter criteria for selecting the document.
             cls : The class to deserialize the document into.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
             The first matching document or None if no document matches.
@@ -330,6 +642,7 @@ class Collection:
             filter_=filter_,
             cls=cls,
             transaction=transaction,
+            session=session,
         ).limit(1).to_list()
         if documents:
             return documents[0]
@@ -341,6 +654,11 @@ class Collection:
         filter_: xJsonT | None,
         cls: None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        *,
+        tailable: bool = False,
+        await_data: bool = False,
+        max_await_time_ms: int | None = None,
     ) -> Cursor[xJsonT]:
         ...
 
@@ -350,6 +668,11 @@ class Collection:
         filter_: xJsonT | None = None,
         cls: type[T] = Document,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        *,
+        tailable: bool = False,
+        await_data: bool = False,
+        max_await_time_ms: int | None = None,
     ) -> Cursor[T]:
         ...
 
@@ -358,6 +681,11 @@ class Collection:
         filter_: xJsonT | None = None,
         cls: type[T] | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        *,
+        tailable: bool = False,
+        await_data: bool = False,
+        max_await_time_ms: int | None = None,
     ) -> Cursor[T] | Cursor[xJsonT]:
         """Find documents in the collection matching the filter.
 
@@ -365,6 +693,14 @@ class Collection:
             filter_ : The filter criteria for selecting documents.
             cls : The class to deserialize the documents into.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
+            tailable : Keep the cursor open after the last document
+                of a capped collection, waiting for new ones.
+            await_data : Let the server block on getMore for a while
+                instead of returning an empty batch right away.
+                Without it empty batches are polled with backoff.
+            max_await_time_ms : How long the server blocks on getMore
+                of an await_data cursor.
 
         Returns:
             A cursor for iterating over the matching documents.
@@ -374,17 +710,232 @@ class Collection:
             collection=self,
             cls=cls,
             transaction=transaction,
+            session=session,
+            tailable=tailable,
+            await_data=await_data,
+            max_await_time_ms=max_await_time_ms,
+        )
+
+    def find_raw(
+        self,
+        filter_: xJsonT | None = None,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> Cursor[RawBSONDocument]:
+        """Find documents without decoding them.
+
+        Only the command reply is decoded, every document is
+        a `RawBSONDocument` backed by the bytes received from the server.
+        Use `Cursor.raw_batches` to receive whole batches at once.
+
+        Parameters:
+            filter_ : The filter criteria for selecting documents.
+            transaction : The transaction context for the operation.
+            session : The session context for the operation.
+
+        Returns:
+            A cursor over raw BSON documents.
+        """
+        return Cursor(
+            filter_=filter_ or {},
+            collection=self,
+            transaction=transaction,
+            session=session,
+            raw=True,
+        )
+
+    @overload
+    async def parallel_scan(
+        self,
+        n: int,
+        cls: None = None,
+        filter_: xJsonT | None = None,
+        *,
+        oversample: int = DEFAULT_SCAN_OVERSAMPLE,
+    ) -> list[Cursor[xJsonT]]:
+        ...
+
+    @overload
+    async def parallel_scan(
+        self,
+        n: int,
+        cls: type[T],
+        filter_: xJsonT | None = None,
+        *,
+        oversample: int = DEFAULT_SCAN_OVERSAMPLE,
+    ) -> list[Cursor[T]]:
+        ...
+
+    async def parallel_scan(
+        self,
+        n: int,
+        cls: type[T] | None = None,
+        filter_: xJsonT | None = None,
+        *,
+        oversample: int = DEFAULT_SCAN_OVERSAMPLE,
+    ) -> list[Cursor[T]] | list[Cursor[xJsonT]]:
+        """Split the collection into `_id` ranges scanned independently.
+
+        Split points come from a sorted `$sample` of `_id` values,
+        so ranges are roughly equal in size. Each cursor uses its own
+        implicit session and connection, iterate them concurrently
+        or wrap them into `MergedCursor` to get a single stream.
+
+        Parameters:
+            n : Desired amount of cursors, fewer are returned
+                for collections with too few documents.
+            cls : The class to deserialize the documents into.
+            filter_ : Filter applied inside of every range.
+            oversample : Sampled `_id` values per range,
+                more gives evener ranges but slower sampling.
+
+        Returns:
+            Cursors that together cover every matching document once.
+
+        Raises:
+            ValueError : If n is less than one.
+        """
+        if n < 1:
+            raise ValueError("Cannot scan with less than one cursor.")
+        boundaries: list[Any] = []
+        if n > 1:
+            size = n * oversample
+            samples = await self.aggregate([
+                {"$sample": {"size": size}},
+                {"$project": {"_id": 1}},
+                {"$sort": {"_id": 1}},
+            ]).batch_size(size).to_list()
+            ids = [doc["_id"] for doc in samples]
+            if ids:  # boundaries must share a bson type to be comparable
+                common = Counter(map(type, ids)).most_common(1)[0][0]
+                ids = [value for value in ids if type(value) is common]
+            step = len(ids) / n
+            for idx in range(1, n):
+                boundary = ids[int(idx * step)] if ids else None
+                if boundary is not None and boundary not in boundaries:
+                    boundaries.append(boundary)
+
+        # range queries only match values of the same bson type, so the
+        # first range is negated to also pick up every other _id type.
+        ranges: list[xJsonT] = []
+        lower = None
+        for boundary in [*boundaries, None]:
+            if lower is None and boundary is None:
+                ranges.append({})
+            elif lower is None:
+                ranges.append({"_id": {"$not": {"$gte": boundary}}})
+            elif boundary is None:
+                ranges.append({"_id": {"$gte": lower}})
+            else:
+                ranges.append({"_id": {"$gte": lower, "$lt": boundary}})
+            lower = boundary
+
+        return [
+            Cursor(
+                filter_={"$and": [filter_, id_range]} if filter_ else id_range,
+                collection=self,
+                cls=cls,
+            )
+            for id_range in ranges
+        ]
+
+    # https://www.mongodb.com/docs/manual/reference/method/db.collection.watch/
+    def watch(
+        self,
+        pipeline: list[xJsonT] | None = None,
+        *,
+        full_document: FULL_DOCUMENT_T | None = None,
+        full_document_before_change: (
+            FULL_DOCUMENT_BEFORE_CHANGE_T | None
+        ) = None,
+        resume_after: xJsonT | None = None,
+        start_after: xJsonT | None = None,
+        start_at_operation_time: Timestamp | None = None,
+        batch_size: int | None = None,
+        max_await_time_ms: int | None = None,
+    ) -> ChangeStream:
+        """Watch changes of this collection.
+
+        Parameters:
+            pipeline : Aggregation stages applied after `$changeStream`.
+            full_document : Whether update events carry the
+                current version of the document.
+            full_document_before_change : Whether events carry
+                the document as it was before the change.
+            resume_after : Resume token to start after.
+            start_after : Resume token to start after, unlike
+                `resume_after` it may point to an invalidate event.
+            start_at_operation_time : Start at this cluster time.
+            batch_size : Maximum amount of events in a batch.
+            max_await_time_ms : How long the server waits
+                for new events before returning an empty batch.
+
+        Returns:
+            A change stream, opened on first iteration.
+        """
+        return ChangeStream(
+            self.database,
+            self.name,
+            pipeline,
+            full_document=full_document,
+            full_document_before_change=full_document_before_change,
+            resume_after=resume_after,
+            start_after=start_after,
+            start_at_operation_time=start_at_operation_time,
+            batch_size=batch_size,
+            max_await_time_ms=max_await_time_ms,
         )
 
-    # TODO @megawattka: prob make overloads for cls like in "find"?
+    @overload
+    def aggregate(
+        self,
+        pipeline: list[xJsonT],
+        cls: None = None,
+        *,
+        explain: bool = False,
+        allow_disk_use: bool = True,
+        max_time_ms: int = 0,
+        bypass_document_validation: bool = False,
+        read_concern: ReadConcern | None = None,
+        collation: Collation | None = None,
+        hint: str | None = None,
+        comment: str | None = None,
+        write_concern: WriteConcern | None = None,
+        let: xJsonT | None = None,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> AggregateCursor[xJsonT]:
+        ...
+
+    @overload
+    def aggregate(
+        self,
+        pipeline: list[xJsonT],
+        cls: type[T],
+        *,
+        explain: bool = False,
+        allow_disk_use: bool = True,
+        max_time_ms: int = 0,
+        bypass_document_validation: bool = False,
+        read_concern: ReadConcern | None = None,
+        collation: Collation | None = None,
+        hint: str | None = None,
+        comment: str | None = None,
+        write_concern: WriteConcern | None = None,
+        let: xJsonT | None = None,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+    ) -> AggregateCursor[T]:
+        ...
+
     # https://www.mongodb.com/docs/manual/reference/command/aggregate/
-    async def aggregate(
+    def aggregate(
         self,
         pipeline: list[xJsonT],
+        cls: type[T] | None = None,
         *,
         explain: bool = False,
         allow_disk_use: bool = True,
-        cursor: xJsonT | None = None,
         max_time_ms: int = 0,
         bypass_document_validation: bool = False,
         read_concern: ReadConcern | None = None,
@@ -394,15 +945,25 @@ class Collection:
         write_concern: WriteConcern | None = None,
         let: xJsonT | None = None,
         transaction: Transaction | None = None,
-    ) -> list[Any]:
+        session: Session | None = None,
+    ) -> AggregateCursor[T] | AggregateCursor[xJsonT]:
         """Run an aggregation pipeline on the collection.
 
+        Results are streamed through a cursor, use `to_list`
+        to collect all of them.
+
+        ```
+        >>> cursor = collection.aggregate(pipeline, cls=Report)
+        >>> async for report in cursor.batch_size(1000):
+        ...     ...
+        ```
+
         Parameters:
             pipeline : The aggregation pipeline stages.
+            cls : The class to deserialize the documents into.
             explain : Whether to return information on
                 the execution of the pipeline.
             allow_disk_use : Enables writing to temporary files.
-            cursor : The cursor options.
             max_time_ms : The maximum time in milliseconds for the operation.
             bypass_document_validation : Allows the write
                 to circumvent document validation.
@@ -413,38 +974,34 @@ class Collection:
             write_concern : The write concern for the operation.
             let : Variables for use in the pipeline.
             transaction : The transaction context.
+            session : The session context for the operation.
 
         Returns:
-            The result documents from the aggregation.
+            A cursor over the result documents of the aggregation.
         """
-        command = filter_non_null({
-            "aggregate": self.name,
-            "pipeline": pipeline,
-            "cursor": cursor or {},
-            "explain": explain,
+        options = filter_non_null({
             "allowDiskUse": allow_disk_use,
             "maxTimeMS": max_time_ms,
             "bypassDocumentValidation": bypass_document_validation,
             "readConcern": maybe_to_dict(read_concern),
             "collation": maybe_to_dict(collation),
-            "hint": hint,
-            "comment": comment,
             "writeConcern": maybe_to_dict(write_concern),
             "let": let,
         })
-        request = await self.database.command(
-            command,
+        cursor: AggregateCursor[Any] = AggregateCursor(
+            pipeline,
+            collection=self,
+            cls=cls,
             transaction=transaction,
+            session=session,
+            options=options,
+            explain=explain,
         )
-        cursor_id = int(request["cursor"]["id"])
-        docs: list[xJsonT] = request["cursor"]["firstBatch"]
-        if cursor_id != 0:
-            next_req = await self.database.command({
-                "getMore": cursor_id,
-                "collection": self.name,
-            })
-            docs.extend(next_req["cursor"]["nextBatch"])
-        return docs
+        if hint is not None:
+            cursor.hint(hint)
+        if comment is not None:
+            cursor.comment(comment)
+        return cursor
 
     # https://www.mongodb.com/docs/manual/reference/command/distinct/
     async def distinct(
@@ -456,6 +1013,7 @@ class Collection:
         read_concern: ReadConcern | None = None,
         hint: str | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> list[object]:
         """Return a list of distinct values for the specified key.
 
@@ -468,6 +1026,7 @@ class Collection:
             read_concern : The read concern for the operation.
             hint : Index to use.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
             The list of distinct values for the specified key.
@@ -484,6 +1043,7 @@ class Collection:
         request = await self.database.command(
             command,
             transaction=transaction,
+            session=session,
         )
         return request["values"]
 
@@ -499,6 +1059,7 @@ class Collection:
         max_time_ms: int = 0,
         read_concern: ReadConcern | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
     ) -> int:
         """Count the number of documents in the collection matching the query.
 
@@ -512,6 +1073,7 @@ class Collection:
             max_time_ms : The maximum time in milliseconds for the operation.
             read_concern : The read concern for the operation.
             transaction : The transaction context for the operation.
+            session : The session context for the operation.
 
         Returns:
             The number of documents matching the query.
@@ -527,7 +1089,11 @@ class Collection:
             "collation": maybe_to_dict(collation),
             "comment": comment,
         })
-        request = await self.database.command(command, transaction=transaction)
+        request = await self.database.command(
+            command,
+            transaction=transaction,
+            session=session,
+        )
         return request["n"]
 
     # https://www.mongodb.com/docs/manual/reference/command/convertToCapped/
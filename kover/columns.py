@@ -0,0 +1,125 @@
+"""Columnar export of query results into NumPy arrays."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import importlib.util
+from typing import TYPE_CHECKING, Any, Final
+
+from .lazy import LazyDocument, raw_lookup
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import ModuleType
+
+    import numpy as np
+    import numpy.typing as npt
+
+_HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+DEFAULT_COLUMN_CAPACITY: Final[int] = 1024
+
+
+@lru_cache
+def _get_numpy() -> ModuleType:
+    if not _HAVE_NUMPY:
+        raise ModuleNotFoundError(
+            "Columnar export cannot be used. "
+            "NumPy is missing. "
+            "Install it via kover[numpy]",
+        )
+    return importlib.import_module("numpy")
+
+
+def _fit_check(dtype: np.dtype[Any]) -> Callable[[Any], bool] | None:
+    # numpy silently truncates strings and wraps or rounds numbers
+    if dtype.kind in "iu":
+        info = _get_numpy().iinfo(dtype)
+        return lambda value: (
+            isinstance(value, int)
+            or (isinstance(value, float) and value.is_integer())
+        ) and info.min <= value <= info.max
+    if dtype.kind == "U":
+        chars = dtype.itemsize // 4
+        return lambda value: not isinstance(value, str) or len(value) <= chars
+    if dtype.kind == "S":
+        size = dtype.itemsize
+        return lambda value: len(
+            value.encode() if isinstance(value, str) else value,
+        ) <= size if isinstance(value, str | bytes) else True
+    return None
+
+
+class ColumnBuilder:
+    """Growable array with a null mask, filled one value at a time.
+
+    Values are read straight from the BSON bytes of documents.
+    Values which do not fit the dtype, like too long strings
+    or integers out of its range, raise instead of being cut.
+
+    Attributes:
+        path : Dotted path of the field inside of documents.
+        size : Amount of values appended so far.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dtype: npt.DTypeLike,
+        capacity: int = DEFAULT_COLUMN_CAPACITY,
+    ) -> None:
+        numpy = _get_numpy()
+        self.path = path
+        self.size = 0
+        self._keys = [key.encode() for key in path.split(".")]
+        self._data: np.ndarray[Any, Any] = numpy.zeros(capacity, dtype=dtype)
+        self._mask: np.ndarray[Any, Any] = numpy.ones(capacity, dtype=bool)
+        self._fits = _fit_check(self._data.dtype)
+
+    def _grow(self) -> None:
+        # in place realloc, avoids holding both the old and the new buffer
+        capacity = max(len(self._data) * 2, 1)
+        self._data.resize(capacity, refcheck=False)
+        self._mask.resize(capacity, refcheck=False)
+        self._mask[self.size:] = True
+
+    def append(self, document: bytes | LazyDocument) -> None:
+        """Write the field of a document into the next slot.
+
+        Missing fields and nulls stay masked.
+
+        Parameters:
+            document : The BSON bytes of the document
+                or a lazy document to take the value from.
+
+        Raises:
+            ValueError : If the value does not fit the dtype.
+        """
+        if isinstance(document, LazyDocument):
+            document = document.raw
+        value = raw_lookup(document, self._keys)
+        if value is not None and self._fits is not None and (
+            not self._fits(value)
+        ):
+            msg = (
+                f"Value {value!r} of {self.path!r} "
+                f"does not fit {self._data.dtype}."
+            )
+            raise ValueError(msg)
+        if self.size == len(self._data):
+            self._grow()
+        if value is not None:
+            self._data[self.size] = value
+            self._mask[self.size] = False
+        self.size += 1
+
+    def finish(self) -> np.ma.MaskedArray[Any, Any]:
+        """Trim spare capacity and build the masked array.
+
+        Returns:
+            The values with nulls and missing fields masked.
+        """
+        numpy = _get_numpy()
+        self._data.resize(self.size, refcheck=False)
+        self._mask.resize(self.size, refcheck=False)
+        return numpy.ma.MaskedArray(self._data, mask=self._mask, copy=False)
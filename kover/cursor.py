@@ -2,28 +2,202 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections import deque
+from contextlib import suppress
+import sys
+import time
 from typing import (
     TYPE_CHECKING,
+    Any,
+    Final,
     Generic,
     TypeVar,
     cast,
 )
+import weakref
 
-from bson import Int64
+from bson import CodecOptions, Int64, encode
+from bson.raw_bson import RawBSONDocument
 from typing_extensions import Self
 
-from .helpers import filter_non_null
+from .columns import DEFAULT_COLUMN_CAPACITY, ColumnBuilder
+from .exceptions import NETWORK_ERRORS, OperationFailure
+from .helpers import batched, filter_non_null
+from .lazy import LazyDocument
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping, Sequence
+
+    import numpy as np
+    import numpy.typing as npt
+
+    from .client import Kover
     from .collection import Collection
     from .models import Collation
     from .schema import Document
-    from .session import Transaction
+    from .session import ServerSession, Session, Transaction
     from .typings import xJsonT
 
 T = TypeVar("T")
 
+DEFAULT_BATCH_SIZE: Final[int] = 101
+ADAPTIVE_INITIAL_BATCH_SIZE: Final[int] = 16
+# batches larger than the consumer handles in this window only hold memory
+_CONSUMER_WINDOW: Final[float] = 1.0
+REAP_DELAY: Final[float] = 0.1
+# tailable cursors without awaitData back off between empty batches
+TAILABLE_POLL_INITIAL: Final[float] = 0.01
+TAILABLE_POLL_MAX: Final[float] = 1.0
+_MAX_CURSORS_PER_COMMAND: Final[int] = 10_000
+# only the reply envelope is decoded, documents stay as bytes
+_RAW_CODEC_OPTIONS: Final = CodecOptions(document_class=RawBSONDocument)
+
+
+class AdaptiveBatchSize:
+    """Chooses batchSize of the next getMore from observed batches.
+
+    The first batch is small for fast time-to-first-document, then
+    the size doubles with every batch while staying below `target_bytes`
+    of documents and below what the consumer processes in a second.
+
+    Attributes:
+        target_bytes : Desired amount of document bytes per batch.
+        current : The batchSize used for the latest request.
+    """
+
+    def __init__(
+        self,
+        target_bytes: int,
+        initial: int = ADAPTIVE_INITIAL_BATCH_SIZE,
+    ) -> None:
+        self.target_bytes = target_bytes
+        self.current = initial
+        self._doc_size: float | None = None
+        self._received_at: float | None = None
+        self._received: int = 0
+        self._consumer_rate: float | None = None
+
+    @staticmethod
+    def _sample_size(batch: list[xJsonT]) -> float:
+        # encoding every document would cost more than it saves
+        samples = {0, len(batch) // 2, len(batch) - 1}
+        sizes = [len(encode(batch[idx])) for idx in samples]
+        return sum(sizes) / len(sizes)
+
+    def observe(self, batch: list[xJsonT]) -> None:
+        """Record a batch that was just received from the server."""
+        self._received_at = time.monotonic()
+        self._received = len(batch)
+        if batch:
+            self._doc_size = self._sample_size(batch)
+
+    def consumed(self) -> None:
+        """Record that the consumer processed the latest batch."""
+        if self._received_at is None or self._received == 0:
+            return
+        elapsed = max(time.monotonic() - self._received_at, 1e-6)
+        self._consumer_rate = self._received / elapsed
+
+    def next_size(self) -> int:
+        """Get batchSize for the next getMore.
+
+        Returns:
+            The amount of documents to request.
+        """
+        size = self.current * 2
+        if self._doc_size is not None:
+            size = min(size, int(self.target_bytes / self._doc_size))
+        if self._consumer_rate is not None:
+            by_consumer = int(self._consumer_rate * _CONSUMER_WINDOW)
+            size = min(size, max(by_consumer, self.current))
+        self.current = max(size, 1)
+        return self.current
+
+
+class CursorReaper:
+    """Kills closed and abandoned server cursors in batches.
+
+    Cursor ids are queued per namespace and session and sent as
+    a single `killCursors` per group from a background task, so neither
+    closing nor garbage collecting a cursor waits for the server.
+    Every kill carries the lsid its cursor was opened with, sessions
+    owned by cursors go back to the pool only after their kill was sent.
+
+    Attributes:
+        client : The client used to send `killCursors`.
+        delay : Seconds to collect cursor ids before sending them.
+    """
+
+    def __init__(self, client: Kover, delay: float = REAP_DELAY) -> None:
+        self.client = client
+        self.delay = delay
+        self._pending: dict[
+            tuple[str, str, ServerSession | None], list[Int64],
+        ] = {}
+        self._sessions: list[ServerSession] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return sum(map(len, self._pending.values()))
+
+    def add(
+        self,
+        database: str,
+        collection: str,
+        cursor_id: Int64,
+        server_session: ServerSession | None = None,
+        *,
+        release: bool = True,
+    ) -> None:
+        """Queue a server cursor to be killed.
+
+        Safe to call from a finalizer, nothing is awaited here.
+
+        Parameters:
+            database : Name of the database of the cursor.
+            collection : Name of the collection of the cursor.
+            cursor_id : The id of the server cursor.
+            server_session : Session the cursor was opened with,
+                its lsid is sent with the kill.
+            release : Return the session to the pool once
+                the cursor is killed, for sessions owned by cursors.
+        """
+        key = (database, collection, server_session)
+        self._pending.setdefault(key, []).append(cursor_id)
+        if server_session is not None and release:
+            self._sessions.append(server_session)
+        if self._task is None or self._task.done():
+            with suppress(RuntimeError):  # no loop, flushed on client close
+                self._task = asyncio.get_running_loop().create_task(
+                    self._reap())
+
+    async def _reap(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.delay)  # let more cursors pile up
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Kill all queued cursors right now."""
+        pending, self._pending = self._pending, {}
+        sessions, self._sessions = self._sessions, []
+        for (database, collection, session), cursor_ids in pending.items():
+            for chunk in batched(cursor_ids, _MAX_CURSORS_PER_COMMAND):
+                command: xJsonT = {"killCursors": collection, "cursors": chunk}
+                if session is not None:  # other lsids are unauthorized
+                    command["lsid"] = session.document
+                # the server times out cursors by itself anyway
+                with suppress(OperationFailure, *NETWORK_ERRORS):
+                    await self.client.get_database(database).command(command)
+        for server_session in sessions:
+            self.client.release_server_session(server_session)
+
+    async def close(self) -> None:
+        """Wait for the background task and kill remaining cursors."""
+        if self._task is not None and not self._task.done():
+            await self._task
+        await self.flush()
+
 
 class Cursor(Generic[T]):
     """Asynchronous MongoDB-like cursor for iterating over query results."""
@@ -32,8 +206,14 @@ class Cursor(Generic[T]):
         self,
         filter_: xJsonT,
         collection: Collection,
-        cls: type[Document] | None = None,
+        cls: type[Document | LazyDocument] | None = None,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        *,
+        raw: bool = False,
+        tailable: bool = False,
+        await_data: bool = False,
+        max_await_time_ms: int | None = None,
     ) -> None:
         self._id: Int64 | None = None
         self._collection = collection
@@ -44,15 +224,31 @@ class Cursor(Generic[T]):
         self._skip: int = 0
         self._limit: int = 0
         self._hint: str | xJsonT | None = None
-        self._batch_size: int = 101
+        self._batch_size: int | None = None
+        self._batch_sizer: AdaptiveBatchSize | None = None
         self._comment: str | None = None
+        self._tailable = tailable
+        self._await_data = await_data
+        self._max_await_time_ms = max_await_time_ms
         self._retrieved: int = 0
+        self._empty_polls: int = 0
         self._killed: bool = False
-        self._second_iteration: bool = False
+        self._prefetch_depth: int = 0
+        self._prefetched: (
+            asyncio.Queue[list[xJsonT] | Exception | None] | None
+        ) = None
+        self._prefetch_task: asyncio.Task[None] | None = None
+        self._prefetching: bool = False
         self._docs: deque[T] = deque()
         self._cls = cls
         self._transaction = transaction
+        self._session = session
+        self._owns_session: bool = False
+        self._finalizer: weakref.finalize[Any, Any] | None = None
+        # lazy documents are built from the undecoded bytes
+        self._raw = raw or (cls is not None and issubclass(cls, LazyDocument))
         self._collation: Collation | None = None
+        self._trusted: bool = False
 
     async def __aenter__(self) -> Self:
         return self
@@ -100,7 +296,8 @@ class Cursor(Generic[T]):
         """Set the batch size for the query results.
 
         Parameters:
-            value : Maximum amount of docs to return from first batch.
+            value : Maximum amount of docs to return in each batch.
+                Disables adaptive batch sizing for this cursor.
 
         Returns:
             The cursor instance with the projection applied.
@@ -108,6 +305,19 @@ class Cursor(Generic[T]):
         self._batch_size = value
         return self
 
+    def prefetch(self, depth: int = 1) -> Self:
+        """Fetch next batches in background while current one is consumed.
+
+        Parameters:
+            depth : Maximum amount of batches buffered ahead of the consumer.
+                Zero disables prefetching.
+
+        Returns:
+            The cursor instance with prefetching configured.
+        """
+        self._prefetch_depth = depth
+        return self
+
     def projection(self, mapping: xJsonT) -> Self:
         """Set the projection for the query results.
 
@@ -121,6 +331,22 @@ class Cursor(Generic[T]):
         self._projection = mapping
         return self
 
+    def trusted(self, value: bool = True) -> Self:  # noqa: FBT001, FBT002
+        """Skip validation of documents returned by the server.
+
+        Documents are mapped by the compiled decoder of `cls`,
+        see `Document.from_documents`. Use it only when all documents
+        of the collection were written through the same model.
+
+        Parameters:
+            value : Whether returned documents are trusted.
+
+        Returns:
+            The cursor instance with the trust setting applied.
+        """
+        self._trusted = value
+        return self
+
     def comment(self, comment: str) -> Self:
         """Set the comment for operation.
 
@@ -145,6 +371,15 @@ class Cursor(Generic[T]):
         self._hint = hint
         return self
 
+    def _first_batch_size(self) -> int:
+        if self._batch_size is not None:
+            return self._batch_size
+        target = self._collection.database.client.cursor_batch_bytes
+        if target is None:
+            return DEFAULT_BATCH_SIZE
+        self._batch_sizer = AdaptiveBatchSize(target)
+        return self._batch_sizer.current
+
     def _get_query(self) -> xJsonT:
         collation = self._collation.to_dict() if self._collation else None
         return filter_non_null({
@@ -154,81 +389,511 @@ class Cursor(Generic[T]):
             "limit": self._limit,
             "projection": self._projection,
             "sort": self._sort,
-            "batchSize": self._batch_size,
+            "batchSize": self._first_batch_size(),
             "comment": self._comment,
             "collation": collation,
             "hint": self._hint,
+            "tailable": self._tailable or None,
+            "awaitData": self._await_data or None,
         })
 
     def _map_docs(
         self,
         documents: list[xJsonT],
     ) -> list[T]:
-        if self._cls is not None:
-            documents = [
+        if self._cls is None:
+            return cast("list[T]", documents)
+        if issubclass(self._cls, LazyDocument):
+            return cast("list[T]", [
                 self._cls.from_document(doc) for doc in documents
-            ]  # pyright: ignore[reportAssignmentType]
-        return cast("list[T]", documents)
+            ])
+        return cast("list[T]", self._cls.from_documents(
+            documents, trusted=self._trusted,
+        ))
+
+    @property
+    def alive(self) -> bool:
+        """Check if the cursor may still return documents from the server."""
+        return not self._killed and (self._id is None or int(self._id) != 0)
+
+    async def _first_batch(self) -> list[xJsonT]:
+        query = self._get_query()
+        if self._transaction is None and self._session is None:
+            # getMore must use the same lsid as the initial find
+            client = self._collection.database.client
+            self._session = await client.start_session(
+                causal_consistency=False)
+            self._owns_session = True
+        request = await self._collection.database.command(
+            query,
+            transaction=self._transaction,
+            session=self._session,
+            codec_options=_RAW_CODEC_OPTIONS if self._raw else None,
+        )
+        self._id = request["cursor"]["id"]
+        if self._id is not None and int(self._id) != 0:
+            self._register_finalizer(self._id)
+        batch = request["cursor"]["firstBatch"]
+        if self._batch_sizer is not None:
+            self._batch_sizer.observe(batch)
+        return batch
+
+    def _server_session(self) -> ServerSession | None:
+        session = self._session
+        if session is None and self._transaction is not None:
+            session = self._transaction.session
+        return None if session is None else session.server_session
+
+    def _register_finalizer(self, cursor_id: Int64) -> None:
+        # kills the server cursor if this one is dropped without close
+        client = self._collection.database.client
+        self._finalizer = weakref.finalize(
+            self,
+            client.cursor_reaper.add,
+            self._collection.database.name,
+            self._collection.name,
+            cursor_id,
+            self._server_session(),
+            release=self._owns_session,
+        )
+
+    async def _get_more(self) -> list[xJsonT]:
+        assert self._id is not None, "getMore before the first batch."
+        batch_size = self._batch_size
+        if self._batch_sizer is not None:
+            batch_size = self._batch_sizer.next_size()
+        command: xJsonT = filter_non_null({
+            "getMore": Int64(self._id),
+            "collection": self._collection.name,
+            "batchSize": batch_size,
+            # bounds how long the server blocks waiting for new documents
+            "maxTimeMS": self._max_await_time_ms if self._await_data else None,
+        })
+        request = await self._collection.database.command(
+            command,
+            transaction=self._transaction,
+            session=self._session,
+            codec_options=_RAW_CODEC_OPTIONS if self._raw else None,
+        )
+        self._id = request["cursor"]["id"]
+        batch = request["cursor"]["nextBatch"]
+        if self._batch_sizer is not None:
+            self._batch_sizer.observe(batch)
+        if self._tailable and not self._await_data:
+            self._empty_polls = 0 if batch else self._empty_polls + 1
+        return batch
+
+    async def _wait_for_tail(self) -> None:
+        # the server answers right away, polling would spin on it
+        if self._empty_polls:
+            await asyncio.sleep(min(
+                TAILABLE_POLL_MAX,
+                TAILABLE_POLL_INITIAL * 2 ** (self._empty_polls - 1),
+            ))
+
+    async def _prefetch_one(self) -> list[xJsonT] | None:
+        self._prefetching = True
+        try:
+            batch = await self._get_more()
+        finally:
+            self._prefetching = False
+        return None if self._killed else batch
+
+    async def _prefetch_batches(
+        self,
+        queue: asyncio.Queue[list[xJsonT] | Exception | None],
+    ) -> None:
+        while self.alive:
+            await self._wait_for_tail()
+            try:
+                batch = await self._prefetch_one()
+            except Exception as exc:  # noqa: BLE001
+                await queue.put(exc)  # raised on the consumer side
+                return
+            if batch is None:
+                return
+            await queue.put(batch)
+        await queue.put(None)
+
+    # returns None when the cursor is exhausted
+    async def _next_batch(self) -> list[xJsonT] | None:
+        if self._id is None:
+            batch = await self._first_batch()
+            if self._prefetch_depth > 0 and self.alive:
+                queue: asyncio.Queue[list[xJsonT] | Exception | None] = (
+                    asyncio.Queue(maxsize=self._prefetch_depth))
+                self._prefetched = queue
+                self._prefetch_task = asyncio.create_task(
+                    self._prefetch_batches(queue))
+            return batch
+        if self._prefetched is not None:
+            if self._killed:
+                return None
+            item = await self._prefetched.get()
+            if isinstance(item, Exception):
+                raise item
+            return item
+        if not self.alive:
+            return None
+        await self._wait_for_tail()
+        return await self._get_more()
 
     def __aiter__(self) -> Self:
         return self
 
+    async def _receive(self) -> list[xJsonT] | None:
+        if self._batch_sizer is not None:
+            self._batch_sizer.consumed()
+        batch = await self._next_batch()
+        if batch is None:
+            await self.close()
+            return None
+        self._retrieved += len(batch)
+        return batch
+
     async def __anext__(self) -> T:
-        if self._docs:
-            return self._docs.popleft()
-        if self._id is None:
-            query = self._get_query()
-            request = await self._collection.database.command(
-                query,
-                transaction=self._transaction,
-            )
-            docs = request["cursor"]["firstBatch"]
-            self._retrieved += len(docs)
-            self._id = request["cursor"]["id"]
-            self._docs.extend(self._map_docs(docs))
-        else:
-            if int(self._id) == 0 or self._second_iteration:
-                await self.close()
+        while not self._docs:
+            batch = await self._receive()
+            if batch is None:
                 raise StopAsyncIteration
+            self._docs.extend(self._map_docs(batch))
+        return self._docs.popleft()
 
-            self._second_iteration = True
-            command: xJsonT = {
-                "getMore": Int64(self._id),
-                "collection": self._collection.name,
-            }
-            request = await self._collection.database.command(
-                command,
-                transaction=self._transaction,
-            )
-            docs = request["cursor"]["nextBatch"]
-            self._retrieved += len(docs)
-            self._docs.extend(self._map_docs(docs))
+    async def batches(self) -> AsyncIterator[list[T]]:
+        """Iterate over whole server batches instead of single documents.
 
-        if self._docs:
-            return self._docs.popleft()
+        Documents are mapped through `cls` if it was given. Documents
+        already buffered by iterating the cursor come first.
 
-        raise StopAsyncIteration
+        ```
+        >>> async for batch in collection.find().batch_size(5000).batches():
+        ...     await other.insert_many(batch)
+        ```
+
+        Yields:
+            Lists of documents, one per server batch.
+        """
+        try:
+            if self._docs:
+                buffered = list(self._docs)
+                self._docs.clear()
+                yield buffered
+            while (batch := await self._receive()) is not None:
+                if batch:
+                    yield self._map_docs(batch)
+        finally:
+            await self.close()
+
+    async def raw_batches(self) -> AsyncIterator[list[RawBSONDocument]]:
+        """Iterate over batches exactly as they arrive from the server.
+
+        Documents are not decoded, each one is a `RawBSONDocument`
+        and its BSON bytes are available through `.raw`.
+
+        ```
+        >>> async for batch in collection.find().raw_batches():
+        ...     await forward(b"".join(doc.raw for doc in batch))
+        ```
+
+        Yields:
+            Lists of raw documents, one per server batch.
+
+        Raises:
+            ValueError : If the cursor was already iterated.
+        """
+        if self._id is not None:
+            raise ValueError("Cannot switch a started cursor to raw batches")
+        self._raw = True
+        try:
+            while (batch := await self._receive()) is not None:
+                if batch:
+                    yield cast("list[RawBSONDocument]", batch)
+        finally:
+            await self.close()
+
+    async def _stop_prefetching(self) -> None:
+        task = self._prefetch_task
+        if task is None or task.done():
+            return
+        if self._prefetching:
+            # never interrupt a request, the connection would be left
+            # with an unread reply. The task exits once getMore returns.
+            await task
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
     async def close(self) -> None:
         """Close the cursor and release any associated resources.
 
-        This method kills the cursor on the server if it is still active and
-        clears any remaining documents in the local buffer.
+        The cursor is killed on the server by the client's cursor
+        reaper in background, together with other closed cursors.
         """
         if not self._killed:
             self._killed = True
-            if self._id is not None and int(self._id) > 0 and self._limit != 0:
-                command: xJsonT = {
-                    "killCursors": self._collection.name,
-                    "cursors": [self._id],
-                }
-                await self._collection.database.command(command)
+            await self._stop_prefetching()
+            if self._finalizer is not None:
+                self._finalizer.detach()
+            cursor_id = self._id
             self._docs.clear()
+            if cursor_id is not None and int(cursor_id) != 0:
+                # an owned session is released by the reaper after the kill
+                self._collection.database.client.cursor_reaper.add(
+                    self._collection.database.name,
+                    self._collection.name,
+                    cursor_id,
+                    self._server_session(),
+                    release=self._owns_session,
+                )
+            elif self._session is not None and self._owns_session:
+                self._session.end()
+
+    async def to_list(self, length: int | None = None) -> list[T]:
+        """Return documents from the cursor as a list.
+
+        ```
+        >>> while chunk := await cursor.to_list(1000):
+        ...     await process(chunk)
+        ```
+
+        Parameters:
+            length : Maximum amount of documents to return, the rest
+                stays in the cursor for the next call. All if None.
+
+        Returns:
+            A list containing documents retrieved by the cursor.
+        """
+        if length is None:
+            length = sys.maxsize
+        documents: list[T] = []
+        while len(documents) < length:
+            if not self._docs:
+                batch = await self._receive()
+                if batch is None:
+                    break
+                self._docs.extend(self._map_docs(batch))
+            take = min(length - len(documents), len(self._docs))
+            documents.extend(self._docs.popleft() for _ in range(take))
+        return documents
+
+    async def to_columns(
+        self,
+        schema: Mapping[str, npt.DTypeLike],
+        *,
+        size_hint: int | None = None,
+    ) -> dict[str, np.ma.MaskedArray[Any, Any]]:
+        """Load requested fields into NumPy arrays, one per field.
+
+        Batches are written into pre-allocated arrays as they arrive,
+        values are read from the raw BSON of documents, which are never
+        decoded into dictionaries. If no projection was set,
+        only the requested fields are fetched from the server.
+        Values which do not fit their dtype raise ValueError.
+
+        ```
+        >>> columns = await collection.find().to_columns({
+        ...     "price": "float64",
+        ...     "created": "datetime64[ms]",
+        ...     "meta.source": "U16",
+        ... })
+        >>> columns["price"].mean()
+        ```
+
+        Parameters:
+            schema : Mapping of dotted field paths to NumPy dtypes.
+            size_hint : Expected amount of documents, used as
+                initial capacity of the arrays.
+
+        Returns:
+            Masked arrays where missing and null values are masked.
+        """
+        capacity = size_hint or self._batch_size or DEFAULT_COLUMN_CAPACITY
+        builders = [
+            ColumnBuilder(path, dtype, capacity=capacity)
+            for path, dtype in schema.items()
+        ]
+        if self._projection is None:
+            self._projection = dict.fromkeys(schema, 1)
+        async for batch in self.raw_batches():
+            for document in batch:
+                data = cast("bytes", document.raw)  # a slice of the reply
+                for builder in builders:
+                    builder.append(data)
+        return {builder.path: builder.finish() for builder in builders}
+
+
+class MergedCursor(Generic[T]):
+    """Single stream over several cursors that are read concurrently.
+
+    Every cursor is drained by its own task over its own connection.
+    Batches are yielded in arrival order, so there is no ordering
+    between documents of different cursors.
+
+    ```
+    >>> cursors = await collection.parallel_scan(8)
+    >>> async with MergedCursor(cursors) as merged:
+    ...     async for batch in merged.batches():
+    ...         await process(batch)
+    ```
+    """
+
+    def __init__(
+        self,
+        cursors: Sequence[Cursor[T]],
+        *,
+        buffer: int = 2,
+    ) -> None:
+        self._cursors = list(cursors)
+        self._queue: asyncio.Queue[list[T] | Exception | None] = (
+            asyncio.Queue(maxsize=max(buffer, 1) * max(len(cursors), 1)))
+        self._tasks: list[asyncio.Task[None]] = []
+        self._running: int = 0
+        self._closed: bool = False
+        self._docs: deque[T] = deque()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    async def _pump(self, cursor: Cursor[T]) -> None:
+        try:
+            async for batch in cursor.batches():
+                await self._queue.put(batch)
+                if self._closed:
+                    break
+        except Exception as exc:  # noqa: BLE001
+            await self._queue.put(exc)
+            return
+        await self._queue.put(None)
+
+    def _start(self) -> None:
+        if not self._tasks and not self._closed:
+            self._running = len(self._cursors)
+            self._tasks = [
+                asyncio.create_task(self._pump(cursor))
+                for cursor in self._cursors
+            ]
+
+    async def _receive(self) -> list[T] | None:
+        self._start()
+        while self._running:
+            item = await self._queue.get()
+            if item is None:
+                self._running -= 1
+                continue
+            if isinstance(item, Exception):
+                await self.close()
+                raise item
+            return item
+        return None
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> T:
+        while not self._docs:
+            batch = await self._receive()
+            if batch is None:
+                raise StopAsyncIteration
+            self._docs.extend(batch)
+        return self._docs.popleft()
+
+    async def batches(self) -> AsyncIterator[list[T]]:
+        """Iterate over server batches of all cursors as they arrive.
+
+        Yields:
+            Lists of documents, one per server batch.
+        """
+        try:
+            if self._docs:
+                buffered = list(self._docs)
+                self._docs.clear()
+                yield buffered
+            while (batch := await self._receive()) is not None:
+                yield batch
+        finally:
+            await self.close()
 
     async def to_list(self) -> list[T]:
-        """Return all documents from the cursor as a list.
+        """Return all documents of all cursors as a list.
 
         Returns:
-            A list containing all documents retrieved by the cursor.
+            A list containing documents retrieved by all cursors.
         """
-        return [doc async for doc in self]
+        return [doc async for batch in self.batches() for doc in batch]
+
+    async def close(self) -> None:
+        """Stop reading and close all cursors.
+
+        Tasks are never cancelled in the middle of a request, they
+        notice the closed flag after their current batch and exit.
+        """
+        self._closed = True
+        pending = {task for task in self._tasks if not task.done()}
+        while pending:
+            while not self._queue.empty():  # unblock producers
+                self._queue.get_nowait()
+            _, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+        self._docs.clear()
+        for cursor in self._cursors:
+            await cursor.close()
+
+
+class AggregateCursor(Cursor[T]):
+    """Cursor over the results of an aggregation pipeline.
+
+    Modifiers of find such as `sort`, `skip` or `projection` are not
+    applied, express them as pipeline stages instead.
+    """
+
+    def __init__(
+        self,
+        pipeline: list[xJsonT],
+        collection: Collection,
+        cls: type[Document | LazyDocument] | None = None,
+        transaction: Transaction | None = None,
+        session: Session | None = None,
+        *,
+        options: xJsonT | None = None,
+        explain: bool = False,
+    ) -> None:
+        super().__init__(
+            {},
+            collection,
+            cls=cls,
+            transaction=transaction,
+            session=session,
+        )
+        self._pipeline = pipeline
+        self._options = options or {}
+        self._explain = explain
+
+    def _get_query(self) -> xJsonT:
+        cursor = None if self._explain else {
+            "batchSize": self._first_batch_size(),
+        }
+        return filter_non_null({
+            "aggregate": self._collection.name,
+            "pipeline": self._pipeline,
+            "cursor": cursor,
+            "explain": self._explain or None,
+            "comment": self._comment,
+            "hint": self._hint,
+            **self._options,
+        })
+
+    async def _first_batch(self) -> list[xJsonT]:
+        if not self._explain:
+            return await super()._first_batch()
+        # explain replies with a single document instead of a cursor
+        request = await self._collection.database.command(
+            self._get_query(),
+            transaction=self._transaction,
+            session=self._session,
+        )
+        self._id = Int64(0)
+        return [request]
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from .change_stream import ChangeStream
 from .collection import Collection
 from .helpers import classrepr, filter_non_null, maybe_to_dict
 from .models import User
@@ -11,10 +12,17 @@ from .models import User
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from bson import Timestamp
+    from bson.codec_options import CodecOptions
+
     from .client import Kover
     from .models import WriteConcern
-    from .session import Transaction
-    from .typings import xJsonT
+    from .session import Session, Transaction
+    from .typings import (
+        FULL_DOCUMENT_BEFORE_CHANGE_T,
+        FULL_DOCUMENT_T,
+        xJsonT,
+    )
 
 
 @classrepr("name", "client")
@@ -253,18 +261,69 @@ class Database:
             "roles": roles,
         })
 
+    # https://www.mongodb.com/docs/manual/reference/method/db.watch/
+    def watch(
+        self,
+        pipeline: list[xJsonT] | None = None,
+        *,
+        full_document: FULL_DOCUMENT_T | None = None,
+        full_document_before_change: (
+            FULL_DOCUMENT_BEFORE_CHANGE_T | None
+        ) = None,
+        resume_after: xJsonT | None = None,
+        start_after: xJsonT | None = None,
+        start_at_operation_time: Timestamp | None = None,
+        batch_size: int | None = None,
+        max_await_time_ms: int | None = None,
+    ) -> ChangeStream:
+        """Watch changes of every collection in this database.
+
+        Parameters:
+            pipeline : Aggregation stages applied after `$changeStream`.
+            full_document : Whether update events carry the
+                current version of the document.
+            full_document_before_change : Whether events carry
+                the document as it was before the change.
+            resume_after : Resume token to start after.
+            start_after : Resume token to start after, unlike
+                `resume_after` it may point to an invalidate event.
+            start_at_operation_time : Start at this cluster time.
+            batch_size : Maximum amount of events in a batch.
+            max_await_time_ms : How long the server waits
+                for new events before returning an empty batch.
+
+        Returns:
+            A change stream, opened on first iteration.
+        """
+        return ChangeStream(
+            self,
+            None,
+            pipeline,
+            full_document=full_document,
+            full_document_before_change=full_document_before_change,
+            resume_after=resume_after,
+            start_after=start_after,
+            start_at_operation_time=start_at_operation_time,
+            batch_size=batch_size,
+            max_await_time_ms=max_await_time_ms,
+        )
+
     async def command(
         self,
         doc: xJsonT,
         /,
         *,
         transaction: Transaction | None = None,
+        session: Session | None = None,
+        codec_options: CodecOptions[Any] | None = None,
     ) -> xJsonT:
         """Sends a command to the database.
 
         Parameters:
             doc : The command document to send.
             transaction : An optional transaction context.
+            session : An optional session the command is bound to.
+            codec_options : Options used to decode the reply.
 
         Returns:
             The response from the database.
@@ -272,7 +331,9 @@ class Database:
         return await self.client.request(
             doc=doc,
             transaction=transaction,
+            session=session,
             db_name=self.name,
+            codec_options=codec_options,
         )
 
     # https://www.mongodb.com/docs/manual/reference/command/ping/
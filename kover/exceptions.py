@@ -2,11 +2,37 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Final
 
 if TYPE_CHECKING:
     from .typings import xJsonT
 
+# raised by the transport when a connection breaks or closes mid-reply
+NETWORK_ERRORS: Final = (OSError, EOFError)
+# set on network errors raised while a request was in flight
+_REQUEST_FAILED: Final[str] = "_kover_request_failed"
+
+
+def mark_request_failure(exc_value: BaseException) -> None:
+    """Mark a network error as raised by a request to the server.
+
+    Parameters:
+        exc_value : The error raised by the connection.
+    """
+    setattr(exc_value, _REQUEST_FAILED, True)
+
+
+def is_request_failure(exc_value: BaseException) -> bool:
+    """Check if a network error was raised by a request to the server.
+
+    Errors of the same types raised by user code are not marked,
+    so they are not mistaken for a broken connection.
+
+    Returns:
+        True if the error was marked by `mark_request_failure`.
+    """
+    return getattr(exc_value, _REQUEST_FAILED, False) is True
+
 
 class OperationFailure(Exception):
     """General operation failure."""
@@ -15,6 +41,31 @@ class OperationFailure(Exception):
         self.code = code
         self.message = message
         self.err_info = None
+        self.error_labels: list[str] = []
+        self.details: xJsonT | None = None
+
+    def has_error_label(self, label: str) -> bool:
+        """Check if the server attached the given label to this error.
+
+        Returns:
+            True if the label is present, False otherwise.
+        """
+        return label in self.error_labels
+
+
+class BulkWriteError(OperationFailure):
+    """Raised when writes of a batch split into several commands failed.
+
+    Attributes:
+        details : The merged report, `writeErrors` indexes point
+            into the whole input, `nInserted` counts successful writes.
+        inserted_ids : Ids of documents that were written.
+    """
+
+    def __init__(self, details: xJsonT, inserted_ids: list[Any]) -> None:
+        super().__init__(details["writeErrors"][0].get("code", -1), details)
+        self.details = details
+        self.inserted_ids = inserted_ids
 
 
 class SchemaGenerationException(Exception):
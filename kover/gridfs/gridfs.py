@@ -197,7 +197,7 @@ class GridFS:
             chunks = await self._chunks.aggregate([
                 {"$match": {"files_id": file_id}},
                 {"$sort": {"n": 1}},
-            ])
+            ]).to_list()
             binary = BytesIO()
             for chunk in chunks:
                 binary.write(chunk["data"])
@@ -5,15 +5,18 @@ from __future__ import annotations
 import itertools
 from typing import (
     TYPE_CHECKING,
+    Any,
     TypeVar,
     get_origin,
     overload,
 )
 
+from bson.raw_bson import RawBSONDocument
+
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import Callable, Iterable, Iterator
 
-    from .typings import HasToDict, xJsonT
+    from .typings import HasToDict, RawDocumentT, xJsonT
 
 T = TypeVar("T")
 
@@ -27,6 +30,17 @@ def chain(iterable: Iterable[Iterable[T]]) -> list[T]:
     return [*itertools.chain.from_iterable(iterable)]
 
 
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of at most `size` elements.
+
+    Yields:
+        Consecutive chunks of the input iterable.
+    """
+    iterator = iter(iterable)
+    while chunk := [*itertools.islice(iterator, size)]:
+        yield chunk
+
+
 def filter_non_null(doc: xJsonT) -> xJsonT:
     """Filter out None values from a dictionary.
 
@@ -79,6 +93,42 @@ def maybe_to_dict(obj: HasToDict | xJsonT | None) -> xJsonT | None:
     return obj.to_dict()
 
 
+def maybe_to_dicts(objects: Iterable[HasToDict | xJsonT]) -> list[xJsonT]:
+    """Convert a batch of objects to dictionaries.
+
+    Runs of objects of the same class are converted at once
+    by the `to_dicts` classmethod if the class has one,
+    other objects are converted like `maybe_to_dict` does.
+
+    Returns:
+        The objects converted to dictionaries, in the same order.
+    """
+    converted: list[xJsonT] = []
+    for cls, group in itertools.groupby(objects, key=type):
+        to_dicts: Callable[[Iterable[Any]], list[xJsonT]] | None = getattr(
+            cls, "to_dicts", None,
+        )
+        if to_dicts is not None:
+            converted.extend(to_dicts(group))
+        else:
+            converted.extend(map(maybe_to_dict, group))
+    return converted
+
+
+def maybe_wrap_raw(obj: xJsonT | RawDocumentT) -> xJsonT | RawBSONDocument:
+    """Wrap BSON encoded bytes into a `RawBSONDocument`.
+
+    The bytes are not decoded, they are written into commands as they are.
+    Other objects are returned as is.
+
+    Returns:
+        The wrapped bytes or the object itself.
+    """
+    if isinstance(obj, bytes):
+        return RawBSONDocument(obj)
+    return obj
+
+
 def classrepr(*attributes: str) -> Callable[[type[T]], type[T]]:
     """Add a repr to class by decorator.
 
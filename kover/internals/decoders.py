@@ -0,0 +1,318 @@
+"""Compiled decoders turning server documents into models."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from types import GenericAlias, NoneType, UnionType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Final,
+    Literal,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
+
+from bson import (
+    Binary,
+    Code,
+    Decimal128,
+    Int64,
+    MaxKey,
+    MinKey,
+    ObjectId,
+    Regex,
+    Timestamp,
+)
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydantic.fields import FieldInfo
+
+    from ..typings import xJsonT
+
+M = TypeVar("M", bound=BaseModel)
+
+_DECODER_ATTR: Final[str] = "__kover_decoder__"
+_ADAPTER_ATTR: Final[str] = "__kover_batch_adapter__"
+
+# values of these types come out of the bson decoder as they are stored
+BSON_NATIVE_TYPES: Final[frozenset[object]] = frozenset({
+    Any,
+    object,
+    str,
+    int,
+    bool,
+    bytes,
+    dict,
+    list,
+    datetime,
+    ObjectId,
+    Binary,
+    Code,
+    Decimal128,
+    Int64,
+    MaxKey,
+    MinKey,
+    Regex,
+    Timestamp,
+})
+_IMMUTABLE: Final[frozenset[type]] = frozenset({
+    NoneType,
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    tuple,
+    frozenset,
+})
+
+
+def _to_float(value: Any) -> Any:  # noqa: ANN401
+    # whole numbers written by other clients may be stored as int32/int64
+    return float(value) if isinstance(value, int) else value
+
+
+def cached_on_class(
+    cls: type[BaseModel],
+    attr: str,
+    factory: Callable[[], Any],
+) -> Any:  # noqa: ANN401
+    """Get an attribute from the class, creating it on first access.
+
+    Only own `__dict__` is looked up, so subclasses
+    never reuse the value cached for their parent.
+
+    Returns:
+        The cached or newly created value.
+    """
+    cached = cls.__dict__.get(attr)
+    if cached is None:
+        cached = factory()
+        setattr(cls, attr, cached)
+    return cached
+
+
+def _validator(annotation: Any) -> Callable[[Any], Any]:  # noqa: ANN401
+    adapter: TypeAdapter[Any] = TypeAdapter(annotation)
+    return adapter.validate_python
+
+
+class _NestedDecoder:
+    # resolved on first call, models may reference themselves
+    __slots__ = ("_decoder", "_model")
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self._model = model
+        self._decoder: Callable[[xJsonT], BaseModel] | None = None
+
+    def __call__(self, value: Any) -> Any:  # noqa: ANN401
+        if not isinstance(value, dict):
+            return value
+        if self._decoder is None:
+            self._decoder = get_decoder(self._model)
+        return self._decoder(cast("xJsonT", value))
+
+
+def _compile_container(  # noqa: PLR0911
+    annotation: Any,  # noqa: ANN401
+    use_enum_values: bool,  # noqa: FBT001
+) -> Callable[[Any], Any] | None:
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in {Union, UnionType}:
+        present = [arg for arg in args if arg is not NoneType]
+        if len(present) != 1:
+            return _validator(annotation)
+        convert = _compile_annotation(present[0], use_enum_values)
+        if convert is None:
+            return None
+        return lambda value: None if value is None else convert(value)
+    if origin is list:
+        item = _compile_annotation(args[0], use_enum_values)
+        if item is None:
+            return None
+        return lambda value: [item(x) for x in value]
+    item = _compile_annotation(args[1], use_enum_values)  # dict
+    if item is None:
+        return None
+    return lambda value: {k: item(v) for k, v in value.items()}
+
+
+def _compile_annotation(
+    annotation: Any,  # noqa: ANN401
+    use_enum_values: bool,  # noqa: FBT001
+) -> Callable[[Any], Any] | None:
+    if annotation in BSON_NATIVE_TYPES or get_origin(annotation) is Literal:
+        return None
+    if annotation is float:
+        return _to_float
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in {Union, UnionType} or (
+        (origin is list and len(args) == 1)
+        or (origin is dict and len(args) == 2)  # noqa: PLR2004
+    ):
+        return _compile_container(annotation, use_enum_values)
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _NestedDecoder(annotation)
+        if issubclass(annotation, Enum) and use_enum_values:
+            return None
+    return _validator(annotation)
+
+
+def _default_source(
+    name: str,
+    default: Any,  # noqa: ANN401
+    namespace: dict[str, Any],
+) -> str:
+    if type(default) in _IMMUTABLE:
+        namespace[name] = default
+        return name
+    # mutable defaults are copied for every instance, like pydantic does
+    namespace[name] = partial(deepcopy, default)
+    return f"{name}()"
+
+
+def _field_source(
+    index: int,
+    name: str,
+    field: FieldInfo,
+    use_enum_values: bool,  # noqa: FBT001
+    namespace: dict[str, Any],
+) -> list[str]:
+    keys = [field.alias or name]
+    if field.alias not in {None, name}:
+        keys.append(name)  # populate_by_name
+    lines = [f"    value = pop({keys[0]!r}, MISSING)"]
+    lines.extend(
+        f"    if value is MISSING: value = pop({key!r}, MISSING)"
+        for key in keys[1:]
+    )
+    lines.append("    if value is MISSING:")
+    if field.is_required():
+        lines.append("        return validate(payload)")
+    else:
+        if field.default_factory is not None:
+            namespace[f"factory_{index}"] = partial(
+                field.get_default, call_default_factory=True,
+                validated_data={},
+            )
+            default = f"factory_{index}()"
+        else:
+            default = _default_source(
+                f"default_{index}", field.default, namespace,
+            )
+        lines.extend([
+            f"        value = {default}",
+            f"        defaulted.append({name!r})",
+        ])
+    convert = _compile_annotation(field.annotation, use_enum_values)
+    if convert is not None:
+        namespace[f"convert_{index}"] = convert
+        lines.append(f"    else: value = convert_{index}(value)")
+    lines.append(f"    field_{index} = value")
+    return lines
+
+
+def compile_decoder(cls: type[M]) -> Callable[[xJsonT], M]:
+    """Generate a function creating instances from trusted documents.
+
+    Field converters are derived from annotations once: values that the
+    bson decoder already returns in their final type are assigned as they
+    are, nested models are decoded recursively and anything else falls
+    back to a per-field `TypeAdapter`. Documents missing required fields
+    or carrying forbidden extra fields go through `model_validate`,
+    so such data still fails loudly. Validators and `model_post_init`
+    are not run, `_id` is moved into the private attribute directly.
+
+    Returns:
+        The generated decoder function.
+    """
+    config = cls.model_config
+    use_enum_values = bool(config.get("use_enum_values"))
+    extra_mode = config.get("extra") or "ignore"
+    namespace: dict[str, Any] = {
+        "MISSING": PydanticUndefined,
+        "new": cls.__new__,
+        "cls": cls,
+        "setattr_": object.__setattr__,
+        "validate": cls.model_validate,
+        "field_names": frozenset(cls.model_fields),
+    }
+    lines = [
+        "def decode(payload):",
+        "    extra = dict(payload)",
+        "    pop = extra.pop",
+        "    defaulted = []",
+    ]
+    for index, (name, field) in enumerate(cls.model_fields.items()):
+        lines.extend(_field_source(
+            index, name, field, use_enum_values, namespace,
+        ))
+
+    lines.extend([
+        "    fields_set = {*field_names, *extra}" if extra_mode == "allow"
+        else "    fields_set = set(field_names)",
+        "    if defaulted: fields_set.difference_update(defaulted)",
+    ])
+    if extra_mode == "forbid":
+        lines.append("    if extra: return validate(payload)")
+
+    private: list[str] = []
+    for index, (name, attr) in enumerate(cls.__private_attributes__.items()):
+        if name == "_id":
+            lines.append("    document_id = pop('_id', None)")
+            private.append("'_id': document_id")
+            continue
+        default = attr.get_default()
+        if default is not PydanticUndefined:
+            source = _default_source(f"private_{index}", default, namespace)
+            private.append(f"{name!r}: {source}")
+
+    fields = ", ".join(
+        f"{name!r}: field_{index}"
+        for index, name in enumerate(cls.model_fields)
+    )
+    extra = "extra" if extra_mode == "allow" else "None"
+    private_attrs = ", ".join(private)
+    lines.extend([
+        "    instance = new(cls)",
+        f"    setattr_(instance, '__dict__', {{{fields}}})",
+        "    setattr_(instance, '__pydantic_fields_set__', fields_set)",
+        f"    setattr_(instance, '__pydantic_extra__', {extra})",
+        f"    setattr_(instance, '__pydantic_private__', {{{private_attrs}}})",
+        "    return instance",
+    ])
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["decode"]
+
+
+def get_decoder(cls: type[M]) -> Callable[[xJsonT], M]:
+    """Get the trusted decoder of a model class.
+
+    The decoder is compiled on first use and cached on the class.
+
+    Returns:
+        Callable creating an instance of the class from a document.
+    """
+    return cached_on_class(cls, _DECODER_ATTR, lambda: compile_decoder(cls))
+
+
+def get_batch_adapter(cls: type[M]) -> TypeAdapter[list[M]]:
+    """Get the adapter validating a whole batch of documents at once.
+
+    Returns:
+        A `TypeAdapter` for a list of the class instances.
+    """
+    batch: Any = GenericAlias(list, (cls,))
+    return cached_on_class(cls, _ADAPTER_ATTR, lambda: TypeAdapter(batch))
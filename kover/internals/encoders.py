@@ -0,0 +1,227 @@
+"""Compiled encoders turning documents into insertable dictionaries."""
+
+from __future__ import annotations
+
+from enum import Enum
+from functools import partial
+from types import NoneType, UnionType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Final,
+    Literal,
+    Union,
+    get_args,
+    get_origin,
+)
+from uuid import UUID
+
+from bson import Binary
+from pydantic import BaseModel, TypeAdapter
+from pydantic.functional_serializers import PlainSerializer, WrapSerializer
+
+from ..metadata import ExcludeIfNone
+from .decoders import BSON_NATIVE_TYPES, cached_on_class
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydantic.fields import FieldInfo
+
+    from ..typings import xJsonT
+
+    Encoder = Callable[[Any, bool], xJsonT]
+
+_ENCODER_ATTR: Final[str] = "__kover_encoder__"
+
+# values of these types are dumped by pydantic as they are
+_SCALARS: Final[frozenset[object]] = (
+    BSON_NATIVE_TYPES - {Any, object, dict, list}
+) | {float, UUID}
+_ANY: Final[TypeAdapter[Any]] = TypeAdapter(Any)
+
+
+def _dump_any(value: Any) -> Any:  # noqa: ANN401
+    # models can hide inside of untyped values, pydantic dumps them too
+    if type(value) in _SCALARS:
+        return value
+    return _ANY.dump_python(value, by_alias=True)
+
+
+def _uuid_to_binary(value: Any) -> Any:  # noqa: ANN401
+    return Binary.from_uuid(value) if isinstance(value, UUID) else value
+
+
+def _convert_uuid(
+    convert: Callable[[Any], Any],
+    value: Any,  # noqa: ANN401
+) -> Any:  # noqa: ANN401
+    return _uuid_to_binary(convert(value))
+
+
+class _NestedEncoder:
+    __slots__ = ("_encoder", "_model")
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self._model = model
+        self._encoder: Encoder | None = None
+
+    def __call__(self, value: Any) -> Any:  # noqa: ANN401
+        if not isinstance(value, BaseModel):
+            return value
+        if self._encoder is None:
+            self._encoder = get_encoder(self._model)
+        # nested documents are dumped without their _id
+        return self._encoder(value, True)  # noqa: FBT003
+
+
+def _compile_container(  # noqa: PLR0911
+    annotation: Any,  # noqa: ANN401
+    family: Callable[[type[BaseModel]], bool],
+) -> Callable[[Any], Any] | None:
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in {Union, UnionType}:
+        present = [arg for arg in args if arg is not NoneType]
+        if len(present) != 1:
+            return _dump_any
+        convert = _compile_annotation(present[0], family)
+        if convert is None:
+            return None
+        return lambda value: None if value is None else convert(value)
+    if origin is list:
+        item = _compile_annotation(args[0], family)
+        if item is None:
+            return list
+        return lambda value: [item(x) for x in value]
+    item = _compile_annotation(args[1], family)  # dict
+    if item is None:
+        return dict
+    return lambda value: {k: item(v) for k, v in value.items()}
+
+
+def _compile_annotation(
+    annotation: Any,  # noqa: ANN401
+    family: Callable[[type[BaseModel]], bool],
+) -> Callable[[Any], Any] | None:
+    if annotation in _SCALARS or get_origin(annotation) is Literal:
+        return None
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in {Union, UnionType} or (
+        (origin is list and len(args) == 1)
+        or (origin is dict and len(args) == 2)  # noqa: PLR2004
+    ):
+        return _compile_container(annotation, family)
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return None
+        if issubclass(annotation, BaseModel) and family(annotation):
+            return _NestedEncoder(annotation)
+    return _dump_any
+
+
+def _holds_uuid(annotation: Any) -> bool:  # noqa: ANN401
+    # documents convert UUIDs to Binary, but only for top level values
+    if annotation in {UUID, Any, object}:
+        return True
+    if get_origin(annotation) in {Union, UnionType}:
+        return any(map(_holds_uuid, get_args(annotation)))
+    return False
+
+
+def _field_source(
+    index: int,
+    name: str,
+    field: FieldInfo,
+    family: Callable[[type[BaseModel]], bool],
+    namespace: dict[str, Any],
+) -> list[str]:
+    key = field.alias or name
+    convert = _compile_annotation(field.annotation, family)
+    if _holds_uuid(field.annotation):
+        convert = (
+            _uuid_to_binary if convert is None
+            else partial(_convert_uuid, convert)
+        )
+    value = f"values[{name!r}]"
+    if convert is not None:
+        namespace[f"convert_{index}"] = convert
+        value = f"convert_{index}({value})"
+    if any(isinstance(meta, ExcludeIfNone) for meta in field.metadata):
+        return [
+            f"    value = values[{name!r}]",
+            f"    if value is not None: document[{key!r}] = {value}",
+        ]
+    return [f"    document[{key!r}] = {value}"]
+
+
+def _is_compilable(cls: type[BaseModel]) -> bool:
+    decorators = cls.__pydantic_decorators__
+    if decorators.field_serializers or decorators.computed_fields:
+        return False
+    return not any(
+        isinstance(meta, PlainSerializer | WrapSerializer)
+        for field in cls.model_fields.values()
+        for meta in field.metadata
+    )
+
+
+def _dump_with_id(instance: BaseModel, exclude_id: bool) -> xJsonT:  # noqa: FBT001
+    dumped: xJsonT = instance.model_dump(by_alias=True)
+    document_id = getattr(instance, "_id", None)
+    if not exclude_id and document_id is not None:
+        dumped = {"_id": document_id, **dumped}
+    return dumped
+
+
+def compile_encoder(cls: type[BaseModel]) -> Encoder:
+    """Generate a function dumping documents in a single pass.
+
+    Aliases, `ExcludeIfNone` fields and fields that may hold
+    UUIDs are resolved once. Extra fields are not dumped, `_id`
+    goes first unless excluded, as `Document.to_dict` does.
+    Nested models sharing the model serializer of the class are
+    dumped by their own compiled encoders, other values are dumped
+    by pydantic. Classes with custom field serializers or computed
+    fields are dumped by `model_dump`.
+
+    Returns:
+        The generated encoder taking the instance and `exclude_id`.
+    """
+    if not _is_compilable(cls):
+        return _dump_with_id
+    serializers = cls.__pydantic_decorators__.model_serializers
+
+    def family(model: type[BaseModel]) -> bool:
+        return model.__pydantic_decorators__.model_serializers == serializers
+
+    namespace: dict[str, Any] = {}
+    lines = [
+        "def encode(instance, exclude_id=False):",
+        "    values = instance.__dict__",
+        "    document = {}",
+    ]
+    if "_id" in cls.__private_attributes__:
+        lines.extend([
+            "    if not exclude_id:",
+            "        document_id = instance.__pydantic_private__['_id']",
+            "        if document_id is not None:",
+            "            document['_id'] = document_id",
+        ])
+    for index, (name, field) in enumerate(cls.model_fields.items()):
+        if not field.exclude:
+            lines.extend(_field_source(index, name, field, family, namespace))
+    lines.append("    return document")
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["encode"]
+
+
+def get_encoder(cls: type[BaseModel]) -> Encoder:
+    """Get the compiled encoder of a model class.
+
+    The encoder is compiled on first use and cached on the class.
+
+    Returns:
+        Callable taking the instance and `exclude_id`,
+            returning the insertable dictionary.
+    """
+    return cached_on_class(cls, _ENCODER_ATTR, lambda: compile_encoder(cls))
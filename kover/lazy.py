@@ -0,0 +1,326 @@
+"""Lazily decoded BSON documents."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from itertools import starmap
+import struct
+from typing import TYPE_CHECKING, Any, Final
+
+from bson import (
+    DEFAULT_CODEC_OPTIONS,
+    Int64,
+    ObjectId,
+    decode,  # type: ignore[reportUnknownVariableType]
+    encode,
+)
+from bson.errors import InvalidBSON
+from bson.raw_bson import RawBSONDocument
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from typing_extensions import Self
+
+    from .typings import xJsonT
+
+# https://bsonspec.org/spec.html
+_FIXED_SIZES: Final[dict[int, int]] = {
+    0x01: 8,  # double
+    0x06: 0,  # undefined
+    0x07: 12,  # ObjectId
+    0x08: 1,  # boolean
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # null
+    0x10: 4,  # int32
+    0x11: 8,  # timestamp
+    0x12: 8,  # int64
+    0x13: 16,  # decimal128
+    0x7F: 0,  # max key
+    0xFF: 0,  # min key
+}
+_STRING_LIKE: Final[frozenset[int]] = frozenset({0x02, 0x0D, 0x0E})
+_SIZED: Final[frozenset[int]] = frozenset({0x03, 0x04, 0x0F})
+_EMBEDDED_T: Final[int] = 0x03
+_ARRAY_T: Final[int] = 0x04
+_BINARY_T: Final[int] = 0x05
+_UNDEFINED_T: Final[int] = 0x06
+_OBJECT_ID_T: Final[int] = 0x07
+_REGEX_T: Final[int] = 0x0B
+_DB_POINTER_T: Final[int] = 0x0C
+# https://www.mongodb.com/docs/manual/core/document/#the-_id-field
+_INVALID_ID_TYPES: Final[frozenset[int]] = frozenset({
+    _ARRAY_T, _UNDEFINED_T, _REGEX_T,
+})
+
+_INT32: Final = struct.Struct("<i")
+_INT64: Final = struct.Struct("<q")
+_DOUBLE: Final = struct.Struct("<d")
+
+# common scalars are unpacked directly, skipping the decoder call
+_SCALARS: Final[dict[int, Callable[[bytes, int, int], Any]]] = {
+    0x01: lambda data, at, _: _DOUBLE.unpack_from(data, at)[0],
+    0x02: lambda data, at, end: data[at + 4:end - 1].decode(),
+    0x08: lambda data, at, _: data[at] == 1,
+    0x0A: lambda _, __, ___: None,
+    0x10: lambda data, at, _: _INT32.unpack_from(data, at)[0],
+    0x12: lambda data, at, _: Int64(_INT64.unpack_from(data, at)[0]),
+}
+
+
+def _value_size(kind: int, data: bytes, at: int) -> int:
+    if kind in _STRING_LIKE:
+        return 4 + _INT32.unpack_from(data, at)[0]
+    if kind in _SIZED:
+        return _INT32.unpack_from(data, at)[0]
+    if kind == _BINARY_T:
+        return 5 + _INT32.unpack_from(data, at)[0]
+    if kind == _REGEX_T:
+        pattern_end = data.index(b"\x00", at)
+        return data.index(b"\x00", pattern_end + 1) + 1 - at
+    if kind == _DB_POINTER_T:
+        return 4 + _INT32.unpack_from(data, at)[0] + 12
+    raise InvalidBSON(f"Unknown BSON type: {kind:#04x}")
+
+
+def _decode_element(element: bytes) -> Any:  # noqa: ANN401
+    wrapped = _INT32.pack(len(element) + 5) + element + b"\x00"
+    decoded: xJsonT = decode(wrapped, DEFAULT_CODEC_OPTIONS)
+    return next(iter(decoded.values()))
+
+
+def _find_id(data: bytes) -> bytes | None:
+    if (
+        len(data) < 5  # noqa: PLR2004
+        or _INT32.unpack_from(data)[0] != len(data)
+        or data[-1] != 0
+    ):
+        raise InvalidBSON("Invalid document length.")
+    position, last = 4, len(data) - 1
+    while position < last:
+        kind = data[position]
+        name_end = data.index(b"\x00", position + 1)
+        value_at = name_end + 1
+        size = _FIXED_SIZES.get(kind)
+        if size is None:
+            size = _value_size(kind, data, value_at)
+        element_end = value_at + size
+        if data[position + 1:name_end] == b"_id":
+            if kind in _INVALID_ID_TYPES:
+                raise InvalidBSON(f"_id can not be of BSON type {kind:#04x}")
+            return data[position:element_end]
+        position = element_end
+    if position != last:
+        raise InvalidBSON("Element overruns the document.")
+    return None
+
+
+def raw_document_id(
+    document: RawBSONDocument | bytes,
+) -> tuple[RawBSONDocument, Any]:
+    """Get the `_id` of a BSON encoded document, scanning only headers.
+
+    Elements before `_id` are skipped by their sizes, nothing else
+    is decoded. Documents without `_id` get a new ObjectId prepended,
+    the rest of their bytes is kept as it is.
+
+    Parameters:
+        document : The raw document or its BSON bytes.
+
+    Returns:
+        The raw document with `_id`, the passed one if it already
+            had it, and the `_id` itself.
+
+    Raises:
+        ValueError : If the data is not a valid BSON document
+            or its `_id` is an array, regex or undefined.
+    """
+    data = bytes(
+        document.raw if isinstance(document, RawBSONDocument) else document)
+    try:
+        element = _find_id(data)
+    except (InvalidBSON, ValueError, struct.error, IndexError) as exc_value:
+        msg = f"Invalid raw document: {exc_value}"
+        raise ValueError(msg) from exc_value
+    if element is not None:
+        if not isinstance(document, RawBSONDocument):
+            document = RawBSONDocument(data)
+        return document, _decode_element(element)
+    document_id = ObjectId()
+    id_element = bytes([_OBJECT_ID_T]) + b"_id\x00" + document_id.binary
+    length = _INT32.pack(len(data) + len(id_element))
+    return RawBSONDocument(length + id_element + data[4:]), document_id
+
+
+def raw_lookup(data: bytes, keys: Sequence[bytes]) -> Any:  # noqa: ANN401
+    """Decode the value at a path of a BSON document, scanning only headers.
+
+    Elements before the requested ones are skipped by their sizes
+    and subdocuments on the path are entered in place, so neither
+    the other values nor any intermediate mapping are built.
+
+    Parameters:
+        data : The BSON bytes of the document.
+        keys : Encoded field names, from the outermost one.
+
+    Returns:
+        The decoded value or None if it is missing or null.
+    """
+    start, last = 0, _INT32.unpack_from(data)[0] - 1
+    fixed, depth = _FIXED_SIZES, len(keys) - 1
+    for level, key in enumerate(keys):
+        position = start + 4  # skip the document length
+        while position < last:
+            kind = data[position]
+            name_end = data.index(b"\x00", position + 1)
+            value_at = name_end + 1
+            size = fixed.get(kind)
+            if size is None:
+                size = _value_size(kind, data, value_at)
+            element_end = value_at + size
+            if data[position + 1:name_end] == key:
+                break
+            position = element_end
+        else:
+            return None
+        if level == depth:
+            if kind in _SCALARS:
+                return _SCALARS[kind](data, value_at, element_end)
+            return _decode_element(data[position:element_end])
+        if kind != _EMBEDDED_T:
+            return None
+        start, last = value_at, element_end - 1
+    return None
+
+
+class LazyDocument(Mapping[str, Any]):
+    """Read-only document that decodes a field on its first access.
+
+    Keeps the BSON bytes received from the server and only scans
+    element headers up to the requested key, so reading a couple of
+    fields from a wide document skips decoding the rest of it.
+    Decoded values are cached, subdocuments are lazy as well
+    and share the buffer of their parent.
+
+    Headers are scanned in Python, so it pays off when the fields
+    read are near the front of the document or the rest of it is
+    made of large subdocuments. Use `to_dict` when most fields are needed.
+
+    ```
+    >>> async for event in collection.find(cls=LazyDocument):
+    ...     print(event["kind"], event["payload"]["user"])
+    ```
+    """
+
+    __slots__ = ("_cache", "_data", "_elements", "_end", "_scanned", "_start")
+
+    def __init__(
+        self,
+        data: bytes,
+        start: int = 0,
+        end: int | None = None,
+    ) -> None:
+        self._data = data
+        self._start = start
+        self._end: int = (
+            start + _INT32.unpack_from(data, start)[0] if end is None else end
+        )
+        self._scanned = start + 4  # skip the document length
+        self._elements: dict[str, tuple[int, int, int, int]] = {}
+        self._cache: dict[str, Any] = {}
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> Self:
+        """Create a lazy document from a raw or decoded document.
+
+        Parameters:
+            document : A `RawBSONDocument` or any mapping to encode.
+
+        Returns:
+            The lazy document, raw input is not copied.
+        """
+        if isinstance(document, RawBSONDocument):
+            return cls(bytes(document.raw))
+        return cls(encode(document))
+
+    @property
+    def raw(self) -> bytes:
+        """The BSON bytes of this document."""
+        return self._data[self._start:self._end]
+
+    def _scan(self, key: str | None = None) -> None:
+        # records element offsets until the key is found or document ends
+        data, last = self._data, self._end - 1  # trailing null byte
+        position, fixed, elements = self._scanned, _FIXED_SIZES, self._elements
+        while position < last:
+            kind = data[position]
+            name_end = data.index(b"\x00", position + 1)
+            name = data[position + 1:name_end].decode()
+            value_at = name_end + 1
+            size = fixed.get(kind)
+            if size is None:
+                size = _value_size(kind, data, value_at)
+            element_end = value_at + size
+            elements[name] = (kind, position, value_at, element_end)
+            position = element_end
+            if name == key:
+                break
+        self._scanned = position
+
+    def _locate(self, key: str) -> tuple[int, int, int, int] | None:
+        element = self._elements.get(key)
+        if element is None and self._scanned < self._end - 1:
+            self._scan(key)
+            element = self._elements.get(key)
+        return element
+
+    def _decode_value(
+        self,
+        kind: int,
+        position: int,
+        value_at: int,
+        end: int,
+    ) -> Any:  # noqa: ANN401
+        data = self._data
+        if kind == _EMBEDDED_T:
+            return LazyDocument(data, value_at, end)
+        if kind == _ARRAY_T:
+            array = LazyDocument(data, value_at, end)
+            array._scan()
+            return list(
+                starmap(array._decode_value, array._elements.values()))
+        if kind in _SCALARS:
+            return _SCALARS[kind](data, value_at, end)
+        # everything else goes through the regular decoder, one element
+        return _decode_element(data[position:end])
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        if key in self._cache:
+            return self._cache[key]
+        element = self._locate(key)
+        if element is None:
+            raise KeyError(key)
+        value = self._cache[key] = self._decode_value(*element)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._locate(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        self._scan()
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        self._scan()
+        return len(self._elements)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> xJsonT:
+        """Decode the whole document, including subdocuments.
+
+        Returns:
+            A regular dictionary with all fields decoded.
+        """
+        return decode(self.raw, DEFAULT_CODEC_OPTIONS)
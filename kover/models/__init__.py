@@ -1,6 +1,7 @@
 from .operations import Delete, Update
 from .other import (
     BuildInfo,
+    BulkWriteResult,
     Collation,
     HelloResult,
     Index,
@@ -16,6 +17,7 @@ from .replset import (
 
 __all__ = (
     "BuildInfo",
+    "BulkWriteResult",
     "Collation",
     "Delete",
     "HelloResult",
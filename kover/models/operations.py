@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from bson.raw_bson import RawBSONDocument  # noqa: TC002
 from pydantic import BaseModel
 from typing_extensions import NotRequired, TypedDict, Unpack
 
-from ..helpers import filter_non_null
+from ..helpers import filter_non_null, maybe_wrap_raw
 from ..internals.mixins import ModelMixin as _ModelMixin
-from ..typings import xJsonT  # noqa: TC001
+from ..typings import RawDocumentT, xJsonT  # noqa: TC001
 from .other import Collation  # noqa: TC001
 
 
@@ -27,16 +28,22 @@ class Update(_ModelMixin):
 
     def __init__(
         self,
-        q: xJsonT,
-        u: xJsonT,
+        q: xJsonT | RawDocumentT,
+        u: xJsonT | RawDocumentT,
         c: xJsonT | None = None,
         /,
         **kwargs: Unpack[_UpdateKwargs],
     ) -> None:
-        BaseModel.__init__(self, q=q, u=u, c=c, **kwargs)
-
-    q: xJsonT
-    u: xJsonT
+        BaseModel.__init__(
+            self,
+            q=maybe_wrap_raw(q),
+            u=maybe_wrap_raw(u),
+            c=c,
+            **kwargs,
+        )
+
+    q: xJsonT | RawBSONDocument
+    u: xJsonT | RawBSONDocument
     c: xJsonT | None = None  # constants
     upsert: bool = False
     multi: bool = False
@@ -54,6 +61,7 @@ class Update(_ModelMixin):
             "filter": self.q,
             "updateMods": self.u,
             "arrayFilters": self.array_filters,
+            "upsert": self.upsert,
             "multi": self.multi,
             "hint": self.hint,
             "constants": self.c,
@@ -73,10 +81,15 @@ class _DeleteKwargs(TypedDict):
 class Delete(_ModelMixin):
     """Represents a MongoDB delete document."""
 
-    def __init__(self, q: xJsonT, /, **kwargs: Unpack[_DeleteKwargs]) -> None:
-        BaseModel.__init__(self, q=q, **kwargs)
+    def __init__(
+        self,
+        q: xJsonT | RawDocumentT,
+        /,
+        **kwargs: Unpack[_DeleteKwargs],
+    ) -> None:
+        BaseModel.__init__(self, q=maybe_wrap_raw(q), **kwargs)
 
-    q: xJsonT  # query
+    q: xJsonT | RawBSONDocument  # query
     limit: int
     collation: Collation | None = None
     hint: xJsonT | str | None = None
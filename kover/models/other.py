@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import datetime  # noqa: TC003
 import secrets
-from typing import Literal
+from typing import Final, Literal
 
 from bson import Binary  # noqa: TC002
 from pydantic import Field, model_validator
@@ -17,6 +17,11 @@ from ..enums import CollationStrength, IndexDirection, IndexType  # noqa: TC001
 from ..internals.mixins import ModelMixin as _ModelMixin
 from ..typings import COMPRESSION_T, AuthTypesT, xJsonT
 
+# limits reported in hello by every server version kover supports
+MAX_BSON_OBJECT_SIZE: Final[int] = 16 * 1024 * 1024
+MAX_MESSAGE_SIZE_BYTES: Final[int] = 48_000_000
+MAX_WRITE_BATCH_SIZE: Final[int] = 100_000
+
 
 class HelloResult(_ModelMixin):
     """Represents the result of a hello command."""
@@ -33,6 +38,11 @@ class HelloResult(_ModelMixin):
     hosts: list[str] | None = Field(default=None)
     set_name: str | None = Field(default=None)
     set_version: int | None = Field(default=None)
+    logical_session_timeout_minutes: int | None = Field(default=None)
+    max_bson_object_size: int = Field(default=MAX_BSON_OBJECT_SIZE)
+    max_message_size_bytes: int = Field(default=MAX_MESSAGE_SIZE_BYTES)
+    max_write_batch_size: int = Field(default=MAX_WRITE_BATCH_SIZE)
+    max_wire_version: int = Field(default=0)
 
     @property
     def requires_auth(self) -> bool:
@@ -46,6 +56,31 @@ class HelloResult(_ModelMixin):
         return None
 
 
+# https://www.mongodb.com/docs/manual/reference/command/bulkWrite/#output
+class BulkWriteResult(_ModelMixin):
+    """Represents the merged result of a bulkWrite and all of its splits.
+
+    `results` holds every entry of the drained result cursors,
+    `idx` of each entry points into the operations of the builder.
+    """
+
+    n_errors: int = 0
+    n_inserted: int = 0
+    n_upserted: int = 0
+    n_matched: int = 0
+    n_modified: int = 0
+    n_deleted: int = 0
+    results: list[xJsonT] = Field(default_factory=list[xJsonT])
+    write_concern_errors: list[xJsonT] = Field(
+        default_factory=list[xJsonT],
+    )
+
+    @property
+    def errors(self) -> list[xJsonT]:
+        """Results of the operations that failed."""
+        return [result for result in self.results if result.get("ok") != 1]
+
+
 class BuildInfo(_ModelMixin):
     """Represents the result of a buildInfo command."""
 
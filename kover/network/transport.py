@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 from contextlib import suppress
 import ssl
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
+
+from bson import DEFAULT_CODEC_OPTIONS
 
 from ..enums import TxnState
 from ..helpers import classrepr
@@ -14,8 +16,15 @@ from .auth import Auth
 from .wirehelper import WireHelper
 
 if TYPE_CHECKING:
+    from bson.codec_options import CodecOptions
+
     from ..session import Transaction
-    from ..typings import COMPRESSION_T, DocumentT, xJsonT
+    from ..typings import (
+        COMPRESSION_T,
+        DocumentSequencesT,
+        DocumentT,
+        xJsonT,
+    )
     from .auth import AuthCredentials
 
 
@@ -109,23 +118,37 @@ class MongoTransport:
         db_name: str = "admin",
         transaction: Transaction | None = None,
         wait_response: bool = True,
+        codec_options: CodecOptions[Any] | None = None,
+        sequences: DocumentSequencesT | None = None,
     ) -> xJsonT:
         """Send a request to the MongoDB server.
 
+        Parameters:
+            doc : The command document.
+            db_name : The database to run the command against.
+            transaction : The transaction the command belongs to.
+            wait_response : Whether to read the reply.
+            codec_options : Options used to decode the reply,
+                e.g. to keep documents as raw BSON.
+            sequences : Command fields sent as document sequences
+                next to the command instead of inside of it.
+
         Returns:
             The server's response as a dictionary.
         """
         doc = {**doc, "$db": db_name}  # order important
         if transaction is not None and transaction.is_active:
             transaction.apply_to(doc)
-        rid, msg = self._helper.get_message(doc, compressor=self._compressor)
+        rid, msg = self._helper.get_message(
+            doc, compressor=self._compressor, sequences=sequences)
 
         await self._send(msg)
         if wait_response:
             header = await self._recv(16)
             length, op_code = self._helper.verify_rid(header, rid)
             data = await self._recv(length - 16)  # exclude header
-            reply = self._helper.get_reply(data, op_code)
+            reply = self._helper.get_reply(
+                data, op_code, codec_options or DEFAULT_CODEC_OPTIONS)
         else:  # cases like kover.shutdown()
             return {}
 
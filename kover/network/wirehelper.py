@@ -13,6 +13,7 @@ from bson import (
     decode,  # type: ignore[reportUnknownVariableType]
     encode,
 )
+from bson.raw_bson import RawBSONDocument
 
 from .. import __version__
 from ..codes import get_exception_name
@@ -22,7 +23,9 @@ from . import get_context_by_id
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
-    from ..typings import COMPRESSION_T, xJsonT
+    from bson.codec_options import CodecOptions
+
+    from ..typings import COMPRESSION_T, DocumentSequencesT, xJsonT
 
 OP_MSG: Final[int] = 2013
 OP_COMPRESSED: Final[int] = 2012
@@ -70,22 +73,39 @@ class WireHelper:
         ])
 
     @staticmethod
+    def _encode_document(document: Mapping[str, Any]) -> bytes:
+        if isinstance(document, RawBSONDocument):
+            return bytes(document.raw)
+        return encode(
+            document,
+            check_keys=False,
+            codec_options=DEFAULT_CODEC_OPTIONS,
+        )
+
     def _op_msg_impl(
+        self,
         command: Mapping[str, Any],
+        sequences: DocumentSequencesT | None = None,
         flags: int = 0,
     ) -> bytes:
         # https://www.mongodb.com/docs/manual/reference/mongodb-wire-protocol/#op_msg
         # https://www.mongodb.com/docs/manual/reference/mongodb-wire-protocol/#kind-0--body
-        encoded = encode(
-            command,
-            check_keys=False,
-            codec_options=DEFAULT_CODEC_OPTIONS,
-        )
-        return b"".join([
+        sections = [
             struct.pack("<i", flags),
             struct.pack("<B", 0),  # section id 0 is single bson object
-            encoded,  # doc itself
-        ])
+            self._encode_document(command),  # doc itself
+        ]
+        # https://www.mongodb.com/docs/manual/reference/mongodb-wire-protocol/#kind-1--document-sequence
+        for identifier, documents in (sequences or {}).items():
+            name = identifier.encode() + b"\x00"
+            payload = b"".join(map(self._encode_document, documents))
+            sections.extend([
+                struct.pack("<B", 1),  # section id 1 is a document sequence
+                struct.pack("<i", 4 + len(name) + len(payload)),
+                name,
+                payload,
+            ])
+        return b"".join(sections)
 
     @staticmethod
     def _get_compressor_id(
@@ -97,6 +117,7 @@ class WireHelper:
         self,
         msg: bytes,
         op_code: int,
+        codec_options: CodecOptions[Any] = DEFAULT_CODEC_OPTIONS,
     ) -> xJsonT:
         if op_code == 1:  # manual/legacy-opcodes/#op_reply
             # flags, cursor, starting, docs = unpack from "<iqii"
@@ -110,27 +131,29 @@ class WireHelper:
             op_code, _, compressor_id = struct.unpack_from("<iiB", msg)
             ctx = get_context_by_id(compressor_id=compressor_id)
             message = ctx.decompress(msg[9:])  # skip fileds above
-            return self.get_reply(message, op_code=op_code)
+            return self.get_reply(
+                message, op_code=op_code, codec_options=codec_options)
         else:
             raise AssertionError(f"Unsupported op_code from server: {op_code}")
 
-        return decode(message, codec_options=DEFAULT_CODEC_OPTIONS)
+        return decode(message, codec_options=codec_options)
 
     def get_message(
         self,
         doc: xJsonT,
         compressor: Literal["zlib", "zstd", "snappy"] | None = None,
+        sequences: DocumentSequencesT | None = None,
     ) -> tuple[int, bytes]:
         """Gets the prepaired message bytes and request_id.
 
         Returns:
             A tuple containing the request ID and the packed message bytes.
         """
-        op_msg_m = self._op_msg_impl(doc)
+        op_msg_m = self._op_msg_impl(doc, sequences)
         if compressor is None:
             return self._pack_message(
                 2013,  # OP_MSG 2013
-                self._op_msg_impl(doc),
+                op_msg_m,
             )
         compressor_id = self._get_compressor_id(compressor)
         ctx = get_context_by_id(compressor_id=compressor_id)
@@ -224,6 +247,12 @@ class WireHelper:
         Returns:
             An instance of OperationFailure or a subclass thereof.
         """
+        exc_value = self._get_exception_impl(reply)
+        exc_value.error_labels = list(reply.get("errorLabels", []))
+        exc_value.details = reply
+        return exc_value
+
+    def _get_exception_impl(self, reply: xJsonT) -> OperationFailure:
         write_errors = reply.get("writeErrors", [])
         if write_errors:
             reply = write_errors[0]
@@ -28,10 +28,12 @@ from typing_extensions import Self
 from .exceptions import SchemaGenerationException
 from .helpers import classrepr, is_origin_ex, isinstance_ex
 from .internals import value_to_json_schema
+from .internals.decoders import get_batch_adapter, get_decoder
+from .internals.encoders import get_encoder
 from .metadata import ExcludeIfNone, SchemaMetadata
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
     from pydantic import SerializationInfo
 
@@ -248,26 +250,82 @@ class Document(BaseModel):
         return wrapped
 
     @classmethod
-    def from_document(cls, payload: xJsonT) -> Self:
+    def from_document(cls, payload: xJsonT, *, trusted: bool = False) -> Self:
         """Create a Document instance from a dictionary.
 
+        Parameters:
+            payload : The document to create the instance from.
+            trusted : Skip validation of types the server guarantees,
+                see `from_documents`.
+
         Returns:
             An instance of the Document subclass with
                 the data from the dictionary.
         """
+        if trusted:
+            return get_decoder(cls)(payload)
         return cls.model_validate(payload)
 
+    @classmethod
+    def from_documents(
+        cls,
+        payloads: list[xJsonT],
+        *,
+        trusted: bool = False,
+    ) -> list[Self]:
+        """Create Document instances from a batch of dictionaries.
+
+        The whole batch is validated by a single `TypeAdapter` call.
+        With `trusted`, data written through this model is assumed
+        to be valid and a decoder compiled once per class assigns
+        values directly, converting only the fields whose BSON type
+        differs from the annotation. Validators are not run then.
+
+        Parameters:
+            payloads : The documents to create instances from.
+            trusted : Skip validation of types the server guarantees.
+
+        Returns:
+            Instances of the Document subclass, in the same order.
+        """
+        if trusted:
+            decoder = get_decoder(cls)
+            return [decoder(payload) for payload in payloads]
+        return get_batch_adapter(cls).validate_python(payloads)
+
     def to_dict(self, *, exclude_id: bool = False) -> xJsonT:
         """Convert the document to a dictionary.
 
+        Uses an encoder generated once per class, which resolves
+        aliases, `ExcludeIfNone` fields and UUID conversion up front.
+
         Returns:
             The document represented as a dictionary.
                 If `exclude_id` is True, the `_id` field is excluded.
         """
-        dumped: xJsonT = self.model_dump(by_alias=True)
-        if not exclude_id and self._id is not None:
-            dumped = {"_id": self._id, **dumped}
-        return dumped
+        return get_encoder(type(self))(self, exclude_id)
+
+    @classmethod
+    def to_dicts(
+        cls,
+        documents: Iterable[Self],
+        *,
+        exclude_id: bool = False,
+    ) -> list[xJsonT]:
+        """Convert a batch of documents to dictionaries.
+
+        The encoder compiled for the class is looked up once
+        for the whole batch, see `to_dict`.
+
+        Returns:
+            The documents represented as dictionaries, in the same order.
+        """
+        encoder = get_encoder(cls)
+        return [
+            encoder(document, exclude_id) if type(document) is cls
+            else document.to_dict(exclude_id=exclude_id)
+            for document in documents
+        ]
 
     def model_post_init(self, _ctx: object) -> None:
         """Document's post init function. Do NOT subclass."""
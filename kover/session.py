@@ -2,28 +2,323 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+from collections import deque
+from contextlib import suppress
+import random
+import time
+from typing import TYPE_CHECKING, Final, TypeVar
+from uuid import uuid4
+import weakref
 
+from bson import Binary
+from typing_extensions import Self
+
+from .enums import TxnState
+from .exceptions import (
+    NETWORK_ERRORS,
+    OperationFailure,
+    is_request_failure,
+)
 from .helpers import classrepr
+from .models import WriteConcern
 from .transaction import Transaction
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from bson import Timestamp
+
     from .client import Kover
     from .typings import xJsonT
 
+T = TypeVar("T")
+
+# drivers must not use a session with less than a minute left.
+# https://github.com/mongodb/specifications/blob/master/source/sessions/driver-sessions.md#algorithm-to-acquire-a-serversession-instance-from-the-server-session-pool
+_EXPIRY_MARGIN: Final[float] = 60.0
+
+# https://github.com/mongodb/specifications/blob/master/source/transactions-convenient-api/transactions-convenient-api.md
+_WITH_TRANSACTION_TIMEOUT: Final[float] = 120.0
+_BACKOFF_INITIAL: Final[float] = 0.005
+_BACKOFF_MAX: Final[float] = 0.5
+_MAX_TIME_MS_EXPIRED: Final[int] = 50
+
+# https://github.com/mongodb/specifications/blob/master/source/causal-consistency/causal-consistency.md
+_CAUSAL_READ_COMMANDS: Final[frozenset[str]] = frozenset({
+    "find",
+    "aggregate",
+    "distinct",
+    "count",
+})
+
+
+def newer_cluster_time(
+    first: xJsonT | None,
+    second: xJsonT | None,
+) -> xJsonT | None:
+    """Pick the greatest of two `$clusterTime` documents.
+
+    Returns:
+        The document with the greater `clusterTime` or None.
+    """
+    if first is None or second is None:
+        return first or second
+    if second["clusterTime"] > first["clusterTime"]:
+        return second
+    return first
+
+
+def _has_label(exc_value: BaseException, label: str) -> bool:
+    # network errors of requests inside of transaction count as labeled,
+    # the same types raised by the callback itself do not
+    if is_request_failure(exc_value):
+        return True
+    return (
+        isinstance(exc_value, OperationFailure)
+        and exc_value.has_error_label(label)
+    )
+
+
+async def _backoff(attempt: int, deadline: float) -> None:
+    # full jitter, so concurrent retries do not hit the server in lockstep
+    ceiling = min(_BACKOFF_MAX, _BACKOFF_INITIAL * 2 ** attempt)
+    remaining = max(deadline - time.monotonic(), 0.0)
+    await asyncio.sleep(min(random.uniform(0, ceiling), remaining))  # noqa: S311
+
+
+@classrepr("document", "dirty")
+class ServerSession:
+    """Represents a server session that lives inside of the pool.
+
+    The lsid is generated locally as UUID v4 as the sessions spec allows,
+    so acquiring a session never costs a round trip.
+
+    Attributes:
+        document : The lsid document attached to commands.
+        last_use : Monotonic time of the last use of this session.
+        dirty : True if a network error happened while it was in use.
+        txn_number : The last transaction number used with this lsid.
+    """
+
+    def __init__(self) -> None:
+        self.document: xJsonT = {"id": Binary.from_uuid(uuid4())}
+        self.last_use: float = time.monotonic()
+        self.dirty: bool = False
+        self.txn_number: int = 0
+
+    def touch(self) -> None:
+        """Mark the session as used right now."""
+        self.last_use = time.monotonic()
+
+    def is_stale(
+        self,
+        timeout_minutes: int | None,
+        *,
+        within: float = 0.0,
+    ) -> bool:
+        """Check if the session is about to expire on the server.
+
+        Parameters:
+            timeout_minutes : The server's logical session timeout.
+            within : Additional seconds the session must stay alive for.
+
+        Returns:
+            True if less than a minute is left before server expiry.
+        """
+        if timeout_minutes is None:
+            return False
+        idle = time.monotonic() - self.last_use + within
+        return idle > timeout_minutes * 60 - _EXPIRY_MARGIN
+
+
+class ServerSessionPool:
+    """LIFO pool of server sessions, shared by a single client.
+
+    Attributes:
+        timeout_minutes : The `logicalSessionTimeoutMinutes`
+            value reported by the server in hello.
+    """
+
+    def __init__(self) -> None:
+        self.timeout_minutes: int | None = None
+        self._sessions: deque[ServerSession] = deque()
+        self._in_use: weakref.WeakSet[ServerSession] = weakref.WeakSet()
+        self._discarded: list[xJsonT] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def acquire(self) -> ServerSession:
+        """Take the most recently used session or create a new one.
+
+        Returns:
+            A server session that is safe to use.
+        """
+        session = None
+        while self._sessions and session is None:
+            session = self._sessions.popleft()
+            if session.is_stale(self.timeout_minutes):
+                session = None
+        session = session or ServerSession()
+        self._in_use.add(session)
+        return session
+
+    def release(self, session: ServerSession) -> None:
+        """Return the session into the pool.
+
+        Stale sessions from the tail and dirty sessions are dropped,
+        dirty ones are remembered to be ended on the server.
+        """
+        self._in_use.discard(session)
+        while self._sessions and self._sessions[-1].is_stale(
+            self.timeout_minutes,
+        ):
+            self._sessions.pop()
+        if session.dirty:
+            self._discarded.append(session.document)
+            return
+        if not session.is_stale(self.timeout_minutes):
+            self._sessions.appendleft(session)
+
+    def expiring(self, within: float) -> list[ServerSession]:
+        """Get checked out sessions that expire in the given time.
+
+        Parameters:
+            within : Amount of seconds sessions must stay alive for.
 
-@classrepr("document")
+        Returns:
+            Sessions that should be refreshed on the server.
+        """
+        return [
+            session for session in self._in_use
+            if session.is_stale(self.timeout_minutes, within=within)
+        ]
+
+    def pop_discarded(self) -> list[xJsonT]:
+        """Take lsids of discarded sessions that were not ended yet.
+
+        Returns:
+            The lsid documents of discarded sessions.
+        """
+        documents, self._discarded = self._discarded, []
+        return documents
+
+    def drain(self) -> list[xJsonT]:
+        """Remove all sessions from the pool.
+
+        Returns:
+            The lsid documents of all removed sessions.
+        """
+        documents = [session.document for session in self._sessions]
+        self._sessions.clear()
+        return documents + self.pop_discarded()
+
+
+@classrepr("document", "causal_consistency", "operation_time")
 class Session:
     """Represents a MongoDB session.
 
     Attributes:
-        document : The session document associated with the session.
+        server_session : The pooled server session backing this session.
         client : The client used to communicate with MongoDB.
+        causal_consistency : Whether reads observe preceding
+            operations of this session.
+        operation_time : The greatest operationTime seen in this session.
+        cluster_time : The greatest $clusterTime seen in this session.
     """
 
-    def __init__(self, document: xJsonT, client: Kover) -> None:
-        self.document: xJsonT = document
+    def __init__(
+        self,
+        server_session: ServerSession,
+        client: Kover,
+        *,
+        causal_consistency: bool = True,
+    ) -> None:
+        self.server_session = server_session
         self.client = client
+        self.causal_consistency = causal_consistency
+        self.operation_time: Timestamp | None = None
+        self.cluster_time: xJsonT | None = None
+        self._ended: bool = False
+
+    @property
+    def document(self) -> xJsonT:
+        """The lsid document associated with the session."""
+        return self.server_session.document
+
+    @property
+    def is_ended(self) -> bool:
+        """Check if the session was returned to the pool."""
+        return self._ended
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.end()
+
+    def advance_operation_time(self, operation_time: Timestamp) -> None:
+        """Advance the operation time of this session.
+
+        Parameters:
+            operation_time : The operationTime from a server reply.
+        """
+        if self.operation_time is None or operation_time > self.operation_time:
+            self.operation_time = operation_time
+
+    def advance_cluster_time(self, cluster_time: xJsonT) -> None:
+        """Advance the cluster time of this session.
+
+        Parameters:
+            cluster_time : The $clusterTime document from a server reply.
+        """
+        self.cluster_time = newer_cluster_time(self.cluster_time, cluster_time)
+
+    def apply_read_concern(
+        self,
+        doc: xJsonT,
+        *,
+        first_in_transaction: bool = False,
+    ) -> None:
+        """Attach `afterClusterTime` to a read command of this session.
+
+        Parameters:
+            doc : The command document, modified in place.
+            first_in_transaction : Whether the command starts a transaction,
+                any such command must carry the read concern.
+        """
+        if not self.causal_consistency or self.operation_time is None:
+            return
+        command = next(iter(doc))
+        if not first_in_transaction and command not in _CAUSAL_READ_COMMANDS:
+            return
+        doc["readConcern"] = {
+            **doc.get("readConcern", {}),
+            "afterClusterTime": self.operation_time,
+        }
+
+    def next_txn_number(self) -> int:
+        """Allocate the next transaction number for this session.
+
+        The counter lives on the pooled server session, since the server
+        rejects any txnNumber that is not greater than the last one used
+        with the same lsid. Transactions and retryable writes share it.
+
+        Returns:
+            A transaction number, unique for this lsid.
+        """
+        self.server_session.txn_number += 1
+        return self.server_session.txn_number
+
+    def end(self) -> None:
+        """Return the underlying server session to the client's pool.
+
+        The session must not be used after this call.
+        """
+        if not self._ended:
+            self._ended = True
+            self.client.release_server_session(self.server_session)
 
     def start_transaction(self) -> Transaction:
         """Start a new transaction for this session.
@@ -31,7 +326,108 @@ class Session:
         Returns:
             A new transaction object associated with this session
         """
-        return Transaction(
-            client=self.client,
-            session_document=self.document,
-        )
+        return Transaction(client=self.client, session=self)
+
+    async def with_transaction(
+        self,
+        callback: Callable[[Transaction], Awaitable[T]],
+        *,
+        max_commit_time_ms: int | None = None,
+        timeout: float = _WITH_TRANSACTION_TIMEOUT,
+    ) -> T:
+        """Run the callback inside of a transaction and commit it.
+
+        The whole callback is retried on `TransientTransactionError`
+        and only the commit is retried on `UnknownTransactionCommitResult`,
+        with jittered exponential backoff between attempts.
+
+        ```
+        >>> async def transfer(transaction: Transaction) -> None:
+        ...     await accounts.update(debit, transaction=transaction)
+        ...     await accounts.update(credit, transaction=transaction)
+
+        >>> await session.with_transaction(transfer)
+        ```
+
+        Parameters:
+            callback : Coroutine function receiving the transaction.
+            max_commit_time_ms : The maximum amount of time
+                to allow a single commit to run.
+            timeout : Overall time budget in seconds for all retries.
+
+        Returns:
+            The value returned by the callback. Errors that are not
+                retryable or outlive the time budget are re-raised.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            transaction = self.start_transaction()
+            transaction.start()
+            try:
+                result = await callback(transaction)
+            except Exception as exc_value:
+                if transaction.is_active and transaction.action_count != 0:
+                    with suppress(OperationFailure, *NETWORK_ERRORS):
+                        await transaction.abort()
+                transaction.end(TxnState.ABORTED, exc_value=exc_value)
+                if (
+                    _has_label(exc_value, "TransientTransactionError")
+                    and time.monotonic() < deadline
+                ):
+                    attempt += 1
+                    await _backoff(attempt, deadline)
+                    continue
+                raise
+
+            if not transaction.is_active:  # ended by callback or server
+                return result
+            if transaction.action_count == 0:
+                transaction.end(TxnState.COMMITED)
+                return result
+            if await self._commit_with_retry(
+                transaction,
+                max_commit_time_ms=max_commit_time_ms,
+                deadline=deadline,
+            ):
+                return result
+            attempt += 1
+            await _backoff(attempt, deadline)
+
+    @staticmethod
+    async def _commit_with_retry(
+        transaction: Transaction,
+        *,
+        max_commit_time_ms: int | None,
+        deadline: float,
+    ) -> bool:
+        write_concern: WriteConcern | None = None
+        attempt = 0
+        while True:
+            try:
+                await transaction.commit(
+                    max_commit_time_ms=max_commit_time_ms,
+                    write_concern=write_concern,
+                )
+            except (OperationFailure, *NETWORK_ERRORS) as exc_value:
+                if time.monotonic() >= deadline:
+                    raise
+                max_time_expired = (
+                    isinstance(exc_value, OperationFailure)
+                    and exc_value.code == _MAX_TIME_MS_EXPIRED
+                )
+                if (
+                    _has_label(exc_value, "UnknownTransactionCommitResult")
+                    and not max_time_expired
+                ):
+                    # retried commits must be majority acknowledged
+                    write_concern = WriteConcern(w="majority", wtimeout=10000)
+                    attempt += 1
+                    await _backoff(attempt, deadline)
+                    continue
+                if _has_label(exc_value, "TransientTransactionError"):
+                    transaction.end(TxnState.ABORTED, exc_value=exc_value)
+                    return False
+                raise
+            transaction.end(TxnState.COMMITED)
+            return True
@@ -2,30 +2,31 @@
 
 from __future__ import annotations
 
-import time
 from typing import TYPE_CHECKING
 
 from bson import Int64
 from typing_extensions import Self
 
 from .enums import TxnState
-from .helpers import classrepr
+from .helpers import classrepr, filter_non_null, maybe_to_dict
 
 if TYPE_CHECKING:
     from types import TracebackType
 
     from .client import Kover
+    from .models import WriteConcern
+    from .session import Session
     from .typings import xJsonT
 
 
-@classrepr("_id", "state", "session_document")
+@classrepr("id", "state", "session_document")
 class Transaction:
     """Represents a MongoDB transaction.
 
     Attributes:
         client : The client used to communicate with MongoDB.
-        session_document : The transaction's session document.
-        id : The transaction identifier.
+        session : The session this transaction belongs to.
+        id : The transaction number, allocated by the session on start.
         state : The current state of the transaction.
         action_count : The number of actions performed in the transaction.
         exception : The exception raised during the transaction, if any.
@@ -34,15 +35,20 @@ class Transaction:
     def __init__(
         self,
         client: Kover,
-        session_document: xJsonT,
+        session: Session,
     ) -> None:
         self.client = client
-        self.session_document: xJsonT = session_document
-        self._id: Int64 = Int64(-1)
+        self.session = session
+        self.id: Int64 = Int64(-1)
         self.state: TxnState = TxnState.NONE
         self.action_count: int = 0
         self.exception: BaseException | None = None
 
+    @property
+    def session_document(self) -> xJsonT:
+        """The lsid document of the transaction's session."""
+        return self.session.document
+
     @property
     def is_active(self) -> bool:
         """Check if the transaction is active."""
@@ -56,7 +62,7 @@ class Transaction:
     def start(self) -> None:
         """Start the transaction."""
         self.state = TxnState.STARTED
-        self.id = Int64(int(time.time()))
+        self.id = Int64(self.session.next_txn_number())
 
     def end(
         self,
@@ -68,16 +74,29 @@ class Transaction:
             self.state = state
             self.exception = exc_value
 
-    async def commit(self) -> None:
-        """Commit the transaction."""
+    async def commit(
+        self,
+        *,
+        max_commit_time_ms: int | None = None,
+        write_concern: WriteConcern | None = None,
+    ) -> None:
+        """Commit the transaction.
+
+        Parameters:
+            max_commit_time_ms : The maximum amount of time
+                to allow the commit to run.
+            write_concern : The write concern for the commit.
+        """
         if not self.is_active:
             return
-        command: xJsonT = {
+        command: xJsonT = filter_non_null({
             "commitTransaction": 1.0,
             "lsid": self.session_document,
             "txnNumber": self.id,
             "autocommit": False,
-        }
+            "maxTimeMS": max_commit_time_ms,
+            "writeConcern": maybe_to_dict(write_concern),
+        })
         await self.client.request(command)
 
     async def abort(self) -> None:
@@ -1,5 +1,6 @@
 """Kover Typings Module."""
 
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import (
     Any,
@@ -12,13 +13,24 @@ from typing import (
 )
 
 from bson import SON
+from bson.raw_bson import RawBSONDocument
 
 xJsonT = dict[str, Any]  # noqa: N816
 DocumentT = xJsonT | SON[str, Any]
+RawDocumentT = RawBSONDocument | bytes  # passed to the server as they are
+# OP_MSG kind 1 sections, identifier to documents
+DocumentSequencesT = Mapping[str, Sequence[Mapping[str, Any]]]
 
 COMPRESSION_T = list[Literal["zlib", "zstd", "snappy"]]
 GridFSPayloadT = bytes | str | BinaryIO | TextIO | Path
 AuthTypesT = Literal["SCRAM-SHA-1", "SCRAM-SHA-256"]
+FULL_DOCUMENT_T = Literal[
+    "default",
+    "updateLookup",
+    "whenAvailable",
+    "required",
+]
+FULL_DOCUMENT_BEFORE_CHANGE_T = Literal["off", "whenAvailable", "required"]
 
 
 @runtime_checkable
@@ -39,4 +51,11 @@ class CompressionContext(Protocol):
         ...
 
 
+class WriteBuffer(Protocol):
+    """Protocol for client side write buffers, flushed on client close."""
+
+    async def close(self) -> None:
+        ...
+
+
 DEFAULT_MONGODB_PORT: Final[int] = 27017
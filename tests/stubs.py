@@ -0,0 +1,176 @@
+"""Stand-ins for the client, its databases and connections in unit tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, cast
+
+from kover import Kover, OperationFailure
+from kover.exceptions import mark_request_failure
+from kover.network import WireHelper
+from kover.session import ServerSession, Session
+
+if TYPE_CHECKING:
+    from bson import Int64
+
+    from kover import MongoTransport, xJsonT
+    from kover.typings import WriteBuffer
+
+
+def failure(code: int, *labels: str) -> OperationFailure:
+    """Create a server error carrying the given error labels.
+
+    Returns:
+        The error, ready to be raised or queued as a reply.
+    """
+    exc_value = OperationFailure(code, {})
+    exc_value.error_labels = list(labels)
+    return exc_value
+
+
+class StubReaper:
+    def __init__(self) -> None:
+        self.killed: list[Int64] = []
+        self.sessions: list[tuple[ServerSession | None, bool]] = []
+
+    def add(
+        self,
+        _db: str,
+        _coll: str,
+        cursor_id: Int64,
+        server_session: ServerSession | None = None,
+        *,
+        release: bool = True,
+    ) -> None:
+        self.killed.append(cursor_id)
+        self.sessions.append((server_session, release))
+
+
+class StubClient:
+    cursor_batch_bytes = None
+
+    def __init__(self, *commit_errors: Exception) -> None:
+        self.commit_errors = list(commit_errors)
+        self.requests: list[xJsonT] = []
+        self.databases: dict[str, StubDatabase] = {}
+        self.buffers: list[WriteBuffer] = []
+        self.sessions: list[Session] = []
+        self.released: list[ServerSession] = []
+        self.cursor_reaper = StubReaper()
+
+    async def request(self, command: xJsonT) -> xJsonT:
+        self.requests.append(command)
+        if "commitTransaction" in command and self.commit_errors:
+            exc_value = self.commit_errors.pop(0)
+            if not isinstance(exc_value, OperationFailure):
+                mark_request_failure(exc_value)  # as Kover.request does
+            raise exc_value
+        return {"ok": 1.0}
+
+    def names(self) -> list[str]:
+        return [next(iter(command)) for command in self.requests]
+
+    def get_database(self, name: str) -> StubDatabase:
+        if name not in self.databases:
+            self.databases[name] = StubDatabase(name=name, client=self)
+        return self.databases[name]
+
+    def register_write_buffer(self, buffer: WriteBuffer) -> None:
+        self.buffers.append(buffer)
+
+    async def start_session(self, **_: Any) -> Session:  # noqa: ANN401
+        await asyncio.sleep(0)
+        self.sessions.append(
+            Session(ServerSession(), client=cast("Kover", self)))
+        return self.sessions[-1]
+
+    def release_server_session(self, server_session: ServerSession) -> None:
+        self.released.append(server_session)
+
+
+class StubDatabase:
+    def __init__(
+        self,
+        *replies: xJsonT | Exception,
+        name: str = "db",
+        client: StubClient | None = None,
+    ) -> None:
+        self.name = name
+        self.client = client or StubClient()
+        self.replies = list(replies)
+        self.commands: list[tuple[xJsonT, Session | None]] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def command(
+        self,
+        doc: xJsonT,
+        /,
+        *,
+        session: Session | None = None,
+        **_: Any,  # noqa: ANN401
+    ) -> xJsonT:
+        self.commands.append((doc, session))
+        if "killCursors" in doc:
+            return {"ok": 1.0}
+        await self.gate.wait()
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def names(self) -> list[str]:
+        return [next(iter(doc)) for doc, _ in self.commands]
+
+
+class StubCollection:
+    def __init__(
+        self,
+        database: StubDatabase | None = None,
+        name: str = "items",
+    ) -> None:
+        self.name = name
+        self.database = database or StubDatabase()
+
+
+class StubTransport:
+    is_connected = True
+
+    def __init__(self, *replies: xJsonT) -> None:
+        self.replies = list(replies)
+        self.commands: list[xJsonT] = []
+        self.failure: Exception | None = None
+        self.closed = False
+        self._helper = WireHelper()
+
+    async def request(
+        self,
+        doc: xJsonT,
+        *,
+        wait_response: bool,
+        **_: Any,  # noqa: ANN401
+    ) -> xJsonT:
+        await asyncio.sleep(0)
+        self.commands.append(doc)
+        if self.failure is not None:
+            raise self.failure
+        if not wait_response:
+            return {}
+        reply = self.replies.pop(0) if self.replies else {"ok": 1.0}
+        if not reply.get("ok"):
+            raise self._helper.get_exception(reply=reply)
+        return reply
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def client_over(transport: StubTransport) -> Kover:
+    """Create a real client whose pool holds a single stub connection.
+
+    Returns:
+        The client sending every request through the transport.
+    """
+    pool: asyncio.Queue[MongoTransport] = asyncio.Queue()
+    pool.put_nowait(cast("MongoTransport", transport))
+    return Kover(pool=pool)
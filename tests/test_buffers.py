@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, cast
+import unittest
+
+from bson import encode
+from bson.raw_bson import RawBSONDocument
+
+from kover import (
+    CounterBuffer,
+    DocumentLoader,
+    InsertCoalescer,
+    Kover,
+    OperationFailure,
+)
+from tests.stubs import StubCollection, StubTransport
+
+if TYPE_CHECKING:
+    from kover import Collection, Document, MongoTransport, Update, xJsonT
+    from tests.stubs import StubClient
+
+
+class _Collection(StubCollection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.inserts: list[list[xJsonT]] = []
+
+    async def insert_many(
+        self,
+        documents: list[xJsonT],
+        **_: Any,  # noqa: ANN401
+    ) -> None:
+        self.inserts.append(documents)
+        errors = [
+            {"index": index, "code": 11000, "errmsg": "duplicate"}
+            for index, document in enumerate(documents)
+            if document.get("duplicate")
+        ]
+        if errors:
+            exc_value = OperationFailure(11000, {})
+            exc_value.details = {"ok": 1.0, "writeErrors": errors}
+            raise exc_value
+
+
+class _Cursor:
+    def __init__(self, documents: list[xJsonT]) -> None:
+        self._documents = documents
+
+    async def to_list(self) -> list[xJsonT]:
+        return self._documents
+
+
+class _KeyedCollection:
+    def __init__(self, documents: list[xJsonT]) -> None:
+        self.documents = documents
+        self.filters: list[xJsonT] = []
+
+    def find(self, filter_: xJsonT, **_: Any) -> _Cursor:  # noqa: ANN401
+        self.filters.append(filter_)
+        values = filter_["code"]["$in"]
+        matched: list[xJsonT] = []
+        for document in self.documents:
+            code: Any = document["code"]
+            codes = cast(
+                "list[Any]", code if isinstance(code, list) else [code])
+            if any(code in values for code in codes):
+                matched.append(document)
+        return _Cursor(matched)
+
+
+class _Coded:
+    def __init__(self, code: int) -> None:
+        self.code = code
+
+    @classmethod
+    def from_document(cls, document: xJsonT) -> _Coded:
+        if "bad" in document:
+            raise ValueError("validation failed")
+        return cls(document["code"])
+
+
+class _CounterCollection(StubCollection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[Update]] = []
+        self.failing: set[int] = set()
+
+    async def update(self, *updates: Update, **_: Any) -> int:  # noqa: ANN401
+        self.batches.append(list(updates))
+        if self.failing:
+            exc_value = OperationFailure(112, {})
+            exc_value.details = {"ok": 1.0, "writeErrors": [
+                {"index": index, "code": 112} for index in self.failing
+            ]}
+            self.failing = set()
+            raise exc_value
+        return len(updates)
+
+
+class InsertCoalescerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_merges_and_fans_out(self) -> None:  # noqa: PLR6301
+        collection = _Collection()
+        coalescer = InsertCoalescer(
+            cast("Collection", collection), window=0.01, max_documents=4)
+        assert collection.database.client.buffers == [coalescer]
+
+        results = await asyncio.gather(*(
+            coalescer.insert_one({"seq": i, "duplicate": i == 2})
+            for i in range(6)
+        ), return_exceptions=True)
+        assert [len(documents) for documents in collection.inserts] == [4, 2]
+        assert isinstance(results[2], OperationFailure)
+        assert results[2].code == 11000
+        assert all(
+            not isinstance(result, BaseException)
+            for i, result in enumerate(results) if i != 2
+        )
+
+    async def test_ids_of_raw_and_dict_documents(self) -> None:  # noqa: PLR6301
+        collection = _Collection()
+        coalescer = InsertCoalescer(
+            cast("Collection", collection), window=0.01)
+        raw_id, dict_id = await asyncio.gather(
+            coalescer.insert_one(encode({"_id": 1, "seq": 0})),
+            coalescer.insert_one({"seq": 1}),
+        )
+        assert raw_id == 1
+        (raw, document), = collection.inserts
+        assert document == {"seq": 1, "_id": dict_id}
+        assert "id" not in document
+        assert isinstance(raw, RawBSONDocument)
+
+    async def test_close_flushes(self) -> None:
+        collection = _Collection()
+        coalescer = InsertCoalescer(
+            cast("Collection", collection), window=60)
+        pending = asyncio.ensure_future(coalescer.insert_one({"seq": 0}))
+        await asyncio.sleep(0)
+        assert len(coalescer) == 1
+        await coalescer.close()
+        assert await pending is not None
+        with self.assertRaises(ValueError):
+            await coalescer.insert_one({"seq": 1})
+
+
+class DocumentLoaderTests(unittest.IsolatedAsyncioTestCase):
+    async def test_merges_and_deduplicates(self) -> None:  # noqa: PLR6301
+        collection = _KeyedCollection([{"code": i} for i in range(4)])
+        loader: DocumentLoader[xJsonT] = DocumentLoader(
+            cast("Collection", collection), key="code", max_keys=2)
+        results = await asyncio.gather(*(
+            loader.load(value) for value in [0, 1, 0, 2, 9]
+        ))
+        assert results == [{"code": 0}, {"code": 1}, {"code": 0},
+                           {"code": 2}, None]
+        assert collection.filters == [
+            {"code": {"$in": [0, 1]}},
+            {"code": {"$in": [2, 9]}},
+        ]
+        assert await loader.load_many([3]) == [{"code": 3}]
+        assert len(collection.filters) == 3
+
+    async def test_failed_validation_reaches_callers(self) -> None:
+        collection = _KeyedCollection([{"code": 0}, {"code": 1, "bad": 1}])
+        loader: DocumentLoader[_Coded] = DocumentLoader(
+            cast("Collection", collection),
+            key="code",
+            cls=cast("type[Document]", _Coded),
+        )
+        results = await asyncio.wait_for(asyncio.gather(
+            loader.load(0), loader.load(1), return_exceptions=True,
+        ), timeout=1)
+        assert isinstance(results[0], _Coded)
+        assert isinstance(results[1], ValueError)
+        with self.assertRaises(ValueError):  # not stuck on a stale future
+            await asyncio.wait_for(loader.load(1), timeout=1)
+
+    async def test_array_keys_match_elements(self) -> None:  # noqa: PLR6301
+        documents: list[xJsonT] = [{"code": [1, 2]}, {"code": [{"x": 1}]}]
+        collection = _KeyedCollection(documents)
+        loader: DocumentLoader[xJsonT] = DocumentLoader(
+            cast("Collection", collection), key="code")
+        results = await asyncio.wait_for(
+            loader.load_many([1, 2, 3]), timeout=1)
+        assert results == [documents[0], documents[0], None]
+        reloaded = await asyncio.wait_for(loader.load(1), timeout=1)
+        assert reloaded == documents[0]
+        assert len(collection.filters) == 2
+
+    async def test_unhashable_value_is_rejected(self) -> None:
+        collection = _KeyedCollection([])
+        loader: DocumentLoader[xJsonT] = DocumentLoader(
+            cast("Collection", collection), key="code")
+        with self.assertRaises(TypeError):
+            await loader.load([1])
+
+
+class CounterBufferTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sums_deltas(self) -> None:  # noqa: PLR6301
+        collection = _CounterCollection()
+        counters = CounterBuffer(cast("Collection", collection), interval=60)
+        for i in range(10):
+            counters.inc({"_id": i % 2}, {"views": 1, "bytes": i})
+        assert len(counters) == 2
+        await counters.flush()
+        assert [
+            (update.q, update.u, update.upsert)
+            for update in collection.batches[0]
+        ] == [
+            ({"_id": 0}, {"$inc": {"views": 5, "bytes": 20}}, True),
+            ({"_id": 1}, {"$inc": {"views": 5, "bytes": 25}}, True),
+        ]
+        assert len(counters) == 0
+        await counters.close()
+
+    async def test_failed_deltas_are_kept(self) -> None:
+        collection = _CounterCollection()
+        counters = CounterBuffer(cast("Collection", collection), interval=60)
+        counters.inc({"_id": 0}, {"views": 1})
+        counters.inc({"_id": 1}, {"views": 2})
+        collection.failing = {1}
+        with self.assertRaises(OperationFailure):
+            await counters.flush()
+        counters.inc({"_id": 1}, {"views": 3})
+        await counters.close()
+        assert [(update.q, update.u) for update in collection.batches[1]] == [
+            ({"_id": 1}, {"$inc": {"views": 5}}),
+        ]
+        with self.assertRaises(ValueError):
+            counters.inc({"_id": 0}, {"views": 1})
+
+    async def test_burst_dispatches_once_per_threshold(self) -> None:  # noqa: PLR6301
+        collection = _CounterCollection()
+        counters = CounterBuffer(
+            cast("Collection", collection), interval=60, max_operations=100)
+        running = len(asyncio.all_tasks())
+        for _ in range(20_000):
+            counters.inc({"_id": 0}, {"views": 1})
+        assert len(asyncio.all_tasks()) - running == 200 + 1  # and the timer
+        await counters.close()
+        assert len(collection.batches) == 200
+        assert sum(
+            batch[0].u["$inc"]["views"] for batch in collection.batches
+        ) == 20_000
+
+    async def test_failed_close_keeps_deltas(self) -> None:
+        collection = _CounterCollection()
+        counters = CounterBuffer(cast("Collection", collection), interval=60)
+        counters.inc({"_id": 0}, {"views": 1})
+        counters.inc({"_id": 1}, {"views": 2})
+        collection.failing = {0}
+        with self.assertRaises(OperationFailure):
+            await counters.close()
+        assert counters.pending == [({"_id": 0}, {"views": 1})]
+
+    async def test_client_close_survives_failed_flush(self) -> None:
+        transport = StubTransport()
+        pool: asyncio.Queue[MongoTransport] = asyncio.Queue()
+        pool.put_nowait(cast("MongoTransport", transport))
+        client = Kover(pool=pool)
+        collection = _CounterCollection()
+        collection.database.client = cast("StubClient", client)
+        counters = CounterBuffer(cast("Collection", collection), interval=60)
+        counters.inc({"_id": 0}, {"views": 1})
+        collection.failing = {0}
+        with self.assertRaises(OperationFailure):
+            await client.close()
+        assert transport.closed
+        assert pool.empty()
+        assert counters.pending == [({"_id": 0}, {"views": 1})]
+
+
+if __name__ == "__main__":
+    unittest.main()
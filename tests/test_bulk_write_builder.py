@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import unittest
+
+from bson import decode  # type: ignore[reportUnknownVariableType]
+
+from kover import BulkWriteBuilder, Delete
+from kover.bulk_write_builder import (
+    merge_legacy_replies,
+    split_bulk_write,
+    split_legacy_bulk_write,
+)
+
+
+class SplitBulkWriteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        builder = BulkWriteBuilder()
+        builder.add_insert([{"i": i} for i in range(4)], ns="db.a")
+        builder.add_delete(Delete({"i": 0}, limit=1), ns="db.b")
+        builder.add_insert([{"i": 4}], ns="db.a")
+        self.command = builder.build()
+
+    def test_single_split(self) -> None:
+        splits = split_bulk_write(
+            self.command,
+            max_size=1024,
+            max_operation_size=1024,
+            max_count=100,
+        )
+        assert len(splits) == 1
+        assert splits[0]["nsInfo"] == self.command["nsInfo"]
+        assert [decode(op.raw) for op in splits[0]["ops"]] == (
+            self.command["ops"]
+        )
+        assert splits[0]["ordered"] is True
+
+    def test_namespaces_are_reindexed(self) -> None:
+        splits = split_bulk_write(
+            self.command,
+            max_size=1024,
+            max_operation_size=1024,
+            max_count=4,
+        )
+        assert [len(split["ops"]) for split in splits] == [4, 2]
+        assert splits[1]["nsInfo"] == [{"ns": "db.b"}, {"ns": "db.a"}]
+        assert [decode(op.raw) for op in splits[1]["ops"]] == [
+            {"delete": 0, "filter": {"i": 0}, "multi": False},
+            {"insert": 1, "document": {"i": 4}},
+        ]
+
+    def test_size_limits(self) -> None:
+        splits = split_bulk_write(
+            self.command,
+            max_size=100,
+            max_operation_size=1024,
+            max_count=100,
+        )
+        assert sum(len(split["ops"]) for split in splits) == 6
+        assert len(splits) > 1
+        with self.assertRaises(ValueError):
+            split_bulk_write(
+                self.command,
+                max_size=1024,
+                max_operation_size=10,
+                max_count=100,
+            )
+
+
+class LegacyBulkWriteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.builder = BulkWriteBuilder(ordered=False)
+        self.builder.add_insert([{"i": 0}, {"i": 1}], ns="db.a")
+        self.builder.add_delete(Delete({"i": 0}, limit=0), ns="db.b")
+        self.builder.add_insert([{"i": 2}], ns="db.a")
+
+    def test_ordered_runs(self) -> None:
+        self.builder.ordered = True
+        batches = split_legacy_bulk_write(
+            self.builder.build(), max_size=1024, max_count=100)
+        assert [batch.command for batch in batches] == [
+            {"insert": "a", "ordered": True,
+             "bypassDocumentValidation": False,
+             "writeConcern": {"w": "majority"}},
+            {"delete": "b", "ordered": True,
+             "writeConcern": {"w": "majority"}},
+            {"insert": "a", "ordered": True,
+             "bypassDocumentValidation": False,
+             "writeConcern": {"w": "majority"}},
+        ]
+        assert [batch.positions for batch in batches] == [[0, 1], [2], [3]]
+        assert decode(batches[1].statements[0].raw) == {
+            "q": {"i": 0}, "limit": 0,
+        }
+
+    def test_unordered_groups(self) -> None:
+        batches = split_legacy_bulk_write(
+            self.builder.build(), max_size=1024, max_count=2)
+        assert [batch.positions for batch in batches] == [[0, 1], [3], [2]]
+        assert all(batch.database == "db" for batch in batches)
+        assert batches[0].command["insert"] == "a"
+        assert batches[0].identifier == "documents"
+
+        result = merge_legacy_replies(batches, [
+            {"n": 2},
+            {"n": 0, "writeErrors": [{"index": 0, "code": 11000}]},
+            {"n": 5},
+        ])
+        assert (result.n_inserted, result.n_deleted) == (2, 5)
+        assert result.n_errors == 1
+        assert result.errors == [{"code": 11000, "ok": 0.0, "idx": 3}]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+import unittest
+
+from bson import Int64
+
+from kover import ChangeStream
+from tests.stubs import StubDatabase, failure
+
+if TYPE_CHECKING:
+    from kover import Database, xJsonT
+
+
+def _batch(
+    events: list[xJsonT],
+    *,
+    first: bool = False,
+    token: xJsonT | None = None,
+    cursor_id: int = 1,
+) -> xJsonT:
+    cursor: xJsonT = {
+        "id": Int64(cursor_id),
+        "ns": "db.events",
+        "firstBatch" if first else "nextBatch": events,
+    }
+    if token is not None:
+        cursor["postBatchResumeToken"] = token
+    return {"ok": 1.0, "cursor": cursor}
+
+
+def _event(n: int) -> xJsonT:
+    return {"_id": {"_data": f"event{n}"}, "n": n}
+
+
+def _stream(database: StubDatabase, **kwargs: Any) -> ChangeStream:  # noqa: ANN401
+    return ChangeStream(cast("Database", database), "events", **kwargs)
+
+
+def _stages(database: StubDatabase) -> list[xJsonT]:
+    return [
+        doc["pipeline"][0]["$changeStream"]
+        for doc, _ in database.commands if "aggregate" in doc
+    ]
+
+
+class ResumeTokenTests(unittest.IsolatedAsyncioTestCase):
+    async def test_post_batch_token_and_event_ids(self) -> None:  # noqa: PLR6301
+        database = StubDatabase(
+            _batch([_event(1), _event(2)], first=True, token={"_data": "p1"}),
+            _batch([], token={"_data": "p2"}),
+            _batch([_event(3)]),
+        )
+        stream = _stream(database)
+        assert (await anext(stream))["n"] == 1
+        # events left in the batch, the token is the last returned one
+        assert stream.resume_token == {"_data": "event1"}
+        await anext(stream)
+        assert stream.resume_token == {"_data": "p1"}
+        assert (await anext(stream))["n"] == 3
+        # no postBatchResumeToken in the last batch
+        assert stream.resume_token == {"_data": "event3"}
+        await stream.close()
+
+    async def test_empty_batches_advance_the_token(self) -> None:  # noqa: PLR6301
+        database = StubDatabase(
+            _batch([], first=True, token={"_data": "p1"}),
+            _batch([], token={"_data": "p2"}, cursor_id=0),
+        )
+        stream = _stream(database)
+        assert [batch async for batch in stream.batches()] == []
+        assert stream.resume_token == {"_data": "p2"}
+
+
+class ResumeTests(unittest.IsolatedAsyncioTestCase):
+    async def test_start_after_kept_until_an_event(self) -> None:  # noqa: PLR6301
+        database = StubDatabase(
+            _batch([], first=True),
+            failure(43),
+            _batch([_event(1)], first=True),
+            failure(0, "ResumableChangeStreamError"),
+            _batch([_event(2)], first=True),
+        )
+        stream = _stream(database, start_after={"_data": "start"})
+        assert (await anext(stream))["n"] == 1
+        # no event was returned before the resume, startAfter is kept
+        assert _stages(database) == [
+            {"startAfter": {"_data": "start"}},
+            {"startAfter": {"_data": "start"}},
+        ]
+        assert (await anext(stream))["n"] == 2
+        assert _stages(database)[-1] == {"resumeAfter": {"_data": "event1"}}
+        await stream.close()
+
+    async def test_non_resumable_errors_are_raised(self) -> None:
+        for exc_value in (
+            failure(11601),  # Interrupted
+            failure(280, "NonResumableChangeStreamError"),
+            ValueError("decode error"),
+        ):
+            database = StubDatabase(_batch([], first=True), exc_value)
+            stream = _stream(database)
+            with self.assertRaises(type(exc_value)):
+                await anext(stream)
+            assert len(_stages(database)) == 1
+            await stream.close()
+
+    async def test_resumable_codes_without_labels(self) -> None:  # noqa: PLR6301
+        by_code = failure(-1)
+        by_code.message = {"code": 43}
+        for exc_value in (failure(91), by_code):
+            database = StubDatabase(
+                _batch([], first=True),
+                exc_value,
+                _batch([_event(1)], first=True),
+            )
+            stream = _stream(database)
+            assert (await anext(stream))["n"] == 1
+            assert len(_stages(database)) == 2
+            await stream.close()
+
+    async def test_network_error_ends_the_session(self) -> None:  # noqa: PLR6301
+        database = StubDatabase(
+            _batch([_event(1)], first=True, cursor_id=7),
+            EOFError(),
+            _batch([_event(2)], first=True),
+        )
+        stream = _stream(database)
+        await anext(stream)
+        await anext(stream)
+        first, second = database.client.sessions
+        assert first.is_ended
+        assert not second.is_ended
+        # the cursor died with the connection, it is not killed
+        assert not any("killCursors" in doc for doc, _ in database.commands)
+        assert database.commands[-1][1] is second
+        assert _stages(database)[-1] == {"resumeAfter": {"_data": "event1"}}
+        await stream.close()
+        assert second.is_ended
+
+    async def test_server_error_kills_the_cursor(self) -> None:  # noqa: PLR6301
+        database = StubDatabase(
+            _batch([_event(1)], first=True, cursor_id=7),
+            failure(189),
+            _batch([_event(2)], first=True),
+        )
+        stream = _stream(database)
+        await anext(stream)
+        await anext(stream)
+        kills = [doc for doc, _ in database.commands if "killCursors" in doc]
+        assert kills == [{"killCursors": "events", "cursors": [Int64(7)]}]
+        assert len(database.client.sessions) == 1
+        await stream.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
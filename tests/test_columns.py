@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import importlib.util
+import unittest
+
+from bson import encode
+
+from kover import LazyDocument
+from kover.columns import ColumnBuilder
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is missing")
+class ColumnBuilderTests(unittest.TestCase):
+    def test_grows_and_masks_nulls(self) -> None:  # noqa: PLR6301
+        builder = ColumnBuilder("meta.score", "float64", capacity=2)
+        documents = [
+            {"meta": {"score": 1.5}},
+            {"meta": {"score": None}},
+            {"meta": 3},
+            {},
+            {"meta": {"score": 2}},
+        ]
+        for document in documents:
+            builder.append(LazyDocument(encode(document)))
+        column = builder.finish()
+        assert len(column) == 5
+        assert column.mask.tolist() == [False, True, True, True, False]
+        assert column.compressed().tolist() == [1.5, 2.0]
+
+    def test_reads_raw_bytes(self) -> None:  # noqa: PLR6301
+        builder = ColumnBuilder("a.b", "U4")
+        for document in [
+            {"x": [1], "a": {"z": {"b": "no"}, "b": "abcd"}},
+            {"a": [{"b": "list"}]},  # arrays are not entered
+            {"a": {"b": None}},
+        ]:
+            builder.append(encode(document))
+        column = builder.finish()
+        assert column.tolist() == ["abcd", None, None]
+
+    def test_values_must_fit(self) -> None:
+        for dtype, value in [
+            ("U3", "abcdef"),
+            ("S2", "abc"),
+            ("int8", 300),
+            ("uint32", -1),
+            ("int64", 2.5),
+        ]:
+            builder = ColumnBuilder("v", dtype)
+            with self.assertRaises(ValueError):
+                builder.append(encode({"v": value}))
+        builder = ColumnBuilder("v", "int8")
+        for value in [127, -128, 4.0, True]:
+            builder.append(encode({"v": value}))
+        assert builder.finish().tolist() == [127, -128, 4, 1]
+
+
+if __name__ == "__main__":
+    unittest.main()
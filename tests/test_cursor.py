@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, cast
+import unittest
+from unittest import mock
+
+from bson import CodecOptions, Int64, encode
+from bson.raw_bson import RawBSONDocument
+
+from kover import Document, OperationFailure
+from kover.cursor import (
+    ADAPTIVE_INITIAL_BATCH_SIZE,
+    AdaptiveBatchSize,
+    Cursor,
+    CursorReaper,
+)
+from kover.network.wirehelper import OP_MSG, WireHelper
+from kover.session import ServerSession
+from tests.stubs import StubClient, StubCollection, StubDatabase
+
+if TYPE_CHECKING:
+    from kover import Collection, Kover, xJsonT
+
+
+class AdaptiveBatchSizeTests(unittest.TestCase):
+    def test_grows_until_target_bytes(self) -> None:  # noqa: PLR6301
+        sizer = AdaptiveBatchSize(target_bytes=64 * 1024)
+        assert sizer.current == ADAPTIVE_INITIAL_BATCH_SIZE
+        batch = [{"payload": "x" * 1000}] * sizer.current
+        sizes: list[int] = []
+        for _ in range(10):
+            sizer.observe(batch)
+            sizes.append(sizer.next_size())
+        assert sizes[:2] == [32, 64]
+        # ~1KB documents, so 64KB target caps the batch around 64 docs
+        assert max(sizes) <= 64
+        assert sizes[-1] == sizes[-2]
+
+    def test_bounded_by_consumer(self) -> None:  # noqa: PLR6301
+        sizer = AdaptiveBatchSize(target_bytes=16 * 1024 * 1024)
+        sizer.observe([{"a": 1}] * 16)
+        sizer.consumed()  # consumed instantly, no bound from consumer
+        assert sizer.next_size() == 32
+        with mock.patch("kover.cursor.time.monotonic", return_value=0.0):
+            sizer.observe([{"a": 1}] * 32)
+        with mock.patch("kover.cursor.time.monotonic", return_value=32.0):
+            sizer.consumed()  # one document per second
+        assert sizer.next_size() == 32
+
+
+class RawReplyTests(unittest.TestCase):
+    def test_documents_stay_raw(self) -> None:  # noqa: PLR6301
+        docs = [{"_id": 1, "nested": {"a": [1, 2]}}, {"_id": 2}]
+        reply = {"cursor": {"id": 0, "firstBatch": docs}, "ok": 1.0}
+        message = b"\x00\x00\x00\x00\x00" + encode(reply)  # flags, kind
+        options = CodecOptions(document_class=RawBSONDocument)
+        decoded = WireHelper().get_reply(message, OP_MSG, options)
+        batch = decoded["cursor"]["firstBatch"]
+        assert all(isinstance(doc, RawBSONDocument) for doc in batch)
+        assert [doc.raw for doc in batch] == [encode(doc) for doc in docs]
+
+
+class CursorReaperTests(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_per_namespace_and_session(self) -> None:  # noqa: PLR6301
+        client = StubClient()
+        reaper = CursorReaper(cast("Kover", client), delay=0)
+        owned, explicit = ServerSession(), ServerSession()
+        reaper.add("db", "a", Int64(1))
+        reaper.add("db", "a", Int64(2), explicit, release=False)
+        reaper.add("db", "a", Int64(3), explicit, release=False)
+        reaper.add("db", "a", Int64(4), owned)
+        reaper.add("other", "a", Int64(5))
+        assert len(reaper) == 5
+        await reaper.close()
+        assert len(reaper) == 0
+        assert [doc for doc, _ in client.databases["db"].commands] == [
+            {"killCursors": "a", "cursors": [1]},
+            {
+                "killCursors": "a", "cursors": [2, 3],
+                "lsid": explicit.document,
+            },
+            {
+                "killCursors": "a", "cursors": [4],
+                "lsid": owned.document,
+            },
+        ]
+        assert [doc for doc, _ in client.databases["other"].commands] == [
+            {"killCursors": "a", "cursors": [5]},
+        ]
+        # only the session owned by cursors goes back to the pool
+        assert client.released == [owned]
+
+
+class Item(Document):
+    n: int
+
+
+def _replies(batches: list[list[xJsonT]]) -> list[xJsonT]:
+    return [{"ok": 1.0, "cursor": {
+        "id": Int64(42 if index < len(batches) - 1 else 0),
+        "firstBatch" if index == 0 else "nextBatch": batch,
+    }} for index, batch in enumerate(batches)]
+
+
+def _get_mores(database: StubDatabase) -> int:
+    return database.names().count("getMore")
+
+
+def _cursor(
+    batches: list[list[int]],
+    cls: type[Document] | None = None,
+) -> tuple[Cursor[Any], StubDatabase]:
+    database = StubDatabase(*_replies([
+        [{"n": n} for n in batch] for batch in batches
+    ]))
+    cursor: Cursor[Any] = Cursor(
+        {}, cast("Collection", StubCollection(database)), cls=cls)
+    return cursor, database
+
+
+class CursorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_prefetch_depth(self) -> None:  # noqa: PLR6301
+        cursor, database = _cursor([[n] for n in range(10)])
+        cursor.prefetch(depth=2)
+        assert await anext(cursor) == {"n": 0}
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # two batches buffered and a third one waiting for room
+        assert _get_mores(database) == 3
+        assert await anext(cursor) == {"n": 1}
+        await cursor.close()
+        issued = _get_mores(database)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert _get_mores(database) == issued
+        assert database.client.cursor_reaper.killed == [Int64(42)]
+        # the lsid stays checked out until the reaper sent the kill
+        [(server_session, release)] = database.client.cursor_reaper.sessions
+        assert server_session is not None
+        assert release
+        assert database.client.released == []
+
+    async def test_close_waits_for_prefetch_in_flight(self) -> None:  # noqa: PLR6301
+        cursor, database = _cursor([[1], [2], [3]])
+        cursor.prefetch()
+        await anext(cursor)
+        database.gate.clear()
+        await asyncio.sleep(0)
+        assert _get_mores(database) == 1
+        closing = asyncio.ensure_future(cursor.close())
+        await asyncio.sleep(0)
+        assert not closing.done()  # the reply must be read first
+        database.gate.set()
+        await closing
+        assert _get_mores(database) == 1
+
+    async def test_prefetch_errors_reach_the_consumer(self) -> None:
+        cursor, database = _cursor([[1], [2]])
+        cursor.prefetch()
+        database.replies[-1] = OperationFailure(43, {})
+        assert await anext(cursor) == {"n": 1}
+        with self.assertRaises(OperationFailure):
+            await anext(cursor)
+        await cursor.close()
+
+    async def test_batches_are_mapped(self) -> None:  # noqa: PLR6301
+        cursor, _ = _cursor([[1, 2], [], [3]], cls=Item)
+        batches = [batch async for batch in cursor.batches()]
+        assert [[item.n for item in batch] for batch in batches] == [
+            [1, 2], [3],
+        ]
+        assert all(isinstance(item, Item) for item in batches[0])
+
+    async def test_to_list_chunks(self) -> None:  # noqa: PLR6301
+        cursor, database = _cursor([[1, 2, 3], [4, 5, 6], [7]])
+        chunks: list[list[int]] = []
+        while chunk := await cursor.to_list(2):
+            chunks.append([document["n"] for document in chunk])
+        assert chunks == [[1, 2], [3, 4], [5, 6], [7]]
+        assert await cursor.to_list(2) == []
+        # the last reply had cursor id 0, nothing more was requested
+        assert _get_mores(database) == 2
+        assert database.client.cursor_reaper.killed == []
+        assert len(database.client.released) == 1
+
+
+class TailableCursorTests(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    async def _polls(*, prefetch: int = 0) -> int:
+        database = StubDatabase(*_replies([[] for _ in range(10_000)]))
+        cursor: Cursor[Any] = Cursor(
+            {}, cast("Collection", StubCollection(database)), tailable=True)
+        cursor.prefetch(prefetch)
+        with suppress(TimeoutError, asyncio.TimeoutError):
+            await asyncio.wait_for(anext(cursor), timeout=0.2)
+        await cursor.close()
+        return _get_mores(database)
+
+    async def test_empty_batches_back_off(self) -> None:
+        # 10ms doubling each time, ~5 polls fit into 200ms
+        assert await self._polls() < 10
+        assert await self._polls(prefetch=2) < 10
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import datetime as dt
+from enum import Enum
+import unittest
+from uuid import UUID, uuid4
+
+from bson import ObjectId, decode, encode  # type: ignore[reportUnknownVariableType]
+from pydantic import Field, ValidationError
+
+from kover import Document
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Address(Document):
+    street_name: str
+    zip_code: int | None = None
+
+
+class User(Document):
+    full_name: str
+    score: float
+    color: Color
+    token: UUID
+    created_at: dt.datetime
+    address: Address
+    previous: list[Address] = Field(default_factory=list[Address])
+    nickname: str | None = None
+
+
+class DecoderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        user = User(
+            full_name="John Doe",
+            score=1,
+            color=Color.BLUE,
+            token=uuid4(),
+            created_at=dt.datetime(2024, 1, 1),  # noqa: DTZ001
+            address=Address(street_name="Main"),
+            previous=[Address(street_name="Old", zip_code=1)],
+        ).with_id(ObjectId())
+        self.payload = decode(encode(user.to_dict()))
+        self.payload["extraField"] = 1
+
+    def test_trusted_matches_validated(self) -> None:
+        validated = User.from_document(self.payload)
+        trusted = User.from_document(self.payload, trusted=True)
+        assert trusted == validated
+        assert trusted.get_id() == validated.get_id()
+        assert trusted.to_dict() == validated.to_dict()
+        assert trusted.model_extra == {"extraField": 1}
+        assert trusted.model_fields_set == validated.model_fields_set
+        assert isinstance(trusted.token, UUID)
+        assert isinstance(trusted.score, float)
+        assert isinstance(trusted.previous[0], Address)
+
+    def test_batches(self) -> None:
+        payloads = [self.payload] * 3
+        expected = [User.from_document(self.payload)] * 3
+        assert User.from_documents(payloads) == expected
+        assert User.from_documents(payloads, trusted=True) == expected
+
+    def test_defaults_and_missing(self) -> None:
+        address = Address.from_document({"streetName": "x"}, trusted=True)
+        assert address.zip_code is None
+        assert address.model_fields_set == {"street_name"}
+        with_name = Address.from_document({"street_name": "x"}, trusted=True)
+        assert with_name.street_name == "x"
+        with self.assertRaises(ValidationError):
+            Address.from_document({"zipCode": 1}, trusted=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
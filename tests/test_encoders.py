@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Annotated
+import unittest
+from uuid import UUID, uuid4
+
+from bson import Binary, ObjectId
+from pydantic import Field, field_serializer
+
+from kover import Document, maybe_to_dicts
+from kover.metadata import ExcludeIfNone
+
+
+class Address(Document):
+    street_name: str
+    zip_code: Annotated[int | None, ExcludeIfNone()] = None
+
+
+class User(Document):
+    full_name: str
+    token: UUID
+    address: Address
+    previous: list[Address] = Field(default_factory=list[Address])
+    hidden: int = Field(default=0, exclude=True)
+
+
+class Doubled(Document):
+    value: int
+
+    @field_serializer("value")
+    def _double(self, value: int) -> int:  # noqa: PLR6301
+        return value * 2
+
+
+class EncoderTests(unittest.TestCase):
+    def test_to_dict(self) -> None:  # noqa: PLR6301
+        token, document_id = uuid4(), ObjectId()
+        user = User(
+            full_name="John",
+            token=token,
+            address=Address(street_name="Main").with_id(ObjectId()),
+            previous=[Address(street_name="Old", zip_code=1)],
+        ).with_id(document_id)
+        assert user.to_dict() == {
+            "_id": document_id,
+            "fullName": "John",
+            "token": Binary.from_uuid(token),
+            "address": {"streetName": "Main"},
+            "previous": [{"streetName": "Old", "zipCode": 1}],
+        }
+        assert next(iter(user.to_dict())) == "_id"
+        assert "_id" not in user.to_dict(exclude_id=True)
+
+    def test_custom_serializers(self) -> None:  # noqa: PLR6301
+        assert Doubled(value=2).to_dict() == {"value": 4}
+
+    def test_batches(self) -> None:  # noqa: PLR6301
+        addresses = [Address(street_name=str(i)) for i in range(3)]
+        mixed = [*addresses, {"raw": 1}, Doubled(value=1)]
+        assert maybe_to_dicts(mixed) == [
+            *(address.to_dict() for address in addresses),
+            {"raw": 1},
+            {"value": 2},
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+
+from bson import (
+    ObjectId,
+    decode,  # type: ignore[reportUnknownVariableType]
+    encode,
+)
+from bson.raw_bson import RawBSONDocument
+
+from kover import LazyDocument
+from kover.lazy import raw_document_id
+
+
+class LazyDocumentTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.document = {
+            "_id": ObjectId(),
+            "name": "kover",
+            "count": 2 ** 40,
+            "ratio": 0.5,
+            "flag": True,
+            "missing": None,
+            "at": dt.datetime(2024, 1, 1),  # noqa: DTZ001
+            "nested": {"tags": ["a", {"deep": 1}]},
+            **{f"field_{idx}": idx for idx in range(100)},
+        }
+        self.raw = encode(self.document)
+
+    def test_decodes_only_up_to_key(self) -> None:
+        lazy = LazyDocument(self.raw)
+        assert lazy["name"] == "kover"
+        assert len(lazy._elements) == 2  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+        assert lazy.get("unknown") is None
+        assert "field_99" in lazy
+
+    def test_values_match_decoder(self) -> None:
+        lazy = LazyDocument.from_document(RawBSONDocument(self.raw))
+        expected = decode(self.raw)
+        for key, value in expected.items():
+            if key == "nested":
+                continue
+            assert lazy[key] == value, key
+        nested = lazy["nested"]
+        assert isinstance(nested, LazyDocument)
+        assert nested["tags"][1]["deep"] == 1
+        assert lazy.to_dict() == expected
+        assert len(lazy) == len(expected)
+        assert lazy.raw == self.raw
+
+
+class RawDocumentIdTests(unittest.TestCase):
+    def test_existing_id(self) -> None:  # noqa: PLR6301
+        document_id = ObjectId()
+        raw = RawBSONDocument(encode({"a": {"_id": 1}, "_id": document_id}))
+        prepared, found = raw_document_id(raw)
+        assert prepared is raw
+        assert found == document_id
+        assert raw_document_id(encode({"_id": None}))[1] is None
+
+    def test_missing_id(self) -> None:  # noqa: PLR6301
+        raw = encode({"a": 1})
+        prepared, document_id = raw_document_id(raw)
+        assert decode(prepared.raw) == {"_id": document_id, "a": 1}
+
+    def test_invalid(self) -> None:
+        for data in (
+            encode({"_id": [1]}),
+            encode({"a": 1})[:-1],
+            b"\x06\x00\x00\x00\x99\x00",
+        ):
+            with self.assertRaises(ValueError):
+                raw_document_id(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
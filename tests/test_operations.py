@@ -4,7 +4,13 @@ import os
 import unittest
 from uuid import UUID, uuid4
 
-from kover import AuthCredentials, Document, Kover
+from kover import (
+    AuthCredentials,
+    BulkWriteError,
+    Document,
+    Kover,
+    MergedCursor,
+)
 
 
 class Sample(Document):
@@ -53,6 +59,53 @@ class TestMethods(unittest.IsolatedAsyncioTestCase):
         found = await self.collection.find_one({"name": doc.name}, cls=Sample)
         assert found == doc, (found, doc)
 
+    async def test_parallel_scan(self) -> None:
+        samples = [Sample.random() for _ in range(500)]
+        await self.collection.insert_many(samples)
+        await self.collection.insert_one({"_id": "string id"})
+
+        cursors = await self.collection.parallel_scan(4)
+        assert 1 <= len(cursors) <= 4
+        documents = await MergedCursor(cursors).to_list()
+        ids = {str(doc["_id"]) for doc in documents}
+        assert len(documents) == len(ids) == 501
+
+    async def test_aggregate_streams_all_batches(self) -> None:
+        samples = [Sample.random() for _ in range(250)]
+        await self.collection.insert_many(samples)
+
+        cursor = self.collection.aggregate(
+            [{"$sort": {"age": 1}}], cls=Sample).batch_size(50)
+        batches = [batch async for batch in cursor.batches()]
+        assert sum(map(len, batches)) == 250
+        assert len(batches) == 5
+
+    async def test_tailable_cursor(self) -> None:
+        await self.collection.insert_one({"seq": 0})
+        await self.collection.convert_to_capped(size=64 * 1024)
+
+        cursor = self.collection.find(
+            {}, None, tailable=True, await_data=True, max_await_time_ms=100)
+        async with cursor:
+            assert (await anext(cursor))["seq"] == 0
+            await self.collection.insert_one({"seq": 1})
+            assert (await anext(cursor))["seq"] == 1
+            assert cursor.alive
+
+    async def test_insert_many_splits(self) -> None:
+        padding = "x" * 1024 * 1024
+        documents = [{"seq": i, "padding": padding} for i in range(40)]
+        ids = await self.collection.insert_many(documents, ordered=False)
+        assert len(ids) == 40
+        assert await self.collection.count() == 40
+
+        duplicates = [{"_id": i % 20} for i in range(150_000)]
+        with self.assertRaises(BulkWriteError) as context:
+            await self.collection.insert_many(duplicates, ordered=False)
+        assert context.exception.details is not None
+        assert context.exception.details["nInserted"] == 20
+        assert len(context.exception.details["writeErrors"]) == 149_980
+
 
 if __name__ == "__main__":
     unittest.main()
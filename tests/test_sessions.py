@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, cast
+import unittest
+
+from bson import Timestamp
+
+from kover import OperationFailure
+from kover.enums import TxnState
+from kover.exceptions import is_request_failure
+from kover.session import ServerSession, ServerSessionPool, Session
+from tests.stubs import StubClient, StubTransport, client_over, failure
+
+if TYPE_CHECKING:
+    from kover import Kover, Transaction, xJsonT
+
+
+class SessionPoolTests(unittest.TestCase):
+    def test_lifo_reuse(self) -> None:  # noqa: PLR6301
+        pool = ServerSessionPool()
+        pool.timeout_minutes = 30
+        first, second = pool.acquire(), pool.acquire()
+        assert first.document != second.document
+        pool.release(first)
+        pool.release(second)
+        assert pool.acquire() is second
+        assert pool.acquire() is first
+
+    def test_stale_and_dirty_are_dropped(self) -> None:  # noqa: PLR6301
+        pool = ServerSessionPool()
+        pool.timeout_minutes = 30
+        stale = ServerSession()
+        stale.last_use = time.monotonic() - 30 * 60
+        pool.release(stale)
+        assert len(pool) == 0
+
+        dirty = ServerSession()
+        dirty.dirty = True
+        pool.release(dirty)
+        assert len(pool) == 0
+
+        fresh = pool.acquire()
+        pool.release(fresh)
+        fresh.last_use = time.monotonic() - 30 * 60
+        assert pool.acquire() is not fresh
+
+    def test_drain(self) -> None:  # noqa: PLR6301
+        pool = ServerSessionPool()
+        sessions = [pool.acquire() for _ in range(3)]
+        for session in sessions:
+            pool.release(session)
+        documents = pool.drain()
+        assert len(documents) == 3
+        assert len(pool) == 0
+
+    def test_expiring_and_discarded(self) -> None:  # noqa: PLR6301
+        pool = ServerSessionPool()
+        pool.timeout_minutes = 30
+        busy, idle = pool.acquire(), pool.acquire()
+        busy.last_use = time.monotonic() - 28 * 60
+        assert pool.expiring(within=120) == [busy]
+        assert pool.expiring(within=0) == []
+
+        idle.dirty = True
+        pool.release(idle)
+        assert pool.expiring(within=120) == [busy]
+        assert pool.pop_discarded() == [idle.document]
+        assert pool.pop_discarded() == []
+
+    def test_txn_numbers_are_monotonic(self) -> None:  # noqa: PLR6301
+        server_session = ServerSession()
+        session = Session(server_session, client=cast("Kover", None))
+        numbers: list[int] = []
+        for _ in range(3):
+            transaction = session.start_transaction()
+            transaction.start()
+            numbers.append(int(transaction.id))
+        assert numbers == [1, 2, 3]
+
+        # the counter outlives the session object since lsid is reused
+        reused = Session(server_session, client=cast("Kover", None))
+        assert reused.next_txn_number() == 4
+
+
+class WithTransactionTests(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    def _session(client: StubClient) -> Session:
+        return Session(ServerSession(), client=cast("Kover", client))
+
+    async def test_retries_transient_callback_errors(self) -> None:
+        client = StubClient()
+        session = self._session(client)
+        attempts: list[int] = []
+
+        async def callback(transaction: Transaction) -> str:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+            attempts.append(int(transaction.id))
+            if len(attempts) < 3:
+                raise failure(112, "TransientTransactionError")
+            return "done"
+
+        assert await session.with_transaction(callback) == "done"
+        assert attempts == [1, 2, 3]  # a new txnNumber per attempt
+        assert client.names() == [
+            "abortTransaction", "abortTransaction", "commitTransaction",
+        ]
+
+    async def test_retries_commit_with_unknown_result(self) -> None:
+        client = StubClient(
+            failure(91, "UnknownTransactionCommitResult"), EOFError(),
+        )
+        session = self._session(client)
+        calls: list[Transaction] = []
+
+        async def callback(transaction: Transaction) -> None:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+            calls.append(transaction)
+
+        await session.with_transaction(callback, max_commit_time_ms=100)
+        assert len(calls) == 1  # only the commit was retried
+        commits = client.requests
+        assert [command["txnNumber"] for command in commits] == [1, 1, 1]
+        assert "writeConcern" not in commits[0]
+        assert commits[1]["writeConcern"]["w"] == "majority"
+        assert calls[0].state is TxnState.COMMITED
+
+    async def test_max_time_expired_is_not_retried(self) -> None:
+        client = StubClient(failure(50, "UnknownTransactionCommitResult"))
+        session = self._session(client)
+
+        async def callback(transaction: Transaction) -> None:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+
+        with self.assertRaises(OperationFailure) as context:
+            await session.with_transaction(callback, max_commit_time_ms=1)
+        assert context.exception.code == 50
+        assert client.names() == ["commitTransaction"]
+
+    async def test_gives_up_after_time_budget(self) -> None:
+        client = StubClient()
+        session = self._session(client)
+        attempts: list[int] = []
+
+        async def callback(transaction: Transaction) -> None:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+            attempts.append(int(transaction.id))
+            raise failure(112, "TransientTransactionError")
+
+        started = time.monotonic()
+        with self.assertRaises(OperationFailure):
+            await session.with_transaction(callback, timeout=0.05)
+        assert time.monotonic() - started < 1
+        assert len(attempts) > 1
+
+        client = StubClient(*(
+            failure(91, "UnknownTransactionCommitResult") for _ in range(1000)
+        ))
+        session = self._session(client)
+        with self.assertRaises(OperationFailure):
+            await session.with_transaction(self._act, timeout=0.05)
+        assert client.names()[-1] == "commitTransaction"
+
+    @staticmethod
+    async def _act(transaction: Transaction) -> None:
+        await asyncio.sleep(0)
+        transaction.action_count += 1
+
+    async def test_callback_errors_abort(self) -> None:
+        client = StubClient()
+        session = self._session(client)
+        calls: list[Transaction] = []
+
+        async def callback(transaction: Transaction) -> None:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+            calls.append(transaction)
+            raise KeyError("boom")
+
+        with self.assertRaises(KeyError):
+            await session.with_transaction(callback)
+        assert len(calls) == 1
+        assert client.names() == ["abortTransaction"]
+        assert calls[0].state is TxnState.ABORTED
+        assert isinstance(calls[0].exception, KeyError)
+
+    async def test_callback_os_errors_are_not_transient(self) -> None:
+        client = StubClient()
+        session = self._session(client)
+        calls: list[Transaction] = []
+
+        async def callback(transaction: Transaction) -> None:
+            await asyncio.sleep(0)
+            transaction.action_count += 1
+            calls.append(transaction)
+            raise FileNotFoundError("report.csv")
+
+        with self.assertRaises(FileNotFoundError):
+            await session.with_transaction(callback)
+        assert len(calls) == 1
+        assert client.names() == ["abortTransaction"]
+
+
+def _cluster_time(seconds: int) -> xJsonT:
+    return {"clusterTime": Timestamp(seconds, 1), "signature": {}}
+
+
+class CausalConsistencyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reads_wait_for_preceding_operations(self) -> None:  # noqa: PLR6301
+        transport = StubTransport({
+            "ok": 1.0,
+            "operationTime": Timestamp(10, 1),
+            "$clusterTime": _cluster_time(10),
+        })
+        client = client_over(transport)
+        session = Session(ServerSession(), client=client)
+        await client.request({"insert": "c", "documents": []}, session=session)
+        await client.request({"find": "c"}, session=session)
+        await client.request({"insert": "c"}, session=session)
+        insert, find, write = transport.commands
+        assert "readConcern" not in insert
+        assert find["readConcern"] == {"afterClusterTime": Timestamp(10, 1)}
+        assert find["$clusterTime"] == _cluster_time(10)
+        assert "readConcern" not in write
+
+    async def test_network_errors_are_marked(self) -> None:
+        transport = StubTransport()
+        transport.failure = EOFError()
+        client = client_over(transport)
+        with self.assertRaises(EOFError) as context:
+            await client.request({"ping": 1})
+        assert is_request_failure(context.exception)
+        assert not is_request_failure(EOFError())
+
+    async def test_error_replies_advance_the_session(self) -> None:
+        transport = StubTransport({
+            "ok": 0.0,
+            "code": 11000,
+            "errmsg": "duplicate",
+            "operationTime": Timestamp(20, 1),
+            "$clusterTime": _cluster_time(20),
+        })
+        client = client_over(transport)
+        session = Session(ServerSession(), client=client)
+        with self.assertRaises(OperationFailure):
+            await client.request({"insert": "c"}, session=session)
+        assert session.operation_time == Timestamp(20, 1)
+        assert session.cluster_time == _cluster_time(20)
+        await client.request({"find": "c"}, session=session)
+        assert transport.commands[-1]["readConcern"] == {
+            "afterClusterTime": Timestamp(20, 1),
+        }
+
+    async def test_omitted_in_transactions_and_unacknowledged(self) -> None:  # noqa: PLR6301
+        transport = StubTransport()
+        client = client_over(transport)
+        session = Session(ServerSession(), client=client)
+        session.advance_operation_time(Timestamp(30, 1))
+        await client.request(
+            {"insert": "c"}, session=session, wait_response=False)
+        assert "readConcern" not in transport.commands[-1]
+
+        transaction = session.start_transaction()
+        transaction.start()
+        await client.request({"insert": "c"}, transaction=transaction)
+        # the first command of a transaction carries its read concern
+        assert transport.commands[-1]["readConcern"] == {
+            "afterClusterTime": Timestamp(30, 1),
+        }
+        transaction.action_count += 1
+        await client.request({"find": "c"}, transaction=transaction)
+        assert "readConcern" not in transport.commands[-1]
+
+        unchained = Session(
+            ServerSession(), client=client, causal_consistency=False)
+        unchained.advance_operation_time(Timestamp(30, 1))
+        await client.request({"find": "c"}, session=unchained)
+        assert "readConcern" not in transport.commands[-1]
+
+
+if __name__ == "__main__":
+    unittest.main()